@@ -1,37 +1,54 @@
 """Appointment CRUD endpoints. See CLAUDE FastAPI Endpoints."""
+from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_db
+from app.core.config import settings
 from app.models.db import Booking
 from app.models.db.booking import BookingStatusEnum
 from app.models.schemas.booking import BookingCreate, BookingResponse, BookingUpdate
 from app.services import booking_service
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 router = APIRouter(prefix="/api/bookings", tags=["bookings"])
 
 
 @router.get("", response_model=list[BookingResponse])
 async def list_bookings(
+    response: Response,
     session: AsyncSession = Depends(get_db),
     business_id: UUID | None = None,
     customer_id: UUID | None = None,
-) -> list[Booking]:
-    """List confirmed bookings, optionally filtered by business_id and/or customer_id."""
-    q = (
-        select(Booking)
-        .where(Booking.status == BookingStatusEnum.confirmed)
-        .order_by(Booking.booking_date, Booking.booking_time)
-    )
-    if business_id is not None:
-        q = q.where(Booking.business_id == business_id)
-    if customer_id is not None:
-        q = q.where(Booking.customer_id == customer_id)
-    result = await session.execute(q)
-    return list(result.scalars().all())
+    status: BookingStatusEnum = BookingStatusEnum.confirmed,
+    from_date: date | None = Query(None, description="Bookings on or after this date"),
+    to_date: date | None = Query(None, description="Bookings on or before this date"),
+    limit: int = Query(settings.BOOKING_LIST_DEFAULT_LIMIT, ge=1, le=settings.BOOKING_LIST_MAX_LIMIT),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+) -> list[dict]:
+    """List bookings (default: confirmed) by date and time, optionally filtered by business_id and/or customer_id.
+
+    More pages: pass the X-Next-Cursor response header as `cursor`.
+    """
+    try:
+        rows, next_cursor = await booking_service.list_bookings(
+            session,
+            limit=limit,
+            cursor=cursor,
+            business_id=business_id,
+            customer_id=customer_id,
+            status=status,
+            from_date=from_date,
+            to_date=to_date,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
 
 
 @router.post("", response_model=BookingResponse)
@@ -80,9 +97,12 @@ async def reschedule_booking(
 
     new_date = body.booking_date if body.booking_date is not None else booking.booking_date
     new_time = body.booking_time if body.booking_time is not None else booking.booking_time
-    updated = await booking_service.reschedule_booking(
-        session, booking_id, new_date, new_time
-    )
+    try:
+        updated = await booking_service.reschedule_booking(
+            session, booking_id, new_date, new_time
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not updated:
         raise HTTPException(status_code=404, detail="Booking not found or could not be rescheduled")
     result2 = await session.execute(
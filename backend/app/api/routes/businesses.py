@@ -1,16 +1,25 @@
 """Business, service, and slot endpoints."""
+from datetime import date as date_type
 from decimal import Decimal
+from itertools import islice
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.api.dependencies import get_db
-from app.models.db import Booking, Business, Service
-from app.models.db.business import BusinessTypeEnum
-from app.services import booking_service
+from app.core.config import settings
+from app.models.db import Business, Service
+from app.models.db.booking import BookingStatusEnum
+from app.models.db.business import ActiveChannelEnum, BusinessTypeEnum
+from app.services import booking_service, booking_transfer
+from app.services.business_service import invalidate_business
+from app.services.channel_routing import sync_business_routes
+from app.utils.datetime_utils import business_today
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from app.models.schemas.business import (
     BusinessCreate,
     BusinessDetailResponse,
@@ -53,10 +62,17 @@ async def create_business(
         timezone=body.timezone,
         location=body.location,
         phone=body.phone,
+        active_channel=ActiveChannelEnum(body.active_channel),
+        whatsapp_config=body.whatsapp_config,
         is_active=True,
     )
     session.add(business)
     await session.flush()
+    try:
+        await sync_business_routes(session, business)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    invalidate_business(session, business.id)
     return business
 
 
@@ -88,9 +104,18 @@ async def update_business(
             update_data["type"] = BusinessTypeEnum(update_data["type"])
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid type")
+    if update_data.get("active_channel") is not None:
+        update_data["active_channel"] = ActiveChannelEnum(update_data["active_channel"])
+    else:
+        update_data.pop("active_channel", None)
     for field, value in update_data.items():
         setattr(business, field, value)
     await session.flush()
+    try:
+        await sync_business_routes(session, business)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    invalidate_business(session, business_id)
     return business
 
 
@@ -119,6 +144,60 @@ async def get_slots(
     return {"slots": [{"label": s["label"], "time": s["time"]} for s in slots], "service_id": str(sid)}
 
 
+@router.get("/{business_id}/availability")
+async def get_availability(
+    business_id: UUID,
+    from_date: str | None = Query(None, description="YYYY-MM-DD (default: today in the business's timezone)"),
+    days: int = Query(14, ge=1, le=settings.AVAILABILITY_MAX_HORIZON_DAYS),
+    service_id: UUID | None = Query(None),
+    duration_minutes: int | None = Query(None, ge=1),
+    party_size: int | None = Query(None, ge=1, description="Guests (sets the tables / rooms needed)"),
+    nights: int = Query(1, ge=1, le=60, description="Stay length for hotels/hostels"),
+    limit: int = Query(5, ge=0, le=50, description="How many next_available slots to return"),
+    session: AsyncSession = Depends(get_db),
+) -> dict:
+    """Free slots per day over a date range, plus the first `limit` free slots (one bookings query)."""
+    try:
+        start = date_type.fromisoformat(from_date) if from_date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="from_date must be YYYY-MM-DD")
+    result = await session.execute(
+        select(Business)
+        .where(Business.id == business_id)
+        .options(selectinload(Business.services))
+        .limit(1)
+    )
+    business = result.scalars().first()
+    if not business:
+        raise HTTPException(status_code=404, detail="Business not found")
+    service = next((s for s in business.services if s.id == service_id), None) if service_id else None
+    if service_id and not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    if not service and business.services:
+        service = business.services[0]
+    start = start or business_today(business.timezone)
+
+    by_day = await booking_service.get_availability_range(
+        session, business, service, start, days, duration_minutes, party_size, nights
+    )
+    next_available = [
+        {"date": day.isoformat(), "time": t.isoformat(), "label": booking_service.slot_label(t)}
+        for day, t in islice(((day, t) for day, slots in by_day for t in slots), limit)
+    ]
+    return {
+        "service_id": str(service.id) if service else None,
+        "from_date": start.isoformat(),
+        "days": [
+            {
+                "date": day.isoformat(),
+                "slots": [{"label": booking_service.slot_label(t), "time": t.isoformat()} for t in slots],
+            }
+            for day, slots in by_day
+        ],
+        "next_available": next_available,
+    }
+
+
 # ── Services / Room Types ───────────────────────────────────────────────
 
 @router.get("/{business_id}/services", response_model=list[ServiceResponse])
@@ -158,6 +237,7 @@ async def create_service(
     )
     session.add(service)
     await session.flush()
+    invalidate_business(session, business_id)
     return service
 
 
@@ -181,6 +261,7 @@ async def update_service(
     for field, value in update_data.items():
         setattr(service, field, value)
     await session.flush()
+    invalidate_business(session, business_id)
     return service
 
 
@@ -198,6 +279,7 @@ async def delete_service(
         raise HTTPException(status_code=404, detail="Service not found")
     await session.delete(service)
     await session.flush()
+    invalidate_business(session, business_id)
     return {"message": "deleted"}
 
 
@@ -206,38 +288,81 @@ async def delete_service(
 @router.get("/{business_id}/bookings")
 async def list_business_bookings(
     business_id: UUID,
-    status: str | None = Query(None),
+    response: Response,
+    status: BookingStatusEnum | None = Query(None),
+    from_date: date_type | None = Query(None, description="Bookings on or after this date"),
+    to_date: date_type | None = Query(None, description="Bookings on or before this date"),
+    limit: int = Query(settings.BOOKING_LIST_DEFAULT_LIMIT, ge=1, le=settings.BOOKING_LIST_MAX_LIMIT),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
     session: AsyncSession = Depends(get_db),
 ) -> list[dict]:
-    q = (
-        select(Booking)
-        .where(Booking.business_id == business_id)
-        .options(selectinload(Booking.service), selectinload(Booking.customer))
-        .order_by(Booking.created_at.desc())
+    """Bookings of a business, newest first. More pages: pass the X-Next-Cursor response header as `cursor`."""
+    try:
+        rows, next_cursor = await booking_service.list_business_bookings(
+            session,
+            business_id,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            from_date=from_date,
+            to_date=to_date,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
+@router.get("/{business_id}/bookings/summary")
+async def business_bookings_summary(
+    business_id: UUID,
+    session: AsyncSession = Depends(get_db),
+) -> dict[str, int]:
+    """Booking counts per status and "total" (dashboard stats; GET /bookings returns one page at a time)."""
+    return await booking_service.business_booking_counts(session, business_id)
+
+
+@router.post("/{business_id}/bookings/import")
+async def import_business_bookings(
+    business_id: UUID,
+    file: UploadFile = File(...),
+    format: str | None = Query(None, pattern="^(csv|ndjson)$", description="Default: from the file name"),
+    session: AsyncSession = Depends(get_db),
+) -> dict:
+    """
+    Bulk import bookings (e.g. history from a spreadsheet) from a CSV (header row) or NDJSON upload.
+
+    Each row needs `service_id` or `service` (name), `booking_date`, `booking_time` (or `check_in_date`
+    for stays) and `customer_id` or `guest_phone` (customers are matched by phone, else created).
+    Optional: check_out_date, num_nights, num_guests, party_size, total_price, guest_name, guest_email,
+    notes, special_requests, status, booking_reference, created_at. All-or-nothing: any invalid row
+    returns 422 with the problems by line. Rows whose booking_reference already exists are skipped.
+    Confirmed future bookings get the usual 24h / 1h reminders if the customer is on Telegram or WhatsApp.
+    """
+    business = await session.get(Business, business_id)
+    if not business:
+        raise HTTPException(status_code=404, detail="Business not found")
+    fmt = format or booking_transfer.detect_format(file.filename, file.content_type)
+    result = await booking_transfer.import_bookings(session, business, file.file, fmt)
+    if result.errors:
+        raise HTTPException(status_code=422, detail={"message": "Import rejected", **result.as_dict()})
+    return result.as_dict()
+
+
+@router.get("/{business_id}/bookings/export")
+async def export_business_bookings(
+    business_id: UUID,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status: BookingStatusEnum | None = Query(None),
+    session: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Stream all bookings of a business as CSV or NDJSON (same fields as GET /bookings)."""
+    if not await session.get(Business, business_id):
+        raise HTTPException(status_code=404, detail="Business not found")
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        booking_transfer.export_bookings(business_id, format, status),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="bookings-{business_id}.{format}"'},
     )
-    if status:
-        q = q.where(Booking.status == status)
-    result = await session.execute(q)
-    bookings = result.scalars().all()
-    return [
-        {
-            "id": str(b.id),
-            "booking_reference": b.booking_reference,
-            "booking_date": b.booking_date.isoformat(),
-            "booking_time": b.booking_time.isoformat() if b.booking_time else None,
-            "check_in_date": b.check_in_date.isoformat() if b.check_in_date else None,
-            "check_out_date": b.check_out_date.isoformat() if b.check_out_date else None,
-            "num_guests": b.num_guests,
-            "num_nights": b.num_nights,
-            "total_price": str(b.total_price) if b.total_price else None,
-            "guest_name": b.guest_name or (b.customer.full_name if b.customer else None),
-            "guest_phone": b.guest_phone or (b.customer.phone_number if b.customer else None),
-            "party_size": b.party_size,
-            "status": b.status.value,
-            "service_name": b.service.name if b.service else None,
-            "special_requests": b.special_requests,
-            "notes": b.notes,
-            "created_at": b.created_at.isoformat() if b.created_at else None,
-        }
-        for b in bookings
-    ]
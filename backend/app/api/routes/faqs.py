@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.dependencies import get_db
 from app.models.db import FAQ
 from app.services import faq_service
+from app.services.business_service import invalidate_business
 from sqlalchemy import select
 
 router = APIRouter(tags=["faqs"])
@@ -114,6 +115,7 @@ async def add_faq(
         answer=body.answer,
         keywords=body.keywords or [],
     )
+    invalidate_business(session, business_id)
     return created
 
 
@@ -141,9 +143,10 @@ async def delete_faq(
     session: AsyncSession = Depends(get_db),
 ) -> dict:
     """Delete one FAQ by id."""
-    deleted = await faq_service.delete_faq(session, faq_id)
-    if not deleted:
+    business_id = await faq_service.delete_faq(session, faq_id)
+    if business_id is None:
         raise HTTPException(status_code=404, detail="FAQ not found")
+    invalidate_business(session, business_id)
     return {"message": "FAQ deleted"}
 
 
@@ -189,4 +192,5 @@ async def import_faqs(
             detail="Provide JSON body with 'faqs' array or upload a CSV/TXT file (Q: / A: blocks)",
         )
     created = await faq_service.add_faqs_bulk(session, business_id, items)
+    invalidate_business(session, business_id)
     return created
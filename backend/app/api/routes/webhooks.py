@@ -1,46 +1,113 @@
 """Telegram and WhatsApp webhook endpoints. No business logic — delegate to bot/services."""
+import hmac
+import json
 from typing import Any, Dict
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request, Response
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.api.dependencies import get_db
-from app.bot.telegram_entry import handle_telegram_update
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import PlainTextResponse
+from app.bot.ingest import submit_telegram_update, submit_whatsapp_messages
+from app.bot.whatsapp_entry import parse_whatsapp_webhook
+from app.channels.whatsapp import verify_signature
+from app.core.config import settings
+from app.core.telegram_bots import webhook_secret
+from app.services.channel_routing import TELEGRAM, WHATSAPP, channel_routes
 
 router = APIRouter(prefix="/webhook", tags=["webhooks"])
 
+TELEGRAM_SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
 
 @router.post("/telegram/{business_id}")
 async def telegram_webhook(
     business_id: UUID,
     request: Request,
-    session: AsyncSession = Depends(get_db),
 ) -> Response:
-    """Receive Telegram updates for a specific business. Body: Telegram Update object."""
+    """Receive Telegram updates for a specific business. Body: Telegram Update object.
+
+    Validates and enqueues; the bot pipeline runs on the ingestion worker pool, in order per chat.
+    Redelivered update_ids are acknowledged and dropped. Answers 503 when the queue is full so
+    Telegram retries later instead of us holding the request open.
+    """
     try:
         update: Dict[str, Any] = await request.json()
     except Exception:
         return Response(status_code=200)
-    if not update:
+    if not isinstance(update, dict) or not isinstance(update.get("update_id"), int):
         return Response(status_code=200)
-    await handle_telegram_update(update, session, business_id)
+    if not submit_telegram_update(business_id, update):
+        return Response(status_code=503, headers={"Retry-After": "5"})
     return Response(status_code=200)
 
 
+@router.post("/telegram/bot/{bot_id}")
+async def telegram_bot_webhook(
+    bot_id: str,
+    request: Request,
+) -> Response:
+    """Telegram updates addressed by bot id (the numeric prefix of the bot token) instead of business id.
+
+    Requests must carry the bot's webhook secret (set by telegram_bots.register_webhook) in
+    X-Telegram-Bot-Api-Secret-Token, else 403. The business is resolved from the in-memory routing
+    index; otherwise as telegram_webhook. Updates for unknown bots are acknowledged and dropped.
+    """
+    if not hmac.compare_digest(request.headers.get(TELEGRAM_SECRET_HEADER, ""), webhook_secret(bot_id)):
+        return Response(status_code=403)
+    if not channel_routes.ready:
+        return Response(status_code=503, headers={"Retry-After": "5"})
+    business_id = channel_routes.lookup(TELEGRAM, bot_id)
+    if business_id is None:
+        return Response(status_code=200)
+    return await telegram_webhook(business_id, request)
+
+
 @router.get("/whatsapp")
 async def whatsapp_verify(request: Request) -> Response:
-    """Meta verification challenge: echo hub.mode, hub.verify_token, hub.challenge."""
-    # TODO: verify token from query params, return hub.challenge
-    return Response(status_code=200)
+    """Meta verification challenge: echo hub.challenge when hub.verify_token matches WHATSAPP_VERIFY_TOKEN."""
+    params = request.query_params
+    if (
+        params.get("hub.mode") == "subscribe"
+        and settings.WHATSAPP_VERIFY_TOKEN
+        and params.get("hub.verify_token") == settings.WHATSAPP_VERIFY_TOKEN
+    ):
+        return PlainTextResponse(params.get("hub.challenge") or "")
+    return Response(status_code=403)
 
 
 @router.post("/whatsapp")
-async def whatsapp_webhook(
-    request: Request,
-    session: AsyncSession = Depends(get_db),
-) -> Response:
-    """Receive WhatsApp messages from Meta. Delegate to message_handler."""
-    # TODO: parse body, resolve business from phone_number_id, get/create customer, call message_handler
-    _ = await request.json()
+async def whatsapp_webhook(request: Request) -> Response:
+    """Receive WhatsApp messages from Meta (batched across numbers/tenants).
+
+    Checks the signature against META_APP_SECRET (refusing every POST while it is unset, unless
+    WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS is on for local development), parses every message in one pass, resolves
+    each receiving number to its business from the in-memory routing index (no DB round-trip) and
+    enqueues the messages (ordered per sender, deduplicated on wamid); several new senders in one
+    payload get their customers created in one batch. Unknown numbers are dropped.
+    Answers 503 while the index is not loaded or the queue is full; Meta redelivers and
+    already-queued messages are dropped as duplicates.
+    """
+    body = await request.body()
+    if settings.META_APP_SECRET:
+        if not verify_signature(body, request.headers.get("X-Hub-Signature-256"), settings.META_APP_SECRET):
+            return Response(status_code=403)
+    elif not settings.WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS:
+        return Response(status_code=403)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return Response(status_code=200)
+    if not isinstance(payload, dict):
+        return Response(status_code=200)
+    messages = parse_whatsapp_webhook(payload)
+    if not messages:
+        return Response(status_code=200)
+    if not channel_routes.ready:
+        return Response(status_code=503, headers={"Retry-After": "5"})
+    routed = []
+    for message in messages:
+        business_id = channel_routes.lookup(WHATSAPP, message.phone_number_id)
+        if business_id is not None:
+            routed.append((business_id, message))
+    if not submit_whatsapp_messages(routed):
+        return Response(status_code=503, headers={"Retry-After": "5"})
     return Response(status_code=200)
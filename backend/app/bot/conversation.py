@@ -0,0 +1,293 @@
+"""Channel-agnostic conversation turns, shared by the Telegram and WhatsApp entrypoints.
+
+The entrypoints parse their platform's payload, resolve the business snapshot, channel and customer
+id, then hand a text message or a button reply (the button's action string) to this module: load
+conversation, build system prompt, call AI, save history, dispatch actions.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import replace
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bot.handlers import appointments, booking, support
+from app.bot.handlers.message_handler import handle_incoming_message
+from app.channels.base import BaseChannel
+from app.core.config import settings
+from app.models.db import Service
+from app.services.ai_service import AIAction
+from app.services.customer_service import get_customer
+from app.services.conversation_state import (
+    ConversationState,
+    PendingBooking,
+    StaleConversationState,
+    load_conversation_state,
+    save_conversation_state,
+    update_conversation_state,
+)
+from app.services.history_store import history_store
+from app.services.support_service import get_active_support_session
+from app.services.tenant_cache import BusinessSnapshot
+from app.utils.context_builder import (
+    build_context,
+    record_prompt_tokens,
+    update_rolling_summary,
+    with_history_summary,
+)
+from app.utils.prompt_builder import booking_context_from_state, build_tenant_system_prompt
+
+logger = logging.getLogger(__name__)
+
+
+def _uuid_from_data(data: Dict[str, Any], key: str) -> UUID:
+    """Parse UUID from action payload; return nil UUID if missing/invalid."""
+    val = data.get(key)
+    if val is None:
+        return UUID(int=0)
+    if isinstance(val, UUID):
+        return val
+    try:
+        return UUID(str(val))
+    except (ValueError, TypeError):
+        return UUID(int=0)
+
+
+def _clear_pending_booking(state: ConversationState) -> None:
+    state.pending_booking = None
+
+
+async def handle_button_reply(
+    session: AsyncSession,
+    business: BusinessSnapshot,
+    channel: BaseChannel,
+    recipient_id: str,
+    customer_id: UUID,
+    data: str,
+) -> None:
+    """Handle a button/list choice (its action string): slot selection, confirm_booking, cancel_booking, manage_*."""
+    if data.startswith("manage_"):
+        await _handle_manage_reply(session, channel, recipient_id, data)
+        return
+
+    customer = await get_customer(session, customer_id)
+    state = load_conversation_state(customer)
+    pending = state.pending_booking or PendingBooking()
+
+    if data == "cancel_booking":
+        await update_conversation_state(session, customer, _clear_pending_booking, state=state)
+        await channel.send_message(recipient_id, "Booking cancelled. Start over whenever you like.")
+        return
+
+    if data == "confirm_booking":
+        if not pending.service_id or not pending.time:
+            await channel.send_message(recipient_id, "No booking to confirm. Please pick a time first.")
+            return
+        # Claim the pending booking first: of two concurrent confirms only one gets past this save.
+        state.pending_booking = None
+        try:
+            await save_conversation_state(session, customer, state)
+        except StaleConversationState:
+            await channel.send_message(recipient_id, "This booking was already confirmed or changed.")
+            return
+        await booking.on_booking_confirmed(
+            session,
+            channel,
+            recipient_id,
+            business.id,
+            customer_id,
+            {
+                "service_id": pending.service_id,
+                "booking_date": pending.booking_date or "",
+                "booking_time": pending.time,
+                "party_size": pending.party_size,
+                "special_requests": pending.special_requests,
+            },
+        )
+        return
+
+    # Assume data is a slot time (e.g. "19:00:00" or "19:00")
+    if not pending.service_id or not pending.booking_date:
+        await channel.send_message(recipient_id, "Please pick a time from the list above.")
+        return
+    try:
+        service_id_uuid = UUID(pending.service_id)
+    except (ValueError, TypeError):
+        await channel.send_message(recipient_id, "Invalid selection. Please start again.")
+        return
+    state.pending_booking = replace(pending, time=data)
+    try:
+        await save_conversation_state(session, customer, state)
+    except StaleConversationState:
+        await channel.send_message(recipient_id, "Those times are out of date. Please pick from the latest list.")
+        return
+    service_result = await session.execute(
+        select(Service).where(Service.id == service_id_uuid, Service.business_id == business.id).limit(1)
+    )
+    service = service_result.scalars().first()
+    service_name = service.name if service else "Service"
+    price_str = f"{service.price}" if service and getattr(service, "price", None) is not None else "Pay at venue"
+    await booking.show_confirmation(
+        channel,
+        recipient_id,
+        business.name,
+        service_name,
+        party_size=pending.party_size,
+        formatted_date=pending.booking_date,
+        time_str=data,
+        price_str=price_str,
+        requests_str=pending.special_requests or "None",
+    )
+
+
+async def _handle_manage_reply(session: AsyncSession, channel: BaseChannel, recipient_id: str, data: str) -> None:
+    """manage_cancel_/manage_reschedule_/manage_booking_ choices; they act on a booking, not on the conversation state."""
+    if data.startswith("manage_cancel_"):
+        try:
+            bid = UUID(data.replace("manage_cancel_", "").strip())
+        except (ValueError, AttributeError):
+            await channel.send_message(recipient_id, "Invalid booking.")
+            return
+        from app.services.booking_service import cancel_booking
+        cancelled = await cancel_booking(session, bid)
+        if cancelled:
+            await channel.send_message(recipient_id, "Your booking has been cancelled.")
+        else:
+            await channel.send_message(recipient_id, "Booking not found or could not be cancelled.")
+        return
+
+    if data.startswith("manage_reschedule_"):
+        await channel.send_message(
+            recipient_id,
+            "Reply with the date you'd like (e.g. tomorrow or a specific date) and we'll show available times.",
+        )
+        return
+
+    if data.startswith("manage_booking_"):
+        try:
+            bid = UUID(data.replace("manage_booking_", "").strip())
+        except (ValueError, AttributeError):
+            await channel.send_message(recipient_id, "Invalid booking.")
+            return
+        await appointments.show_manage_options(channel, recipient_id, bid, session=session)
+        return
+
+    await channel.send_message(recipient_id, "Invalid booking.")
+
+
+async def handle_text_message(
+    session: AsyncSession,
+    business: BusinessSnapshot,
+    channel: BaseChannel,
+    recipient_id: str,
+    customer_id: UUID,
+    text: str,
+) -> None:
+    """Process one free-text customer message: support forwarding, or an AI turn and its action."""
+    business_id = business.id
+
+    active_session = await get_active_support_session(session, customer_id, business_id)
+    if active_session and business.telegram_group_id:
+        customer = await get_customer(session, customer_id)
+        await channel.forward_to_group(
+            business.telegram_group_id,
+            f"Customer ({customer.full_name or 'Guest'}): {text}",
+        )
+        return
+
+    history = await history_store.recent(session, customer_id, business_id)
+    window = build_context(history, text, settings.CONTEXT_TOKEN_BUDGET)
+    messages = window.messages
+
+    # State changes are saved together once the turn is done (re-applied if another update won the race).
+    customer = await get_customer(session, customer_id)
+    state = load_conversation_state(customer)
+    changes: list[Callable[[ConversationState], None]] = []
+    summary = state.history_summary(business_id)
+    if settings.CONTEXT_SUMMARY_ENABLED and window.dropped:
+        updated = update_rolling_summary(summary, window.dropped, settings.CONTEXT_SUMMARY_MAX_CHARS)
+        if updated != summary:
+            summary = updated
+            changes.append(lambda s: s.set_history_summary(business_id, updated))
+
+    system_prompt = build_tenant_system_prompt(
+        business,
+        booking_context_from_state(state.booking_context()),
+    )
+    if settings.CONTEXT_SUMMARY_ENABLED:
+        system_prompt = with_history_summary(system_prompt, summary)
+    prompt_tokens = record_prompt_tokens(system_prompt, window)
+    logger.debug(
+        "business=%s customer=%s prompt_tokens~%d history=%d dropped=%d",
+        business_id, customer_id, prompt_tokens, len(messages) - 1, len(window.dropped),
+    )
+
+    result = await handle_incoming_message(
+        channel=channel,
+        recipient_id=recipient_id,
+        business_id=business_id,
+        customer_id=customer_id,
+        text=text,
+        system_prompt=system_prompt,
+        messages=messages,
+    )
+
+    if result:
+        if result.reply_text and not result.streamed:
+            await channel.send_message(recipient_id, result.reply_text)
+
+        await history_store.append_turn(session, customer_id, business_id, text, result.reply_text or "")
+
+        data = result.data or {}
+        group_id = business.telegram_group_id or "0"
+        customer_name = customer.full_name or "Customer"
+
+        if result.action == AIAction.SHOW_SLOTS:
+            party_size = data.get("party_size")
+            if party_size is not None and not isinstance(party_size, int):
+                try:
+                    party_size = int(party_size)
+                except (ValueError, TypeError):
+                    party_size = None
+            service_id = _uuid_from_data(data, "service_id")
+            if (not service_id or service_id.int == 0) and business.services:
+                service_id = business.services[0].id
+            booking_date = data.get("date") or data.get("booking_date") or ""
+            if service_id and service_id.int:
+                offer = PendingBooking(service_id=str(service_id), booking_date=booking_date, party_size=party_size)
+                changes.append(lambda s: setattr(s, "pending_booking", offer))
+            await booking.show_available_slots(
+                channel,
+                recipient_id,
+                business_id,
+                service_id,
+                booking_date,
+                party_size,
+                session=session,
+            )
+        elif result.action == AIAction.SHOW_BOOKINGS:
+            await appointments.show_bookings(
+                channel, recipient_id, customer_id, business_id, session=session
+            )
+        elif result.action == AIAction.MANAGE_BOOKING:
+            await appointments.show_manage_options(
+                channel, recipient_id, _uuid_from_data(data, "booking_id"), session=session
+            )
+        elif result.action == AIAction.HUMAN_HANDOFF:
+            await support.initiate_handoff(
+                channel,
+                recipient_id,
+                group_id=group_id,
+                customer_id=customer_id,
+                customer_name=customer_name,
+                last_message=text,
+            )
+        elif result.action == AIAction.CONFIRM_BOOKING:
+            pass
+
+    if changes:
+        await update_conversation_state(session, customer, *changes, state=state)
@@ -1,4 +1,5 @@
 """Booking flow: show_available_slots, show_confirmation, on_booking_confirmed. See CLAUDE Booking Flow."""
+from datetime import date, timedelta
 from uuid import UUID
 
 from sqlalchemy import select
@@ -8,13 +9,9 @@ from sqlalchemy.orm import selectinload
 from app.bot.keyboards import confirm_booking_buttons, slot_buttons
 from app.channels.base import BaseChannel
 from app.models.db import Business, Customer, Service
-from app.services.booking_service import (
-    create_booking,
-    get_available_slots,
-    update_booking_reminder_jobs,
-)
-from app.services.reminder_service import schedule_reminders
-from app.utils.message_templates import confirmation_body, new_booking_notification
+from app.services.booking_service import create_booking, find_next_available, get_available_slots
+from app.services.business_service import get_business_snapshot
+from app.utils.message_templates import confirmation_body, new_booking_notification, no_slots_for_date
 
 
 async def show_available_slots(
@@ -35,9 +32,25 @@ async def show_available_slots(
     )
     service = service_result.scalars().first()
 
-    slots = await get_available_slots(session, business_id, service_id, booking_date)
+    slots = await get_available_slots(session, business_id, service_id, booking_date, party_size)
     if not slots:
-        await channel.send_message(recipient_id, "No available slots for that date. Try another day?")
+        suggestions: list[dict] = []
+        business = await get_business_snapshot(session, business_id)
+        try:
+            day = date.fromisoformat(booking_date)
+        except ValueError:
+            day = None
+        if business and day:
+            suggestions = await find_next_available(
+                session,
+                business,
+                service,
+                from_date=day + timedelta(days=1),
+                horizon_days=14,
+                limit=3,
+                party_size=party_size,
+            )
+        await channel.send_message(recipient_id, no_slots_for_date(booking_date, suggestions))
         return
     buttons = slot_buttons(slots, page=0, per_page=8)
 
@@ -110,11 +123,6 @@ async def on_booking_confirmed(
         return
 
     ref = created.get("booking_reference", "")
-    bid = created.get("id")
-    if bid:
-        booking_uuid = UUID(bid)
-    else:
-        booking_uuid = None
 
     business_result = await session.execute(
         select(Business).where(Business.id == business_id).options(selectinload(Business.services)).limit(1)
@@ -127,24 +135,11 @@ async def on_booking_confirmed(
     )
     service = service_result.scalars().first()
 
-    business_name = business.name if business else "Business"
     customer_name = customer.full_name or "Guest" if customer else "Guest"
     customer_phone = customer.phone_number or "" if customer else ""
     service_name = service.name if service else "Service"
     size_str = str(party_size) if party_size is not None else ""
 
-    job_24h, job_1h = schedule_reminders(
-        booking_id=booking_uuid or UUID(int=0),
-        booking_date=booking_date,
-        booking_time=booking_time,
-        business_name=business_name,
-        customer_recipient_id=recipient_id,
-        reference=ref,
-        party_size=size_str,
-    )
-    if booking_uuid:
-        await update_booking_reminder_jobs(session, booking_uuid, job_24h, job_1h)
-
     if business and business.telegram_group_id:
         await channel.forward_to_group(
             business.telegram_group_id,
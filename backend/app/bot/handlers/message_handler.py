@@ -2,7 +2,9 @@
 from uuid import UUID
 
 from app.channels.base import BaseChannel
-from app.services.ai_service import AIResult, process_message
+from app.channels.streaming import StreamingReply
+from app.core.config import settings
+from app.services.ai_service import AIResult, process_message, stream_message
 
 
 async def handle_incoming_message(
@@ -18,7 +20,20 @@ async def handle_incoming_message(
     High-level entry: get AI result, then dispatch by action.
     Caller is responsible for: loading conversation history, building system_prompt, saving messages.
     Returns AIResult so caller can dispatch SHOW_SLOTS, SHOW_BOOKINGS, etc.
+
+    When AI_STREAMING is on and the channel can edit messages, the reply is streamed to the customer
+    as it is generated and the result comes back with `streamed=True` (caller must not send it again).
     """
+    if settings.AI_STREAMING and channel.supports_edits:
+        reply = StreamingReply(channel, recipient_id)
+        try:
+            result = await stream_message(system_prompt=system_prompt, messages=messages, on_text=reply.update)
+            await reply.finish(result.reply_text)
+        finally:
+            await reply.close()
+        result.streamed = True
+        return result
+
     result = await process_message(system_prompt=system_prompt, messages=messages)
     # Caller sends result.reply_text via channel and dispatches result.action (booking, appointments, support).
     return result
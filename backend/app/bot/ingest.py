@@ -0,0 +1,94 @@
+"""Webhook ingestion: routes enqueue updates here; a worker pool runs the bot pipeline off the request path."""
+from typing import Any
+from uuid import UUID
+
+from app.bot.telegram_entry import handle_telegram_update
+from app.bot.whatsapp_entry import WhatsAppMessage, handle_whatsapp_message
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.update_queue import UpdateQueue
+from app.services.customer_service import WHATSAPP, prefetch_customers
+
+
+def telegram_chat_key(update: dict[str, Any]) -> Any:
+    """Chat the update belongs to (messages, edits, button callbacks); None if it has no chat."""
+    message = update.get("message") or update.get("edited_message")
+    if message is None and update.get("callback_query"):
+        cq = update["callback_query"]
+        message = cq.get("message") or {"chat": cq.get("from")}
+    chat = (message or {}).get("chat") or {}
+    return chat.get("id")
+
+
+async def process_telegram_update(business_id: UUID, update: dict[str, Any]) -> None:
+    """Run one Telegram update in its own session/transaction (same commit/rollback as get_db)."""
+    async with async_session_maker() as session:
+        try:
+            await handle_telegram_update(update, session, business_id)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+telegram_updates = UpdateQueue(
+    "telegram",
+    process_telegram_update,
+    workers=settings.UPDATE_QUEUE_WORKERS,
+    max_pending=settings.UPDATE_QUEUE_MAX_PENDING,
+    per_tenant_concurrency=settings.UPDATE_QUEUE_PER_TENANT_CONCURRENCY,
+    dedup_window=settings.UPDATE_DEDUP_WINDOW,
+    dedup_ttl_seconds=settings.UPDATE_DEDUP_TTL_SECONDS,
+)
+
+
+def submit_telegram_update(business_id: UUID, update: dict[str, Any]) -> bool:
+    """Enqueue ordered per (business, chat), deduplicated on (business, update_id). False = queue full."""
+    chat_id = telegram_chat_key(update)
+    return telegram_updates.submit(
+        business_id,
+        update,
+        key=(business_id, chat_id) if chat_id is not None else None,
+        dedup_id=(business_id, update.get("update_id")),
+    )
+
+
+async def process_whatsapp_message(business_id: UUID, message: WhatsAppMessage) -> None:
+    """Run one inbound WhatsApp message in its own session/transaction."""
+    async with async_session_maker() as session:
+        try:
+            await handle_whatsapp_message(message, session, business_id)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+whatsapp_updates = UpdateQueue(
+    "whatsapp",
+    process_whatsapp_message,
+    workers=settings.UPDATE_QUEUE_WORKERS,
+    max_pending=settings.UPDATE_QUEUE_MAX_PENDING,
+    per_tenant_concurrency=settings.UPDATE_QUEUE_PER_TENANT_CONCURRENCY,
+    dedup_window=settings.UPDATE_DEDUP_WINDOW,
+    dedup_ttl_seconds=settings.UPDATE_DEDUP_TTL_SECONDS,
+)
+
+
+def submit_whatsapp_message(business_id: UUID, message: WhatsAppMessage) -> bool:
+    """Enqueue ordered per (business, sender), deduplicated on the wamid. False = queue full."""
+    return whatsapp_updates.submit(
+        business_id,
+        message,
+        key=(business_id, message.wa_id),
+        dedup_id=message.message_id,
+    )
+
+
+def submit_whatsapp_messages(routed: list[tuple[UUID, WhatsAppMessage]]) -> bool:
+    """Enqueue one webhook payload's messages, resolving its unknown senders' customers in one batch."""
+    prefetch_customers(WHATSAPP, {message.wa_id: message.profile_name for _, message in routed})
+    accepted = True
+    for business_id, message in routed:
+        accepted = submit_whatsapp_message(business_id, message) and accepted
+    return accepted
@@ -0,0 +1,123 @@
+"""WhatsApp entrypoint: parse Meta webhook payloads and run each inbound message.
+
+Meta batches: one POST can carry several entries, each with several changes, each with several
+messages (and delivery statuses, which are ignored). parse_whatsapp_webhook flattens a payload in a
+single pass into WhatsAppMessage records; the route resolves businesses and enqueues them, and
+handle_whatsapp_message resolves channel and customer and hands the turn to app.bot.conversation.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bot.conversation import handle_button_reply, handle_text_message
+from app.channels.telegram import TelegramChannel
+from app.channels.whatsapp import WhatsAppChannel
+from app.core.config import settings
+from app.core.telegram_bots import get_bot
+from app.services.business_service import get_business_snapshot
+from app.services.customer_service import WHATSAPP, resolve_customer_id
+from app.services.tenant_cache import BusinessSnapshot
+
+
+@dataclass(frozen=True, slots=True)
+class WhatsAppMessage:
+    """One inbound message. `reply_id` is set for button/list taps (the option's action)."""
+
+    phone_number_id: str
+    wa_id: str
+    message_id: str
+    type: str
+    text: str | None = None
+    reply_id: str | None = None
+    profile_name: str | None = None
+
+
+def _message_content(message: dict[str, Any]) -> tuple[str | None, str | None]:
+    """(text, reply_id) of a message; both None for types the bot does not read (media, reactions…)."""
+    kind = message.get("type")
+    if kind == "text":
+        return (message.get("text") or {}).get("body"), None
+    if kind == "interactive":
+        interactive = message.get("interactive") or {}
+        reply = interactive.get("button_reply") or interactive.get("list_reply") or {}
+        return reply.get("title"), reply.get("id")
+    if kind == "button":
+        button = message.get("button") or {}
+        return button.get("text"), button.get("payload")
+    return None, None
+
+
+def parse_whatsapp_webhook(payload: dict[str, Any]) -> list[WhatsAppMessage]:
+    """Every readable message in a webhook payload, in delivery order."""
+    parsed: list[WhatsAppMessage] = []
+    if payload.get("object") != "whatsapp_business_account":
+        return parsed
+    for entry in payload.get("entry") or ():
+        for change in entry.get("changes") or ():
+            if change.get("field") != "messages":
+                continue
+            value = change.get("value") or {}
+            messages = value.get("messages")
+            if not messages:
+                continue
+            phone_number_id = str((value.get("metadata") or {}).get("phone_number_id") or "")
+            names = {
+                c.get("wa_id"): (c.get("profile") or {}).get("name") for c in value.get("contacts") or ()
+            }
+            for message in messages:
+                wa_id, message_id = message.get("from"), message.get("id")
+                if not phone_number_id or not wa_id or not message_id:
+                    continue
+                text, reply_id = _message_content(message)
+                if not text and not reply_id:
+                    continue
+                parsed.append(
+                    WhatsAppMessage(
+                        phone_number_id=phone_number_id,
+                        wa_id=str(wa_id),
+                        message_id=str(message_id),
+                        type=message.get("type") or "",
+                        text=text,
+                        reply_id=reply_id,
+                        profile_name=names.get(wa_id),
+                    )
+                )
+    return parsed
+
+
+def whatsapp_channel_for(business: BusinessSnapshot, message: WhatsAppMessage) -> WhatsAppChannel:
+    """Channel replying from the number the message was sent to; staff notices go to the Telegram group."""
+    config = business.whatsapp_config or {}
+    staff = TelegramChannel(bot=get_bot(business.telegram_bot_token)) if business.telegram_group_id else None
+    return WhatsAppChannel(
+        message.phone_number_id,
+        config.get("access_token") or settings.WHATSAPP_ACCESS_TOKEN,
+        staff_channel=staff,
+        inbound_message_id=message.message_id,
+    )
+
+
+async def handle_whatsapp_message(
+    message: WhatsAppMessage,
+    session: AsyncSession,
+    business_id: UUID,
+) -> None:
+    """Process one inbound WhatsApp message end-to-end: button reply or text."""
+    business = await get_business_snapshot(session, business_id)
+    if not business:
+        return
+    channel = whatsapp_channel_for(business, message)
+    try:
+        # Blue ticks + typing indicator while the reply is prepared; cosmetic, so never fatal.
+        await channel.send_typing(message.wa_id)
+    except Exception:
+        pass
+    customer_id = await resolve_customer_id(session, WHATSAPP, message.wa_id, message.profile_name)
+    if message.reply_id:
+        await handle_button_reply(session, business, channel, message.wa_id, customer_id, message.reply_id.strip())
+        return
+    await handle_text_message(session, business, channel, message.wa_id, customer_id, message.text or "")
@@ -6,6 +6,10 @@ from typing import Any
 class BaseChannel(ABC):
     """Interface that Telegram and WhatsApp implementations must implement."""
 
+    # Channels that can edit a sent message (used to stream AI replies) set this and override
+    # send_editable_message / edit_message.
+    supports_edits: bool = False
+
     @abstractmethod
     async def send_message(self, recipient_id: str, text: str) -> None:
         """Send a plain text message to the recipient."""
@@ -30,3 +34,12 @@ class BaseChannel(ABC):
     async def forward_to_group(self, group_id: str, text: str) -> None:
         """Forward a message to the business Telegram group (e.g. support notifications)."""
         ...
+
+    async def send_editable_message(self, recipient_id: str, text: str) -> str | None:
+        """Send a message and return a handle for edit_message (None if the channel cannot edit)."""
+        await self.send_message(recipient_id, text)
+        return None
+
+    async def edit_message(self, recipient_id: str, message_id: str, text: str) -> None:
+        """Replace the text of a message sent with send_editable_message."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support message edits")
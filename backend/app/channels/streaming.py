@@ -0,0 +1,73 @@
+"""Incremental reply delivery: send the first chunk, then throttle-edit the same message as text grows."""
+import asyncio
+import time
+
+from app.channels.base import BaseChannel
+from app.core.config import settings
+
+
+class StreamingReply:
+    """Deliver a growing reply on a channel that supports_edits.
+
+    update() is synchronous and never waits on the network: the first non-empty text is sent
+    immediately, later text is pushed by at most one in-flight edit every `min_interval` seconds.
+    finish() waits for that edit and writes the final text; close() (always, e.g. in a finally) cancels
+    an edit still in flight when the stream failed before finish().
+    """
+
+    def __init__(
+        self,
+        channel: BaseChannel,
+        recipient_id: str,
+        min_interval: float | None = None,
+    ) -> None:
+        self.channel = channel
+        self.recipient_id = recipient_id
+        self.min_interval = settings.AI_STREAM_EDIT_INTERVAL_SECONDS if min_interval is None else min_interval
+        self._message_id: str | None = None
+        self._latest = ""
+        self._sent = ""
+        self._last_push = 0.0
+        self._task: asyncio.Task | None = None
+
+    def update(self, text: str) -> None:
+        """Record the visible text so far and push it if the throttle allows."""
+        self._latest = text
+        if self._task is not None and not self._task.done():
+            return
+        if self._sent and time.monotonic() - self._last_push < self.min_interval:
+            return
+        self._task = asyncio.create_task(self._push())
+
+    async def _push(self) -> None:
+        text = self._latest
+        if not text.strip() or text == self._sent:
+            return
+        self._last_push = time.monotonic()
+        if self._message_id is None:
+            self._message_id = await self.channel.send_editable_message(self.recipient_id, text)
+        else:
+            await self.channel.edit_message(self.recipient_id, self._message_id, text)
+        self._sent = text
+
+    async def finish(self, final_text: str) -> None:
+        """Wait for any in-flight send/edit, then make the message read exactly `final_text`."""
+        if self._task is not None:
+            await self._task
+        if not final_text or final_text == self._sent:
+            return
+        if self._message_id is None:
+            await self.channel.send_message(self.recipient_id, final_text)
+        else:
+            await self.channel.edit_message(self.recipient_id, self._message_id, final_text)
+        self._sent = final_text
+
+    async def close(self) -> None:
+        """Cancel an in-flight send/edit and collect its outcome, so a failed stream leaves no task behind."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        await asyncio.wait([task])
+        if not task.cancelled():
+            task.exception()
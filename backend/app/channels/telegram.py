@@ -1,27 +1,83 @@
-"""Telegram channel implementation. Used for development and testing (high-level via python-telegram-bot)."""
-from typing import Any
+"""Telegram channel implementation. Used for development and testing (high-level via python-telegram-bot).
+
+Every Bot API call goes through `telegram_sends`, which keeps each bot under Telegram's flood limits
+(per bot, per chat, stricter for groups) and retries on RetryAfter.
+"""
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any, TypeVar
 
 from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ChatAction
+from telegram.error import BadRequest, RetryAfter
 
 from app.channels.base import BaseChannel
 from app.core.config import settings
+from app.core.send_queue import SendQueue
+from app.core.telegram_bots import get_bot
+
+T = TypeVar("T")
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    return float(exc.retry_after) if isinstance(exc, RetryAfter) else None
+
+
+telegram_sends = SendQueue(
+    "telegram",
+    sender_rate=settings.TELEGRAM_SEND_RATE_PER_BOT,
+    chat_rate=settings.TELEGRAM_SEND_RATE_PER_CHAT,
+    chat_burst=settings.TELEGRAM_SEND_BURST_PER_CHAT,
+    retry_after=_retry_after,
+    max_retries=settings.SEND_QUEUE_MAX_RETRIES,
+    max_retry_after=settings.SEND_QUEUE_MAX_RETRY_AFTER_SECONDS,
+    max_senders=settings.TELEGRAM_BOT_POOL_MAX_SIZE,
+    max_chats=settings.SEND_QUEUE_MAX_TRACKED_CHATS,
+)
 
 
 class TelegramChannel(BaseChannel):
     """Telegram implementation of BaseChannel using python-telegram-bot's Bot."""
 
+    supports_edits = True
+
     def __init__(self, bot: Bot | None = None) -> None:
-        # Create a Bot on demand if not injected (webhook mode).
-        self._bot = bot or Bot(token=settings.TELEGRAM_BOT_TOKEN)
+        # Default: the pooled Bot for TELEGRAM_BOT_TOKEN (tenants pass get_bot(their token)).
+        self._bot = bot or get_bot()
 
     @property
     def bot(self) -> Bot:
         return self._bot
 
+    def _queued(self, chat_id: int, call: Callable[[], Awaitable[T]], *, per_chat: bool = True) -> Awaitable[T]:
+        """Run a Bot API call for `chat_id` through the send queue (groups have negative ids)."""
+        # Chat keys carry the bot id (the token's public prefix) so the token never reaches logs.
+        chat = (self.bot.token.partition(":")[0], chat_id) if per_chat else None
+        rate = settings.TELEGRAM_SEND_RATE_PER_GROUP if chat_id < 0 else None
+        return telegram_sends.send(self.bot.token, chat, call, chat_rate=rate)
+
     async def send_message(self, recipient_id: str, text: str) -> None:
         """Send a plain text message."""
-        await self.bot.send_message(chat_id=int(recipient_id), text=text)
+        chat_id = int(recipient_id)
+        await self._queued(chat_id, partial(self.bot.send_message, chat_id=chat_id, text=text))
+
+    async def send_editable_message(self, recipient_id: str, text: str) -> str | None:
+        """Send a plain text message and return its message_id for later edits."""
+        chat_id = int(recipient_id)
+        message = await self._queued(chat_id, partial(self.bot.send_message, chat_id=chat_id, text=text))
+        return str(message.message_id)
+
+    async def edit_message(self, recipient_id: str, message_id: str, text: str) -> None:
+        """Edit a previously sent text message. Unchanged text is not an error."""
+        chat_id = int(recipient_id)
+        try:
+            await self._queued(
+                chat_id,
+                partial(self.bot.edit_message_text, text=text, chat_id=chat_id, message_id=int(message_id)),
+            )
+        except BadRequest as exc:
+            if "not modified" not in str(exc).lower():
+                raise
 
     async def send_buttons(
         self, recipient_id: str, text: str, buttons: list[dict[str, Any]]
@@ -34,7 +90,8 @@ class TelegramChannel(BaseChannel):
             keyboard.append([InlineKeyboardButton(label, callback_data=str(callback_data))])
 
         markup = InlineKeyboardMarkup(keyboard) if keyboard else None
-        await self.bot.send_message(chat_id=int(recipient_id), text=text, reply_markup=markup)
+        chat_id = int(recipient_id)
+        await self._queued(chat_id, partial(self.bot.send_message, chat_id=chat_id, text=text, reply_markup=markup))
 
     async def send_list(
         self, recipient_id: str, text: str, items: list[dict[str, Any]]
@@ -47,9 +104,13 @@ class TelegramChannel(BaseChannel):
         await self.send_buttons(recipient_id, text, buttons)
 
     async def send_typing(self, recipient_id: str) -> None:
-        """Show typing indicator."""
-        await self.bot.send_chat_action(chat_id=int(recipient_id), action=ChatAction.TYPING)
+        """Show typing indicator (per-bot limit only, so it never delays the reply itself)."""
+        chat_id = int(recipient_id)
+        await self._queued(
+            chat_id, partial(self.bot.send_chat_action, chat_id=chat_id, action=ChatAction.TYPING), per_chat=False
+        )
 
     async def forward_to_group(self, group_id: str, text: str) -> None:
         """Send message to staff Telegram group."""
-        await self.bot.send_message(chat_id=int(group_id), text=text)
+        chat_id = int(group_id)
+        await self._queued(chat_id, partial(self.bot.send_message, chat_id=chat_id, text=text))
@@ -1,38 +1,226 @@
-"""WhatsApp channel implementation (Meta Cloud API). Credentials per business in DB."""
+"""WhatsApp channel implementation (Meta Cloud API). Credentials per business in DB.
+
+Messages are POSTed to `{WHATSAPP_GRAPH_API_URL}/{phone_number_id}/messages` on the shared pooled
+httpx client ("whatsapp"), through `whatsapp_sends`: per-number throughput and per-recipient (pair)
+limits, retrying when Meta answers with a rate-limit error. Buttons map to interactive reply buttons
+(at most 3) and longer choices to an interactive list (at most 10 rows); the tapped option comes back
+in the webhook with the button's `action` as its id.
+"""
+import hashlib
+import hmac
+import logging
 from typing import Any
 
+import httpx
+
 from app.channels.base import BaseChannel
+from app.core.config import settings
+from app.core.http import get_http_client
+from app.core.send_queue import SendQueue
+
+logger = logging.getLogger(__name__)
+
+# Cloud API field limits.
+TEXT_MAX = 4096
+INTERACTIVE_BODY_MAX = 1024
+MAX_REPLY_BUTTONS = 3
+BUTTON_TITLE_MAX = 20
+MAX_LIST_ROWS = 10
+ROW_TITLE_MAX = 24
+ROW_DESCRIPTION_MAX = 72
+ID_MAX = 256
+
+# Error codes Meta uses for throttling: app/account/number throughput and per-recipient pair limits.
+RATE_LIMIT_CODES = frozenset({4, 80007, 130429, 131048, 131056})
+
+
+class WhatsAppAPIError(Exception):
+    """Non-2xx answer from the Graph API."""
+
+    def __init__(self, status_code: int, code: int | None, message: str, retry_after: float | None = None) -> None:
+        super().__init__(f"WhatsApp API error {status_code} (code {code}): {message}")
+        self.status_code = status_code
+        self.code = code
+        self.retry_after = retry_after
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.status_code == 429 or self.code in RATE_LIMIT_CODES
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    if isinstance(exc, WhatsAppAPIError) and exc.rate_limited:
+        return exc.retry_after or settings.WHATSAPP_RETRY_AFTER_SECONDS
+    return None
+
+
+whatsapp_sends = SendQueue(
+    "whatsapp",
+    sender_rate=settings.WHATSAPP_SEND_RATE_PER_NUMBER,
+    chat_rate=settings.WHATSAPP_SEND_RATE_PER_CHAT,
+    chat_burst=settings.WHATSAPP_SEND_BURST_PER_CHAT,
+    retry_after=_retry_after,
+    max_retries=settings.SEND_QUEUE_MAX_RETRIES,
+    max_retry_after=settings.SEND_QUEUE_MAX_RETRY_AFTER_SECONDS,
+    max_chats=settings.SEND_QUEUE_MAX_TRACKED_CHATS,
+)
+
+
+def verify_signature(body: bytes, signature: str | None, app_secret: str) -> bool:
+    """Check Meta's X-Hub-Signature-256 header ("sha256=<hex HMAC of the raw body>")."""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(app_secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature.removeprefix("sha256="))
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _option_id(option: dict[str, Any]) -> str:
+    return str(option.get("action") or option.get("payload") or option.get("label", ""))[:ID_MAX]
 
 
 class WhatsAppChannel(BaseChannel):
-    """WhatsApp (Meta Cloud API) implementation. Uses business-specific whatsapp_config from DB."""
+    """WhatsApp (Meta Cloud API) implementation. Uses business-specific whatsapp_config from DB.
+
+    `staff_channel` receives forward_to_group (WhatsApp has no bot-accessible groups; staff groups
+    stay on Telegram). `inbound_message_id` is the message being answered: send_typing marks it read
+    and shows the typing indicator.
+    """
 
     def __init__(
         self,
         phone_number_id: str,
         access_token: str,
+        *,
+        staff_channel: BaseChannel | None = None,
+        inbound_message_id: str | None = None,
+        client: httpx.AsyncClient | None = None,
     ) -> None:
         self.phone_number_id = phone_number_id
         self.access_token = access_token
+        self.staff_channel = staff_channel
+        self.inbound_message_id = inbound_message_id
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_http_client("whatsapp")
+
+    async def _post(self, payload: dict[str, Any]) -> dict[str, Any]:
+        response = await self.client.post(
+            f"{settings.WHATSAPP_GRAPH_API_URL}/{self.phone_number_id}/messages",
+            json={"messaging_product": "whatsapp", **payload},
+            headers={"Authorization": f"Bearer {self.access_token}"},
+        )
+        if response.is_success:
+            return response.json()
+        try:
+            error = response.json().get("error") or {}
+        except ValueError:
+            error = {}
+        retry_after = response.headers.get("Retry-After")
+        raise WhatsAppAPIError(
+            response.status_code,
+            error.get("code"),
+            error.get("message") or response.text[:200],
+            float(retry_after) if retry_after and retry_after.isdigit() else None,
+        )
+
+    async def _send(self, recipient_id: str, payload: dict[str, Any]) -> str | None:
+        """Queue one message to `recipient_id`; returns its wamid."""
+        payload = {"recipient_type": "individual", "to": recipient_id, **payload}
+        result = await whatsapp_sends.send(
+            self.phone_number_id, (self.phone_number_id, recipient_id), lambda: self._post(payload)
+        )
+        messages = result.get("messages") or [{}]
+        return messages[0].get("id")
 
     async def send_message(self, recipient_id: str, text: str) -> None:
-        # POST to Meta Cloud API; use httpx. Implement when wiring webhook.
-        raise NotImplementedError("WhatsAppChannel.send_message: implement Meta API call with httpx")
+        await self._send(recipient_id, {"type": "text", "text": {"body": _clip(text, TEXT_MAX)}})
 
     async def send_buttons(
         self, recipient_id: str, text: str, buttons: list[dict[str, Any]]
     ) -> None:
-        raise NotImplementedError("WhatsAppChannel.send_buttons: implement Meta API call with httpx")
+        """Up to 3 options as reply buttons; more become a list message."""
+        if not buttons:
+            await self.send_message(recipient_id, text)
+            return
+        if len(buttons) > MAX_REPLY_BUTTONS:
+            await self.send_list(recipient_id, text, buttons)
+            return
+        await self._send(
+            recipient_id,
+            {
+                "type": "interactive",
+                "interactive": {
+                    "type": "button",
+                    "body": {"text": _clip(text, INTERACTIVE_BODY_MAX)},
+                    "action": {
+                        "buttons": [
+                            {
+                                "type": "reply",
+                                "reply": {"id": _option_id(b), "title": _clip(b.get("label", ""), BUTTON_TITLE_MAX)},
+                            }
+                            for b in buttons
+                        ]
+                    },
+                },
+            },
+        )
 
     async def send_list(
         self, recipient_id: str, text: str, items: list[dict[str, Any]]
     ) -> None:
-        raise NotImplementedError("WhatsAppChannel.send_list: implement Meta API call with httpx")
+        """Items as rows of an interactive list (first 10).
+
+        A label longer than a row title is cut with "…" and continues in the row description.
+        """
+        if not items:
+            await self.send_message(recipient_id, text)
+            return
+        rows = []
+        for item in items[:MAX_LIST_ROWS]:
+            label = str(item.get("label", item))
+            row = {"id": _option_id(item), "title": _clip(label, ROW_TITLE_MAX)}
+            if len(label) > ROW_TITLE_MAX:
+                row["description"] = _clip(label[ROW_TITLE_MAX - 1 :], ROW_DESCRIPTION_MAX)
+            rows.append(row)
+        if len(items) > MAX_LIST_ROWS:
+            logger.warning("WhatsApp list to %s truncated to %d rows", recipient_id, MAX_LIST_ROWS)
+        await self._send(
+            recipient_id,
+            {
+                "type": "interactive",
+                "interactive": {
+                    "type": "list",
+                    "body": {"text": _clip(text, INTERACTIVE_BODY_MAX)},
+                    "action": {"button": "Choose", "sections": [{"title": "Options", "rows": rows}]},
+                },
+            },
+        )
+
+    async def send_template(self, recipient_id: str, name: str, language: str, parameters: list[str]) -> None:
+        """Approved message template with text body parameters; the only kind allowed outside the 24h window."""
+        template: dict[str, Any] = {"name": name, "language": {"code": language}}
+        if parameters:
+            template["components"] = [
+                {"type": "body", "parameters": [{"type": "text", "text": p} for p in parameters]}
+            ]
+        await self._send(recipient_id, {"type": "template", "template": template})
 
     async def send_typing(self, recipient_id: str) -> None:
-        # Meta may not support typing; no-op or map to available feature.
-        pass
+        """Mark the inbound message read and show typing (needs inbound_message_id; otherwise a no-op)."""
+        if not self.inbound_message_id:
+            return
+        payload = {"status": "read", "message_id": self.inbound_message_id, "typing_indicator": {"type": "text"}}
+        await whatsapp_sends.send(self.phone_number_id, None, lambda: self._post(payload))
 
     async def forward_to_group(self, group_id: str, text: str) -> None:
-        # WhatsApp business: forward to internal group or equivalent; define per product.
-        raise NotImplementedError("WhatsAppChannel.forward_to_group: define behavior for WhatsApp")
+        """Notify staff through `staff_channel` (the business's Telegram group)."""
+        if self.staff_channel is None or not group_id or group_id == "0":
+            logger.warning("No staff channel for WhatsApp number %s; notification dropped", self.phone_number_id)
+            return
+        await self.staff_channel.forward_to_group(group_id, text)
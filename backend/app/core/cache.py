@@ -0,0 +1,102 @@
+"""In-process LRU cache with TTL and hit/miss/eviction counters. One instance per cached concern."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Counters exposed on /metrics."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    def as_dict(self, size: int, max_size: int) -> dict[str, float | int]:
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class LRUCache(Generic[K, V]):
+    """Bounded LRU map. Entries older than `ttl_seconds` count as misses (ttl_seconds <= 0 disables expiry).
+
+    Not thread-safe; all callers run on the event loop.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float = 0) -> None:
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.peek(key) is not None
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds
+
+    def get(self, key: K) -> V | None:
+        """Return cached value (and mark it most recently used) or None. Updates hit/miss counters."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        stored_at, value = entry
+        if self._expired(stored_at):
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def peek(self, key: K) -> V | None:
+        """Return cached value without touching LRU order or counters."""
+        entry = self._data.get(key)
+        if entry is None or self._expired(entry[0]):
+            return None
+        return entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        """Insert or replace; evicts least recently used entries beyond max_size."""
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        """Remove one entry (counted as an invalidation if present)."""
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        self.stats.invalidations += 1
+        return entry[1]
+
+    def clear(self) -> None:
+        self.stats.invalidations += len(self._data)
+        self._data.clear()
+
+    def metrics(self) -> dict[str, float | int]:
+        return self.stats.as_dict(len(self._data), self.max_size)
@@ -20,10 +20,50 @@ class Settings(BaseSettings):
     # Telegram (testing)
     TELEGRAM_BOT_TOKEN: str = ""
     TELEGRAM_WEBHOOK_URL: str = ""
+    # Bot clients pooled per token (LRU), all sharing one HTTP connection pool to api.telegram.org
+    TELEGRAM_BOT_POOL_MAX_SIZE: int = 1024
+    TELEGRAM_HTTP_POOL_SIZE: int = 64
+    TELEGRAM_HTTP_POOL_TIMEOUT_SECONDS: float = 10.0
+    # Outbound send queue (per worker): token buckets per bot and per chat (groups: 20/minute)
+    TELEGRAM_SEND_RATE_PER_BOT: float = 25.0
+    TELEGRAM_SEND_RATE_PER_CHAT: float = 1.0
+    TELEGRAM_SEND_BURST_PER_CHAT: float = 3.0
+    TELEGRAM_SEND_RATE_PER_GROUP: float = 0.33
+    # Rate-limited sends are retried after the API's retry_after, unless it asks for longer than this
+    SEND_QUEUE_MAX_RETRIES: int = 3
+    SEND_QUEUE_MAX_RETRY_AFTER_SECONDS: float = 60.0
+    SEND_QUEUE_MAX_TRACKED_CHATS: int = 10000
+
+    # Webhook ingestion queue (per worker process)
+    UPDATE_QUEUE_WORKERS: int = 16
+    UPDATE_QUEUE_MAX_PENDING: int = 1000
+    UPDATE_QUEUE_PER_TENANT_CONCURRENCY: int = 4
+    UPDATE_QUEUE_DRAIN_TIMEOUT_SECONDS: float = 20.0
+    UPDATE_DEDUP_WINDOW: int = 10000
+    UPDATE_DEDUP_TTL_SECONDS: float = 3600.0
 
     # WhatsApp (defaults; per-client credentials in DB)
     META_APP_ID: str = ""
-    META_APP_SECRET: str = ""
+    META_APP_SECRET: str = ""  # webhook POSTs must carry a valid X-Hub-Signature-256; refused while unset
+    WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS: bool = False  # local development only: accept POSTs when META_APP_SECRET is unset
+    WHATSAPP_VERIFY_TOKEN: str = ""  # hub.verify_token for Meta's subscription challenge
+    WHATSAPP_ACCESS_TOKEN: str = ""  # used when a business's whatsapp_config has no access_token
+    WHATSAPP_GRAPH_API_URL: str = "https://graph.facebook.com/v21.0"
+    # Reminders are business-initiated (outside the 24h customer service window), so WhatsApp only
+    # delivers them as approved templates; body parameters: 24h {{1}} business {{2}} date {{3}} time
+    # {{4}} party size {{5}} reference, 1h {{1}} business
+    WHATSAPP_REMINDER_TEMPLATE_24H: str = "booking_reminder_24h"
+    WHATSAPP_REMINDER_TEMPLATE_1H: str = "booking_reminder_1h"
+    WHATSAPP_TEMPLATE_LANGUAGE: str = "en"
+    # Webhook routing (phone_number_id / bot id → business): in-memory copy of channel_routes per worker,
+    # checked for other workers' changes this often
+    CHANNEL_ROUTING_REFRESH_SECONDS: float = 30.0
+    # Outbound send queue: Cloud API throughput per number, per-recipient (pair) limit; throttled sends
+    # are retried after Retry-After or WHATSAPP_RETRY_AFTER_SECONDS
+    WHATSAPP_SEND_RATE_PER_NUMBER: float = 80.0
+    WHATSAPP_SEND_RATE_PER_CHAT: float = 1.0
+    WHATSAPP_SEND_BURST_PER_CHAT: float = 5.0
+    WHATSAPP_RETRY_AFTER_SECONDS: float = 5.0
 
     # Database
     NEON_DATABASE_URL: str = ""
@@ -35,6 +75,61 @@ class Settings(BaseSettings):
     GROQ_API_KEY: str = ""
     GOOGLE_AI_API_KEY: str = ""
     GEMINI_API_KEY: str = ""  # alias for GOOGLE_AI_API_KEY
+    # Context window: history packed newest-first into a token budget; evicted turns rolled into a summary
+    CONTEXT_TOKEN_BUDGET: int = 1500
+    CONTEXT_SUMMARY_ENABLED: bool = True
+    CONTEXT_SUMMARY_MAX_CHARS: int = 1200
+    # Stream replies into an edited message on channels that support edits (Telegram)
+    AI_STREAMING: bool = True
+    AI_STREAM_EDIT_INTERVAL_SECONDS: float = 1.0
+
+    # Outbound HTTP (shared pooled httpx clients: AI providers, Meta API)
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    HTTP_TIMEOUT_SECONDS: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
+    # Tenant snapshot cache (per worker): bounded LRU, TTL bounds staleness across workers
+    TENANT_CACHE_MAX_SIZE: int = 512
+    TENANT_CACHE_TTL_SECONDS: float = 300.0
+    PROMPT_CACHE_MAX_SIZE: int = 512
+    # Customer identity cache (per worker): (channel, sender id) → customer id
+    CUSTOMER_CACHE_MAX_SIZE: int = 50000
+    CUSTOMER_CACHE_TTL_SECONDS: float = 3600.0
+
+    # Availability search: longest range /availability and find_next_available will scan
+    AVAILABILITY_MAX_HORIZON_DAYS: int = 90
+    # Availability cache (per worker); entries are checked against availability_versions in Postgres
+    AVAILABILITY_CACHE_MAX_SIZE: int = 4096
+    AVAILABILITY_CACHE_TTL_SECONDS: float = 300.0
+    # Bulk booking import/export: rows per COPY batch (keep <= 10000: customer lookups bind one parameter per row)
+    BOOKING_IMPORT_BATCH_SIZE: int = 5000
+    BOOKING_IMPORT_MAX_ERRORS: int = 100
+    BOOKING_EXPORT_BATCH_SIZE: int = 2000
+    # Booking list endpoints: keyset-paginated page size (next page cursor in the X-Next-Cursor header)
+    BOOKING_LIST_DEFAULT_LIMIT: int = 100
+    BOOKING_LIST_MAX_LIMIT: int = 500
+
+    # Conversation history: trim a chat lazily once it reaches the high-water mark; a periodic job compacts the rest
+    CONVERSATION_HISTORY_HIGH_WATER: int = 40
+    CONVERSATION_COMPACTION_INTERVAL_MINUTES: int = 30
+    CONVERSATION_COMPACTION_BATCH_SIZE: int = 500  # conversations trimmed per compaction transaction
+    # Recent-history ring buffers (per worker): LRU across conversations, TTL bounds staleness across workers
+    HISTORY_CACHE_MAX_CONVERSATIONS: int = 10000
+    HISTORY_CACHE_TTL_SECONDS: float = 900.0
+
+    # Scheduler: durable job store ("" = main Postgres DB via psycopg2, "memory", or any SQLAlchemy URL,
+    # e.g. sqlite:///scheduler.sqlite locally); one leader per deployment runs the jobs
+    SCHEDULER_JOBSTORE_URL: str = ""
+    SCHEDULER_MISFIRE_GRACE_SECONDS: int = 900
+    SCHEDULER_LEADER_ELECTION: bool = True
+    SCHEDULER_LEADER_POLL_SECONDS: float = 15.0
+    # Reminder dispatcher (scheduler job): due 24h/1h reminders sent in batches via the send queue
+    REMINDER_DISPATCH_INTERVAL_SECONDS: int = 60
+    REMINDER_DISPATCH_BATCH_SIZE: int = 500
+    REMINDER_SEND_CONCURRENCY: int = 16
 
     # Google Calendar OAuth
     GOOGLE_CLIENT_ID: str = ""
@@ -0,0 +1,42 @@
+"""Shared pooled httpx.AsyncClient instances (keep-alive, HTTP/2). Created lazily, closed in the FastAPI lifespan."""
+import importlib.util
+
+import httpx
+
+from app.core.config import settings
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+# HTTP/2 needs the optional `h2` package (httpx[http2]); fall back to HTTP/1.1 keep-alive without it.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def get_http_client(name: str = "default") -> httpx.AsyncClient:
+    """Return the long-lived client for `name` (e.g. "ai", "whatsapp"), creating it on first use.
+
+    One client per upstream keeps connection pools (and their limits) separate per API.
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=settings.HTTP2_ENABLED and _HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(
+                settings.HTTP_TIMEOUT_SECONDS,
+                connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+        _clients[name] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every pooled client. Called on application shutdown."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,32 @@
+"""Async token bucket for outbound API rate limits (e.g. Telegram: ~30 messages/second per bot)."""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """`rate` tokens per second, up to `burst` banked. acquire() waits (FIFO) until a token is available."""
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Take one token. Returns the seconds spent waiting."""
+        async with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+            self._refill()
+            self._tokens = max(0.0, self._tokens - 1)
+            return wait
@@ -1,4 +1,169 @@
-"""APScheduler instance for reminders (24h and 1h before booking)."""
+"""APScheduler instance for the reminder dispatcher and maintenance jobs.
+
+Jobs live in a durable job store (SCHEDULER_JOBSTORE_URL; default: the main Postgres database, table
+apscheduler_jobs), so job definitions survive deploys and crashes. Every worker starts the scheduler
+paused and can add/remove jobs; only the elected leader (holder of a Postgres session advisory lock)
+resumes it and runs them, so reminders fire once however many workers are up. Followers retry the lock
+every SCHEDULER_LEADER_POLL_SECONDS and take over if the leader's connection goes away.
+
+The lock is session-level: NEON_DATABASE_URL must be a direct (non-pooler) endpoint for it to hold.
+"""
+import asyncio
+import hashlib
+import logging
+from collections.abc import Awaitable, Callable
+
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.database import database_url, engine, need_ssl
+
+logger = logging.getLogger(__name__)
+
+JOBSTORE_TABLE = "apscheduler_jobs"
+LEADER_LOCK_KEY = int.from_bytes(
+    hashlib.blake2b(b"frontdesk:scheduler-leader", digest_size=8).digest(), "big", signed=True
+)
+
+scheduler = AsyncIOScheduler(
+    job_defaults={"coalesce": True, "misfire_grace_time": settings.SCHEDULER_MISFIRE_GRACE_SECONDS},
+)
+
+
+def _jobstore_url() -> str:
+    """SCHEDULER_JOBSTORE_URL, or the main database through the sync psycopg2 driver."""
+    if settings.SCHEDULER_JOBSTORE_URL:
+        return settings.SCHEDULER_JOBSTORE_URL
+    url = database_url.replace("postgresql+asyncpg://", "postgresql+psycopg2://", 1)
+    return f"{url}?sslmode=require" if need_ssl or "neon.tech" in url else url
+
+
+def configure_jobstore() -> None:
+    """Attach the default job store (call once, before the scheduler starts)."""
+    if settings.SCHEDULER_JOBSTORE_URL == "memory":
+        scheduler.add_jobstore(MemoryJobStore(), "default")
+        return
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+
+    scheduler.add_jobstore(
+        SQLAlchemyJobStore(url=_jobstore_url(), tablename=JOBSTORE_TABLE, engine_options={"pool_pre_ping": True}),
+        "default",
+    )
+
+
+class SchedulerLeader:
+    """Advisory-lock leader election for `scheduler` across worker processes."""
+
+    def __init__(self, poll_seconds: float) -> None:
+        self.poll_seconds = poll_seconds
+        self.is_leader = False
+        self.elections = 0
+        self._conn: AsyncConnection | None = None
+        self._task: asyncio.Task | None = None
+        self._on_elected: Callable[[], Awaitable[None]] | None = None
+
+    async def start(self, on_elected: Callable[[], Awaitable[None]] | None = None) -> None:
+        """Start the scheduler paused, try to lead now, then keep polling in the background.
+
+        `on_elected` runs each time this worker becomes leader (e.g. reminder reconciliation).
+        """
+        self._on_elected = on_elected
+        if not scheduler.running:
+            scheduler.start(paused=True)
+        try:
+            await self._poll()
+        except Exception:
+            logger.exception("Scheduler leader election failed; retrying in %ss", self.poll_seconds)
+        self._task = asyncio.create_task(self._run(), name="scheduler-leader")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._resign()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self._poll()
+            except Exception:
+                logger.exception("Scheduler leader election failed")
+
+    async def _poll(self) -> None:
+        if self.is_leader:
+            try:
+                await self._conn.exec_driver_sql("SELECT 1")
+                await self._conn.commit()
+            except Exception:
+                logger.warning("Lost scheduler leadership (lock connection failed)")
+                await self._resign()
+                return
+            # Jobs added by other workers went straight to the store; re-scan it.
+            scheduler.wakeup()
+            return
+
+        conn = await engine.connect()
+        try:
+            acquired = await conn.scalar(select(func.pg_try_advisory_lock(LEADER_LOCK_KEY)))
+            await conn.commit()
+        except Exception:
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return
+        self._conn = conn
+        self.is_leader = True
+        self.elections += 1
+        logger.info("This worker is now the scheduler leader")
+        scheduler.resume()
+        if self._on_elected:
+            try:
+                await self._on_elected()
+            except Exception:
+                logger.exception("Scheduler on-elected hook failed")
+
+    async def _resign(self) -> None:
+        was_leader = self.is_leader
+        self.is_leader = False
+        if was_leader and scheduler.running:
+            scheduler.pause()
+        if self._conn is not None:
+            # Invalidate rather than return to the pool: closing the DBAPI connection releases the lock.
+            try:
+                await self._conn.invalidate()
+                await self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def metrics(self) -> dict[str, bool | int]:
+        return {"leader": self.is_leader, "elections": self.elections}
+
+
+scheduler_leader = SchedulerLeader(poll_seconds=settings.SCHEDULER_LEADER_POLL_SECONDS)
+
+
+async def start_scheduler(on_elected: Callable[[], Awaitable[None]] | None = None) -> None:
+    """Configure the job store and start: with leader election, or (SCHEDULER_LEADER_ELECTION off) directly."""
+    configure_jobstore()
+    if settings.SCHEDULER_LEADER_ELECTION:
+        await scheduler_leader.start(on_elected)
+        return
+    scheduler.start()
+    if on_elected:
+        await on_elected()
+
 
-scheduler = AsyncIOScheduler()
+async def stop_scheduler() -> None:
+    await scheduler_leader.stop()
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
@@ -0,0 +1,162 @@
+"""Outbound send queue: token buckets per sender and per chat, retry when the API asks to slow down.
+
+Channels wrap every outbound API call in `await queue.send(sender, chat, call)`. A send first waits
+for a token from its chat's bucket (Telegram: ~1 message/second per chat, 20/minute per group), then
+from its sender's (one bot token / WhatsApp number: Telegram allows ~30 messages/second), so a
+broadcast burst is spread out here instead of being answered with 429s. Waiting sends are the queue:
+FIFO per bucket, and the caller gets the call's result once it has gone out. If the API still
+rejects a call with a rate-limit error, `retry_after(exc)` returns the delay it asked for; the whole
+sender is paused that long and the call retried (at most `max_retries` times). Any other error, or
+a None from `retry_after`, propagates unchanged.
+
+Channel-agnostic: each channel builds one queue with its platform's limits and error classifier.
+Limits are per worker process. Not thread-safe; all callers run on the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from app.core.cache import LRUCache
+from app.core.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class SendStats:
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    throttled: int = 0
+    max_waiting: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+class _Sender:
+    __slots__ = ("bucket", "paused_until")
+
+    def __init__(self, bucket: TokenBucket) -> None:
+        self.bucket = bucket
+        self.paused_until = 0.0
+
+
+class SendQueue:
+    """Rate-limited, retrying gateway for one channel's outbound API calls."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        sender_rate: float,
+        chat_rate: float,
+        chat_burst: float = 1.0,
+        retry_after: Callable[[BaseException], float | None],
+        max_retries: int = 3,
+        max_retry_after: float = 60.0,
+        max_senders: int = 1024,
+        max_chats: int = 10000,
+    ) -> None:
+        self.name = name
+        self.sender_rate = sender_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.retry_after = retry_after
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        self.stats = SendStats()
+        self._senders: LRUCache[Hashable, _Sender] = LRUCache(max_senders)
+        self._chats: LRUCache[Hashable, TokenBucket] = LRUCache(max_chats)
+        self._waiting = 0
+
+    def _sender(self, key: Hashable) -> _Sender:
+        sender = self._senders.get(key)
+        if sender is None:
+            sender = _Sender(TokenBucket(self.sender_rate))
+            self._senders.set(key, sender)
+        return sender
+
+    def _chat_bucket(self, key: Hashable, rate: float | None) -> TokenBucket:
+        bucket = self._chats.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate or self.chat_rate, self.chat_burst)
+            self._chats.set(key, bucket)
+        return bucket
+
+    async def _acquire_sender(self, sender: _Sender) -> float:
+        waited = 0.0
+        while True:
+            pause = sender.paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                waited += pause
+            waited += await sender.bucket.acquire()
+            # A retry_after may have paused the sender while this send waited for its token.
+            if sender.paused_until <= time.monotonic():
+                return waited
+
+    async def send(
+        self,
+        sender: Hashable,
+        chat: Hashable | None,
+        call: Callable[[], Awaitable[T]],
+        *,
+        chat_rate: float | None = None,
+    ) -> T:
+        """Run `call` once `sender` and `chat` have capacity; return its result.
+
+        `chat` None skips the per-chat limit (e.g. typing indicators). `chat_rate` overrides the
+        default per-chat rate when the chat's bucket is first created (e.g. group chats).
+        """
+        state = self._sender(sender)
+        self._waiting += 1
+        self.stats.max_waiting = max(self.stats.max_waiting, self._waiting)
+        try:
+            waited = await self._chat_bucket(chat, chat_rate).acquire() if chat is not None else 0.0
+            waited += await self._acquire_sender(state)
+        finally:
+            self._waiting -= 1
+        if waited:
+            self.stats.throttled += 1
+        self.stats.wait_seconds_total += waited
+        self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, waited)
+
+        attempt = 0
+        while True:
+            try:
+                result = await call()
+            except Exception as exc:
+                delay = self.retry_after(exc)
+                if delay is None or attempt >= self.max_retries or delay > self.max_retry_after:
+                    self.stats.failed += 1
+                    raise
+                attempt += 1
+                self.stats.retries += 1
+                logger.warning("%s send to %s rate-limited; retrying in %.1fs", self.name, chat, delay)
+                state.paused_until = max(state.paused_until, time.monotonic() + delay)
+                await self._acquire_sender(state)
+                continue
+            self.stats.sent += 1
+            return result
+
+    def metrics(self) -> dict[str, Any]:
+        started = self.stats.sent + self.stats.failed
+        return {
+            "waiting": self._waiting,
+            "high_water": self.stats.max_waiting,
+            "senders": len(self._senders),
+            "chats": len(self._chats),
+            "sent": self.stats.sent,
+            "failed": self.stats.failed,
+            "retries": self.stats.retries,
+            "throttled": self.stats.throttled,
+            "wait_ms_avg": round(1000 * self.stats.wait_seconds_total / started, 2) if started else 0.0,
+            "wait_ms_max": round(1000 * self.stats.wait_seconds_max, 2),
+        }
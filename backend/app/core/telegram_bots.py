@@ -0,0 +1,74 @@
+"""Pooled python-telegram-bot clients, one per bot token, all on one shared HTTP connection pool.
+
+Tenants bring their own bot tokens (Business.telegram_bot_token). A Bot is cheap once built but each
+new one used to open its own single-connection HTTP client; here every Bot shares one HTTPXRequest
+(TELEGRAM_HTTP_POOL_SIZE keep-alive connections to api.telegram.org). Bots are created lazily on
+first use (no get_me() round-trip) and kept in an LRU of TELEGRAM_BOT_POOL_MAX_SIZE tokens; an
+evicted Bot holds no resources of its own. The shared client is closed in the FastAPI lifespan.
+
+Webhooks addressed by bot id (/webhook/telegram/bot/{bot_id}) are registered with a per-bot
+secret_token derived from SECRET_KEY; Telegram sends it back in X-Telegram-Bot-Api-Secret-Token
+on every update, and the endpoint drops updates without it.
+"""
+import hashlib
+import hmac
+
+from telegram import Bot
+from telegram.request import HTTPXRequest
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+_bots: LRUCache[str, Bot] = LRUCache(settings.TELEGRAM_BOT_POOL_MAX_SIZE)
+_request: HTTPXRequest | None = None
+
+
+def _shared_request() -> HTTPXRequest:
+    global _request
+    if _request is None:
+        _request = HTTPXRequest(
+            connection_pool_size=settings.TELEGRAM_HTTP_POOL_SIZE,
+            pool_timeout=settings.TELEGRAM_HTTP_POOL_TIMEOUT_SECONDS,
+            read_timeout=settings.HTTP_TIMEOUT_SECONDS,
+            connect_timeout=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        )
+    return _request
+
+
+def get_bot(token: str | None = None) -> Bot:
+    """The pooled Bot for `token` (default: TELEGRAM_BOT_TOKEN)."""
+    token = token or settings.TELEGRAM_BOT_TOKEN
+    bot = _bots.get(token)
+    if bot is None:
+        request = _shared_request()
+        bot = Bot(token=token, request=request, get_updates_request=request)
+        _bots.set(token, bot)
+    return bot
+
+
+def webhook_secret(bot_id: str) -> str:
+    """secret_token for the bot's webhook (HMAC of the bot id under SECRET_KEY; [0-9a-f], as Telegram allows)."""
+    return hmac.new(settings.SECRET_KEY.encode(), f"telegram-webhook:{bot_id}".encode(), hashlib.sha256).hexdigest()
+
+
+async def register_webhook(token: str) -> str:
+    """Point the bot's webhook at /webhook/telegram/bot/{bot_id} under TELEGRAM_WEBHOOK_URL; returns the URL."""
+    if not settings.TELEGRAM_WEBHOOK_URL:
+        raise ValueError("TELEGRAM_WEBHOOK_URL is not set")
+    bot_id = token.partition(":")[0]
+    url = f"{settings.TELEGRAM_WEBHOOK_URL.rstrip('/')}/webhook/telegram/bot/{bot_id}"
+    await get_bot(token).set_webhook(url, secret_token=webhook_secret(bot_id))
+    return url
+
+
+async def close_bots() -> None:
+    """Drop every pooled Bot and close the shared HTTP client. Called on application shutdown."""
+    global _request
+    _bots.clear()
+    request, _request = _request, None
+    if request is not None:
+        await request.shutdown()
+
+
+def bot_pool_metrics() -> dict[str, float | int]:
+    return _bots.metrics()
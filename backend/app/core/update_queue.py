@@ -0,0 +1,218 @@
+"""In-memory ingestion queue for webhook updates: accept fast, process on a bounded worker pool.
+
+Webhook routes `submit()` and return immediately. Updates that share a key (e.g. one chat) run
+strictly in order, one at a time; different keys run in parallel, with at most
+`per_tenant_concurrency` keys of one tenant in flight so a busy business cannot starve the rest.
+A dedup window drops redelivered updates before they reach the handler. `max_pending` bounds
+memory: when full, submit() returns False and the route answers 503 so the sender retries later.
+Updates still pending at shutdown get `drain_timeout` seconds.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueuedUpdate:
+    tenant: Hashable
+    payload: Any
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class QueueStats:
+    submitted: int = 0
+    rejected: int = 0
+    duplicates: int = 0
+    processed: int = 0
+    failed: int = 0
+    max_pending: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+class UpdateQueue:
+    """Bounded worker pool draining per-key FIFOs with a per-tenant concurrency cap."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any, Any], Awaitable[None]],
+        *,
+        workers: int,
+        max_pending: int,
+        per_tenant_concurrency: int,
+        dedup_window: int = 0,
+        dedup_ttl_seconds: float = 0,
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.per_tenant_concurrency = max(1, per_tenant_concurrency)
+        self.stats = QueueStats()
+        self._recent: LRUCache[Hashable, bool] | None = (
+            LRUCache(dedup_window, dedup_ttl_seconds) if dedup_window > 0 else None
+        )
+        # Keys that have work: present in exactly one of _ready, a tenant backlog, or a running worker.
+        self._keys: dict[Hashable, deque[QueuedUpdate]] = {}
+        self._key_tenant: dict[Hashable, Hashable] = {}
+        self._ready: asyncio.Queue[Hashable] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._active: dict[Hashable, int] = {}
+        self._backlog: dict[Hashable, deque[Hashable]] = {}
+        self._pending = 0
+        self._in_flight = 0
+        self._idle: asyncio.Event | None = None
+        self._accepting = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def submit(
+        self,
+        tenant: Hashable,
+        payload: Any,
+        *,
+        key: Hashable | None = None,
+        dedup_id: Hashable | None = None,
+    ) -> bool:
+        """Enqueue one update. Returns False (reject) when stopped or at max_pending.
+
+        `key` orders updates (same key → sequential, in submit order; None → independent).
+        `dedup_id` seen within the dedup window is acknowledged (True) without being queued.
+        """
+        dedup = dedup_id is not None and self._recent is not None
+        if dedup and self._recent.peek(dedup_id) is not None:
+            self.stats.duplicates += 1
+            return True
+        if not self._accepting or self._ready is None or self._pending >= self.max_pending:
+            self.stats.rejected += 1
+            return False
+        if dedup:
+            # Recorded only once accepted, so a 503'd update is not dropped as a duplicate on retry.
+            self._recent.set(dedup_id, True)
+        if key is None:
+            key = object()
+        self._pending += 1
+        self.stats.submitted += 1
+        self.stats.max_pending = max(self.stats.max_pending, self._pending)
+        self._idle.clear()
+        item = QueuedUpdate(tenant, payload)
+        queued = self._keys.get(key)
+        if queued is not None:
+            queued.append(item)
+        else:
+            self._keys[key] = deque([item])
+            self._key_tenant[key] = tenant
+            self._ready.put_nowait(key)
+        return True
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._ready = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._accepting = True
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-worker-{i}") for i in range(self.workers)
+        ]
+
+    async def stop(self, drain_timeout: float) -> None:
+        """Stop accepting, give pending updates `drain_timeout` seconds, then cancel workers."""
+        self._accepting = False
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%s queue: shutdown with %d updates still pending", self.name, self._pending)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        assert self._ready is not None
+        while True:
+            key = await self._ready.get()
+            tenant = self._key_tenant[key]
+            if self._active.get(tenant, 0) >= self.per_tenant_concurrency:
+                # Tenant at its cap: park the key until one of its keys finishes (no worker is held).
+                self._backlog.setdefault(tenant, deque()).append(key)
+                continue
+            await self._run(key, tenant)
+
+    async def _run(self, key: Hashable, tenant: Hashable) -> None:
+        item = self._keys[key].popleft()
+        self._active[tenant] = self._active.get(tenant, 0) + 1
+        self._in_flight += 1
+        wait = time.monotonic() - item.enqueued_at
+        self.stats.wait_seconds_total += wait
+        self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, wait)
+        try:
+            await self.handler(tenant, item.payload)
+            self.stats.processed += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.stats.failed += 1
+            logger.exception("%s queue: update for %s failed", self.name, tenant)
+        finally:
+            self._in_flight -= 1
+            self._pending -= 1
+            self._active[tenant] -= 1
+            if not self._active[tenant]:
+                del self._active[tenant]
+            if self._keys[key]:
+                # More updates for this key: back of the line, so other keys get a turn.
+                self._ready.put_nowait(key)
+            else:
+                del self._keys[key]
+                del self._key_tenant[key]
+            backlog = self._backlog.get(tenant)
+            if backlog:
+                self._ready.put_nowait(backlog.popleft())
+                if not backlog:
+                    del self._backlog[tenant]
+            if self._pending == 0:
+                self._idle.set()
+
+    def key_depths(self, top: int = 20) -> list[dict[str, Any]]:
+        """Deepest per-key queues (queued, not counting the one in flight)."""
+        deepest = heapq.nlargest(top, self._keys.items(), key=lambda kv: len(kv[1]))
+        return [{"key": str(k), "depth": len(q)} for k, q in deepest if q]
+
+    def metrics(self) -> dict[str, Any]:
+        started = self.stats.processed + self.stats.failed
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "in_flight": self._in_flight,
+            "max_pending": self.max_pending,
+            "high_water": self.stats.max_pending,
+            "keys_queued": len(self._keys),
+            "tenants_active": len(self._active),
+            "tenants_backlogged": len(self._backlog),
+            "submitted": self.stats.submitted,
+            "rejected": self.stats.rejected,
+            "dedup_hits": self.stats.duplicates,
+            "processed": self.stats.processed,
+            "failed": self.stats.failed,
+            "wait_ms_avg": round(1000 * self.stats.wait_seconds_total / started, 2) if started else 0.0,
+            "wait_ms_max": round(1000 * self.stats.wait_seconds_max, 2),
+            "key_depths": self.key_depths(),
+        }
@@ -1,23 +1,64 @@
 """FastAPI app entry point. Webhook registration is done externally (see CLAUDE Deployment)."""
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import webhooks, appointments, businesses, onboarding, faqs
+from app.bot.ingest import telegram_updates, whatsapp_updates
+from app.channels.telegram import telegram_sends
+from app.channels.whatsapp import whatsapp_sends
+from app.core.config import settings
 from app.core.database import init_db
-from app.core.scheduler import scheduler
+from app.core.http import close_http_clients
+from app.core.scheduler import scheduler, scheduler_leader, start_scheduler, stop_scheduler
+from app.core.telegram_bots import bot_pool_metrics, close_bots
+from app.services.availability_cache import availability_cache
+from app.services.customer_service import customer_cache_metrics
+from app.services.channel_routing import channel_routes
+from app.services.conversation_service import run_history_compaction
+from app.services.history_store import history_store
+from app.services.reminder_service import on_scheduler_elected, reminder_metrics, schedule_reminder_dispatch
+from app.services.tenant_cache import tenant_cache
+from app.utils.context_builder import context_metrics
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.prompt_builder import prompt_cache_metrics
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup: init DB, start scheduler. Shutdown: stop scheduler."""
+    """Startup: init DB, start scheduler and update workers. Shutdown: drain updates, stop scheduler, close HTTP clients."""
     await init_db()
-    if not scheduler.running:
-        scheduler.start()
+    if not settings.META_APP_SECRET:
+        if settings.WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS:
+            logger.warning("META_APP_SECRET is not set: accepting unsigned WhatsApp webhooks (development only)")
+        else:
+            logger.warning("META_APP_SECRET is not set: WhatsApp webhook POSTs will be refused")
+    scheduler.add_job(
+        run_history_compaction,
+        "interval",
+        minutes=settings.CONVERSATION_COMPACTION_INTERVAL_MINUTES,
+        id="conversation_history_compaction",
+        replace_existing=True,
+    )
+    schedule_reminder_dispatch()
+    await start_scheduler(on_elected=on_scheduler_elected)
+    await channel_routes.start()
+    await telegram_updates.start()
+    await whatsapp_updates.start()
     yield
-    if scheduler.running:
-        scheduler.shutdown(wait=False)
+    await asyncio.gather(
+        telegram_updates.stop(drain_timeout=settings.UPDATE_QUEUE_DRAIN_TIMEOUT_SECONDS),
+        whatsapp_updates.stop(drain_timeout=settings.UPDATE_QUEUE_DRAIN_TIMEOUT_SECONDS),
+    )
+    await stop_scheduler()
+    await channel_routes.stop()
+    await close_http_clients()
+    await close_bots()
 
 
 app = FastAPI(title="Front Desk Bot API", lifespan=lifespan)
@@ -29,6 +70,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(webhooks.router)
@@ -42,3 +84,24 @@ app.include_router(faqs.router)
 async def health() -> dict[str, str]:
     """Liveness/readiness."""
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+async def metrics() -> dict[str, dict]:
+    """In-process counters for this worker (caches, queues)."""
+    return {
+        "tenant_cache": tenant_cache.metrics(),
+        "prompt_cache": prompt_cache_metrics(),
+        "customer_cache": customer_cache_metrics(),
+        "history_cache": history_store.metrics(),
+        "context": context_metrics(),
+        "availability_cache": availability_cache.metrics(),
+        "telegram_updates": telegram_updates.metrics(),
+        "telegram_bots": bot_pool_metrics(),
+        "telegram_sends": telegram_sends.metrics(),
+        "whatsapp_updates": whatsapp_updates.metrics(),
+        "whatsapp_sends": whatsapp_sends.metrics(),
+        "channel_routing": channel_routes.metrics(),
+        "scheduler": scheduler_leader.metrics(),
+        "reminders": reminder_metrics(),
+    }
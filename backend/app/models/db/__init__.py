@@ -1,7 +1,9 @@
 """DB models. All primary keys are UUID."""
+from app.models.db.availability_version import AvailabilityVersion
 from app.models.db.base import Base
 from app.models.db.booking import Booking
 from app.models.db.business import Business
+from app.models.db.channel_route import ChannelRoute
 from app.models.db.conversation import ConversationMessage
 from app.models.db.customer import Customer
 from app.models.db.faq import FAQ
@@ -10,9 +12,11 @@ from app.models.db.staff import Staff
 from app.models.db.support_session import SupportSession
 
 __all__ = [
+    "AvailabilityVersion",
     "Base",
     "Booking",
     "Business",
+    "ChannelRoute",
     "ConversationMessage",
     "Customer",
     "FAQ",
@@ -0,0 +1,16 @@
+"""Availability version counters: one row per (business, day), bumped by every booking write touching that day."""
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Date, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.db.base import Base
+
+
+class AvailabilityVersion(Base):
+    __tablename__ = "availability_versions"
+
+    business_id: Mapped[UUID] = mapped_column(ForeignKey("businesses.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -1,11 +1,11 @@
 """Booking model."""
 import enum
-from datetime import date, time
+from datetime import date, datetime, time
 from decimal import Decimal
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import Date, Enum, ForeignKey, Integer, Numeric, String, Text, Time
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, Integer, Numeric, Sequence, String, Text, Time, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.db.base import Base, TimestampMixin, UUIDMixin
@@ -17,6 +17,11 @@ if TYPE_CHECKING:
     from app.models.db.staff import Staff
 
 
+# Source of booking reference numbers (scrambled into the reference code by booking_service).
+# maxvalue = 36**6 - 1: every value maps to a distinct 6-character code; the sequence never cycles.
+booking_reference_seq = Sequence("booking_reference_seq", start=1, maxvalue=36**6 - 1, metadata=Base.metadata)
+
+
 class BookingStatusEnum(str, enum.Enum):
     pending = "pending"
     confirmed = "confirmed"
@@ -27,6 +32,37 @@ class BookingStatusEnum(str, enum.Enum):
 
 class Booking(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # get_available_slots / create_booking: confirmed bookings of a business on a day
+        Index(
+            "ix_bookings_business_date_confirmed",
+            "business_id",
+            "booking_date",
+            postgresql_where=text("status = 'confirmed'"),
+        ),
+        # get_bookings_for_customer: confirmed bookings of a customer, ordered by date/time
+        Index(
+            "ix_bookings_customer_business_date_confirmed",
+            "customer_id",
+            "business_id",
+            "booking_date",
+            "booking_time",
+            postgresql_where=text("status = 'confirmed'"),
+        ),
+        # reminder_service.dispatch_due_reminders: confirmed bookings with a reminder still to send
+        Index(
+            "ix_bookings_reminders_due",
+            "booking_date",
+            "booking_time",
+            postgresql_where=text(
+                "status = 'confirmed' AND (reminder_24h_sent_at IS NULL OR reminder_1h_sent_at IS NULL)"
+            ),
+        ),
+        # list_business_bookings: keyset pages newest first on (created_at, id)
+        Index("ix_bookings_business_created", "business_id", "created_at", "id"),
+        # list_bookings: keyset pages by (booking_date, booking_time, id), any status
+        Index("ix_bookings_business_date_time", "business_id", "booking_date", "booking_time", "id"),
+    )
 
     business_id: Mapped[UUID] = mapped_column(ForeignKey("businesses.id"), nullable=False)
     customer_id: Mapped[UUID] = mapped_column(ForeignKey("customers.id"), nullable=False)
@@ -57,6 +93,9 @@ class Booking(Base, UUIDMixin, TimestampMixin):
     special_requests: Mapped[str | None] = mapped_column(String(1024), nullable=True)
     reminder_24h_job_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
     reminder_1h_job_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    # Set by the reminder dispatcher once a reminder is sent (or no longer applies); reset on reschedule
+    reminder_24h_sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    reminder_1h_sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     business: Mapped["Business"] = relationship("Business", back_populates="bookings")
     customer: Mapped["Customer"] = relationship("Customer", back_populates="bookings")
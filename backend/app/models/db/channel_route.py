@@ -0,0 +1,24 @@
+"""Webhook routing table: (channel, address) → business, one row per WhatsApp number / Telegram bot."""
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.db.base import Base
+
+
+class ChannelRoute(Base):
+    """Materialised from Business (whatsapp_config.phone_number_id, the bot id of telegram_bot_token).
+
+    Rewritten for a business whenever it is created or updated; only active businesses have rows.
+    """
+
+    __tablename__ = "channel_routes"
+
+    channel: Mapped[str] = mapped_column(String(16), primary_key=True)
+    address: Mapped[str] = mapped_column(String(128), primary_key=True)
+    business_id: Mapped[UUID] = mapped_column(
+        ForeignKey("businesses.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -3,7 +3,7 @@ import enum
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import Enum, ForeignKey, Text
+from sqlalchemy import Enum, ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.db.base import Base, TimestampMixin, UUIDMixin
@@ -19,6 +19,10 @@ class MessageRoleEnum(str, enum.Enum):
 
 class ConversationMessage(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "conversation_history"
+    __table_args__ = (
+        # get_recent_messages / trim_to_limit: newest N for one customer at one business
+        Index("ix_conversation_history_customer_business_created", "customer_id", "business_id", "created_at"),
+    )
 
     customer_id: Mapped[UUID] = mapped_column(ForeignKey("customers.id"), nullable=False)
     business_id: Mapped[UUID] = mapped_column(ForeignKey("businesses.id"), nullable=False)
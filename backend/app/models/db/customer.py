@@ -1,8 +1,8 @@
 """Customer model."""
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import String
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.db.base import Base, TimestampMixin, UUIDMixin
@@ -20,7 +20,10 @@ class Customer(Base, UUIDMixin, TimestampMixin):
     whatsapp_number: Mapped[str | None] = mapped_column(String(32), unique=True, nullable=True)
     full_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     phone_number: Mapped[str | None] = mapped_column(String(32), nullable=True)
-    conversation_state: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    # Versioned JSONB document; read and written through app.services.conversation_state, which bumps
+    # state_version on every save (optimistic concurrency: a save against a stale version is refused).
+    conversation_state: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict)
+    state_version: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
 
     bookings: Mapped[list["Booking"]] = relationship("Booking", back_populates="customer")
     conversation_history: Mapped[list["ConversationMessage"]] = relationship(
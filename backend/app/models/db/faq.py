@@ -2,7 +2,7 @@
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,10 @@ if TYPE_CHECKING:
 
 class FAQ(Base, UUIDMixin):
     __tablename__ = "faqs"
+    __table_args__ = (
+        # get_faqs_for_business / list_faqs: one business, ordered by question
+        Index("ix_faqs_business_question", "business_id", "question"),
+    )
 
     business_id: Mapped[UUID] = mapped_column(ForeignKey("businesses.id"), nullable=False)
     question: Mapped[str] = mapped_column(String(512), nullable=False)
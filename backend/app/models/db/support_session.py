@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.db.base import Base, UUIDMixin
@@ -15,6 +15,15 @@ if TYPE_CHECKING:
 
 class SupportSession(Base, UUIDMixin):
     __tablename__ = "support_sessions"
+    __table_args__ = (
+        # get_active_support_session: checked on every incoming message
+        Index(
+            "ix_support_sessions_customer_business_active",
+            "customer_id",
+            "business_id",
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     customer_id: Mapped[UUID] = mapped_column(ForeignKey("customers.id"), nullable=False)
     business_id: Mapped[UUID] = mapped_column(ForeignKey("businesses.id"), nullable=False)
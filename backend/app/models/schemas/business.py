@@ -1,4 +1,5 @@
 """Business API schemas."""
+from typing import Any, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -14,6 +15,8 @@ class BusinessCreate(BaseModel):
     timezone: str = "Africa/Accra"
     location: str | None = None
     phone: str | None = None
+    active_channel: Literal["telegram", "whatsapp"] = "telegram"
+    whatsapp_config: dict[str, Any] | None = None  # {"phone_number_id": ..., "access_token": ...}
 
 
 class BusinessUpdate(BaseModel):
@@ -26,6 +29,8 @@ class BusinessUpdate(BaseModel):
     timezone: str | None = None
     location: str | None = None
     phone: str | None = None
+    active_channel: Literal["telegram", "whatsapp"] | None = None
+    whatsapp_config: dict[str, Any] | None = None
 
 
 class BusinessResponse(BaseModel):
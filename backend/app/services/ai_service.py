@@ -5,13 +5,14 @@ High-level skeleton only. All concrete behavior must follow CLAUDE.md.
 from __future__ import annotations
 
 import enum
+import json
 import re
+from collections.abc import AsyncIterator, Callable
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from app.core.config import settings
+from app.core.http import get_http_client
 
 
 class AIProviderName(str, enum.Enum):
@@ -39,6 +40,8 @@ class AIResult:
     reply_text: str
     action: Optional[AIAction] = None
     data: Dict[str, Any] | None = None
+    # True when reply_text was already delivered to the customer while streaming.
+    streamed: bool = False
 
 
 class BaseProvider:
@@ -60,6 +63,18 @@ class BaseProvider:
         msg = f"{self.__class__.__name__}.generate() not implemented"
         raise NotImplementedError(msg)
 
+    async def stream(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+    ) -> AsyncIterator[str]:
+        """Yield raw assistant reply text as it is produced.
+
+        Default: a single chunk from generate(); providers with a streaming API override this.
+        """
+
+        yield await self.generate(system_prompt=system_prompt, messages=messages)
+
 
 class GroqProvider(BaseProvider):
     """Groq implementation using OpenAI-compatible chat completions API.
@@ -68,37 +83,40 @@ class GroqProvider(BaseProvider):
     Docs: console.groq.com/docs
     """
 
+    url = "https://api.groq.com/openai/v1/chat/completions"
+
     def __init__(self, api_key: str, model: str) -> None:
         self.api_key = api_key
         self.model = model
-
-    async def generate(
-        self,
-        system_prompt: str,
-        messages: List[Dict[str, str]],
-    ) -> str:
-        """Call Groq chat completions and return assistant text."""
-
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
 
+    def _payload(self, system_prompt: str, messages: List[Dict[str, str]], stream: bool = False) -> dict[str, Any]:
         groq_messages: list[dict[str, str]] = [
             {"role": "system", "content": system_prompt},
             *messages,
         ]
-
         payload: dict[str, Any] = {
             "model": self.model,
             "messages": groq_messages,
         }
+        if stream:
+            payload["stream"] = True
+        return payload
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
+    async def generate(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+    ) -> str:
+        """Call Groq chat completions and return assistant text (pooled keep-alive client)."""
+
+        payload = self._payload(system_prompt, messages)
+        response = await get_http_client("ai").post(self.url, headers=self._headers, json=payload)
+        response.raise_for_status()
+        data = response.json()
 
         # OpenAI-compatible: choices[0].message.content
         try:
@@ -106,6 +124,30 @@ class GroqProvider(BaseProvider):
         except (KeyError, IndexError) as exc:
             raise RuntimeError("Unexpected Groq response format") from exc
 
+    async def stream(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, str]],
+    ) -> AsyncIterator[str]:
+        """Stream Groq chat completions (server-sent events) and yield content deltas."""
+
+        payload = self._payload(system_prompt, messages, stream=True)
+        async with get_http_client("ai").stream("POST", self.url, headers=self._headers, json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                # SSE: "data: {json}" per chunk, terminated by "data: [DONE]"
+                if not line.startswith("data:"):
+                    continue
+                chunk = line[5:].strip()
+                if chunk == "[DONE]":
+                    break
+                try:
+                    delta = json.loads(chunk)["choices"][0]["delta"].get("content")
+                except (ValueError, KeyError, IndexError, AttributeError):
+                    continue
+                if delta:
+                    yield delta
+
 
 class OpenAIProvider(BaseProvider):
     """OpenAI implementation placeholder."""
@@ -123,8 +165,12 @@ class GeminiProvider(BaseProvider):
         self.model = model
 
 
+# Provider registry: one long-lived instance per (provider, model, key); they share the pooled "ai" client.
+_providers: dict[tuple[str, str, str], BaseProvider] = {}
+
+
 def _get_provider() -> BaseProvider:
-    """Instantiate provider based on settings.AI_PROVIDER.
+    """Return the provider for settings.AI_PROVIDER, instantiating it once per process.
 
     Does not assume any specific model name; uses settings.AI_MODEL as-is.
     """
@@ -135,20 +181,25 @@ def _get_provider() -> BaseProvider:
     if provider_name == AIProviderName.GROQ.value:
         if not settings.GROQ_API_KEY:
             raise RuntimeError("GROQ_API_KEY is not configured")
-        return GroqProvider(api_key=settings.GROQ_API_KEY, model=model)
-
-    if provider_name == AIProviderName.OPENAI.value:
+        provider_cls, api_key = GroqProvider, settings.GROQ_API_KEY
+    elif provider_name == AIProviderName.OPENAI.value:
         if not settings.OPENAI_API_KEY:
             raise RuntimeError("OPENAI_API_KEY is not configured")
-        return OpenAIProvider(api_key=settings.OPENAI_API_KEY, model=model)
-
-    if provider_name == AIProviderName.GEMINI.value:
+        provider_cls, api_key = OpenAIProvider, settings.OPENAI_API_KEY
+    elif provider_name == AIProviderName.GEMINI.value:
         api_key = settings.gemini_api_key
         if not api_key:
             raise RuntimeError("GOOGLE_AI_API_KEY / GEMINI_API_KEY is not configured")
-        return GeminiProvider(api_key=api_key, model=model)
+        provider_cls = GeminiProvider
+    else:
+        raise RuntimeError(f"Unsupported AI_PROVIDER: {provider_name}")
 
-    raise RuntimeError(f"Unsupported AI_PROVIDER: {provider_name}")
+    key = (provider_name, model, api_key)
+    provider = _providers.get(key)
+    if provider is None:
+        provider = provider_cls(api_key=api_key, model=model)
+        _providers[key] = provider
+    return provider
 
 
 # Pattern: "ACTION: NAME" or "ACTION: NAME { ... }" or "ACTION: NAME key=val key2=val2"
@@ -257,3 +308,66 @@ async def process_message(
 
     return AIResult(reply_text=reply_text, action=action, data=data)
 
+
+class ActionStreamFilter:
+    """Incremental ACTION-tag filter for streamed replies.
+
+    feed() returns the text that is safe to show so far: everything before the first "ACTION:" tag,
+    minus a trailing fragment that could still turn into one (e.g. "... ACTI"). The full raw text is
+    kept for _parse_action_and_data once the stream ends.
+    """
+
+    _TAG = "ACTION:"
+
+    def __init__(self) -> None:
+        self._chunks: list[str] = []
+        self._visible = ""
+        self._tag_seen = False
+
+    @property
+    def raw_text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> str:
+        self._chunks.append(chunk)
+        if self._tag_seen:
+            return self._visible
+        raw = self.raw_text
+        upper = raw.upper()
+        idx = upper.find(self._TAG)
+        if idx >= 0:
+            self._tag_seen = True
+            self._visible = raw[:idx].rstrip(" \t.\n")
+            return self._visible
+        held = 0
+        for k in range(min(len(self._TAG) - 1, len(upper)), 0, -1):
+            if upper.endswith(self._TAG[:k]):
+                held = k
+                break
+        self._visible = (raw[:-held] if held else raw).rstrip()
+        return self._visible
+
+
+async def stream_message(
+    system_prompt: str,
+    messages: List[Dict[str, str]],
+    on_text: Callable[[str], None],
+) -> AIResult:
+    """Streaming variant of process_message.
+
+    Calls `on_text(visible_text_so_far)` as tokens arrive (ACTION tags held back), then parses the
+    complete reply exactly like process_message.
+    """
+
+    provider = _get_provider()
+    action_filter = ActionStreamFilter()
+    last_visible = ""
+    async for chunk in provider.stream(system_prompt=system_prompt, messages=messages):
+        visible = action_filter.feed(chunk)
+        if visible and visible != last_visible:
+            last_visible = visible
+            on_text(visible)
+
+    action, data, reply_text = _parse_action_and_data(action_filter.raw_text)
+
+    return AIResult(reply_text=reply_text, action=action, data=data)
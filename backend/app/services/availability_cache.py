@@ -0,0 +1,100 @@
+"""Availability cache: free slot times per (business, service, date, party size, nights).
+
+Each entry remembers the availability_versions of the days it was computed from. Booking writes
+(create/cancel/reschedule in booking_service) bump those rows in the same transaction, and every lookup
+reads the current versions first (one primary-key query), so an entry is served only while no worker
+has committed a booking on its days. Entries also expire after AVAILABILITY_CACHE_TTL_SECONDS, which
+bounds staleness from changes that do not bump versions (working hours, room counts).
+"""
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+from datetime import date, time
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.db import AvailabilityVersion
+
+
+@dataclass(frozen=True, slots=True)
+class CachedAvailability:
+    versions: tuple[int, ...]
+    free: tuple[time, ...]
+
+
+async def get_versions(session: AsyncSession, business_id: UUID, days: list[date]) -> tuple[int, ...]:
+    """Current version of each day (0 if never bumped), in the order of `days`."""
+    rows = await session.execute(
+        select(AvailabilityVersion.day, AvailabilityVersion.version).where(
+            AvailabilityVersion.business_id == business_id,
+            AvailabilityVersion.day.in_(days),
+        )
+    )
+    found = dict(rows.all())
+    return tuple(found.get(d, 0) for d in days)
+
+
+async def bump_versions(session: AsyncSession, business_id: UUID, days: Iterable[date]) -> None:
+    """Invalidate cached availability for these days on every worker (takes effect when the session commits)."""
+    days = sorted(set(days))
+    if not days:
+        return
+    stmt = insert(AvailabilityVersion).values(
+        [{"business_id": business_id, "day": d, "version": 1} for d in days]
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[AvailabilityVersion.business_id, AvailabilityVersion.day],
+            set_={"version": AvailabilityVersion.version + 1},
+        )
+    )
+
+
+class AvailabilityCache:
+    """LRU of CachedAvailability; an entry whose versions differ from the current ones counts as stale."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self._cache: LRUCache[Hashable, CachedAvailability] = LRUCache(max_size, ttl_seconds)
+        self.stale = 0
+
+    def get(self, key: Hashable, versions: tuple[int, ...]) -> tuple[time, ...] | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry.versions != versions:
+            self.stale += 1
+            self._cache.pop(key)
+            return None
+        return entry.free
+
+    def set(self, key: Hashable, versions: tuple[int, ...], free: Iterable[time]) -> None:
+        self._cache.set(key, CachedAvailability(versions, tuple(free)))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def metrics(self) -> dict[str, float | int]:
+        """LRU counters with stale entries counted as misses."""
+        metrics = self._cache.metrics()
+        hits = metrics["hits"] - self.stale
+        misses = metrics["misses"] + self.stale
+        lookups = hits + misses
+        return {
+            **metrics,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "stale": self.stale,
+        }
+
+
+availability_cache = AvailabilityCache(
+    max_size=settings.AVAILABILITY_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AVAILABILITY_CACHE_TTL_SECONDS,
+)
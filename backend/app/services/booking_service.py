@@ -1,21 +1,106 @@
 """Booking business logic. Handlers and routes call this; no DB in handlers."""
-import random
-import string
-from datetime import date, time as time_type
+import hashlib
+from collections.abc import Iterator
+from datetime import date, datetime, time as time_type, timedelta
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.db import Booking, Business, Service
+from app.core.config import settings
+from app.models.db import Booking, Business, Customer, Service
 from app.models.db.business import BusinessTypeEnum
-from app.models.db.booking import BookingStatusEnum
-from app.utils.datetime_utils import (
-    generate_slots_for_day,
-    slot_taken,
-    weekday_key,
-)
+from app.models.db.booking import BookingStatusEnum, booking_reference_seq
+from app.services.availability_cache import availability_cache, bump_versions, get_versions
+from app.services.business_service import get_business_snapshot
+from app.utils.datetime_utils import business_today, generate_slots_for_day, weekday_key
+from app.utils.inventory import NightInventory, ServiceAvailability, SlotInventory, service_capacity
+from app.utils.pagination import after, decode_cursor, split_page
+
+
+def slot_label(t: time_type) -> str:
+    """Button/label text for a slot time, e.g. "7:30 PM"."""
+    return t.strftime("%I:%M %p").lstrip("0")
+
+
+def _slots_for_day(business: Any, day: date) -> list[time_type]:
+    """All slot start times for `day` from the business working hours (ORM Business or snapshot)."""
+    key = weekday_key(day)
+    hours = business.working_hours.get(key) if isinstance(business.working_hours, dict) else None
+    if not hours or len(hours) < 2:
+        return []
+    return generate_slots_for_day(day, hours[0], hours[1], business.slot_duration_minutes or 30)
+
+
+def _is_nightly(business: Any) -> bool:
+    """Hotels and hostels sell nights (rooms per night); restaurants sell time slots."""
+    return business.type in (BusinessTypeEnum.hotel, BusinessTypeEnum.hostel)
+
+
+async def _load_availability(
+    session: AsyncSession,
+    business: Any,
+    service: Any | None,
+    first_day: date,
+    last_day: date,
+    default_duration: int,
+    nights: int = 1,
+    exclude_booking_id: UUID | None = None,
+) -> ServiceAvailability:
+    """Confirmed bookings of `service` (all services if None) touching [first_day, last_day], one query.
+
+    Nightly businesses load stays overlapping the nights first_day … last_day + nights - 1; stays without
+    check-in/out dates fall back to booking_date for num_nights (default 1). `exclude_booking_id` leaves
+    one booking out (the one being rescheduled).
+    """
+    capacity = service_capacity(service)
+    filters = [Booking.business_id == business.id, Booking.status == BookingStatusEnum.confirmed]
+    if service is not None:
+        filters.append(Booking.service_id == service.id)
+    if exclude_booking_id is not None:
+        filters.append(Booking.id != exclude_booking_id)
+    guests = func.coalesce(Booking.party_size, Booking.num_guests)
+
+    if _is_nightly(business):
+        check_in = func.coalesce(Booking.check_in_date, Booking.booking_date)
+        check_out = func.coalesce(
+            Booking.check_out_date, Booking.booking_date + func.coalesce(Booking.num_nights, 1)
+        )
+        end = last_day + timedelta(days=max(1, nights))
+        rows = await session.execute(
+            select(check_in, check_out, guests).where(*filters, check_in < end, check_out > first_day)
+        )
+        nightly = NightInventory(capacity, first_day, (end - first_day).days, rows.all())
+        return ServiceAvailability(capacity, nightly=nightly)
+
+    rows = await session.execute(
+        select(Booking.booking_date, Booking.booking_time, Service.duration_minutes, guests)
+        .outerjoin(Service, Service.id == Booking.service_id)
+        .where(*filters, Booking.booking_date >= first_day, Booking.booking_date <= last_day)
+    )
+    by_day: dict[date, list[tuple[time_type, int, int | None]]] = {}
+    for booking_date, booking_time, service_duration, party in rows:
+        by_day.setdefault(booking_date, []).append((booking_time, service_duration or default_duration, party))
+    return ServiceAvailability(
+        capacity,
+        days={day: SlotInventory(capacity, bookings) for day, bookings in by_day.items()},
+    )
+
+
+def _free_slots_by_day(
+    business: Any,
+    availability: ServiceAvailability,
+    from_date: date,
+    days: int,
+    duration: int,
+    party_size: int | None,
+    nights: int,
+) -> Iterator[tuple[date, list[time_type]]]:
+    for offset in range(days):
+        day = from_date + timedelta(days=offset)
+        yield day, availability.free_slots(day, _slots_for_day(business, day), duration, party_size, nights)
 
 
 async def get_available_slots(
@@ -23,64 +108,115 @@ async def get_available_slots(
     business_id: UUID,
     service_id: UUID,
     booking_date: str,
+    party_size: int | None = None,
+    nights: int = 1,
 ) -> list[dict]:
-    """Return list of available slot dicts with 'label' and 'time' for the day."""
+    """Return list of available slot dicts with 'label' and 'time' for the day (for this party size / stay)."""
     try:
         day = date.fromisoformat(booking_date)
     except ValueError:
         return []
 
-    result = await session.execute(
-        select(Business)
-        .where(Business.id == business_id)
-        .options(selectinload(Business.services))
-        .limit(1)
-    )
-    business = result.scalars().first()
+    business = await get_business_snapshot(session, business_id)
     if not business:
         return []
-
-    service_result = await session.execute(
-        select(Service).where(Service.id == service_id, Service.business_id == business_id).limit(1)
-    )
-    service = service_result.scalars().first()
+    service = next((s for s in business.services if s.id == service_id), None)
     duration = service.duration_minutes if service else 30
 
-    key = weekday_key(day)
-    hours = business.working_hours.get(key) if isinstance(business.working_hours, dict) else None
-    if not hours or len(hours) < 2:
-        return []
-    start_str, end_str = hours[0], hours[1]
-    slot_duration = business.slot_duration_minutes or 30
-
-    all_slots = generate_slots_for_day(day, start_str, end_str, slot_duration)
+    all_slots = _slots_for_day(business, day)
     if not all_slots:
         return []
 
-    bookings_result = await session.execute(
-        select(Booking)
-        .where(
-            Booking.business_id == business_id,
-            Booking.booking_date == day,
-            Booking.status == BookingStatusEnum.confirmed,
-        )
-        .options(selectinload(Booking.service))
+    # Cached per day; valid while no booking on the days it depends on has been committed since.
+    depends_on = [day + timedelta(days=i) for i in range(max(1, nights))] if _is_nightly(business) else [day]
+    versions = await get_versions(session, business_id, depends_on)
+    key = (business_id, service_id, day, party_size, nights)
+    free = availability_cache.get(key, versions)
+    if free is None:
+        availability = await _load_availability(session, business, service, day, day, duration, nights)
+        free = availability.free_slots(day, all_slots, duration, party_size, nights)
+        availability_cache.set(key, versions, free)
+    return [{"label": slot_label(t), "time": t.isoformat(), "payload": {"time": t.isoformat()}} for t in free]
+
+
+def booked_days(b: Booking) -> list[date]:
+    """Days whose availability a booking affects: its date, or every night of a hotel stay."""
+    first = b.check_in_date or b.booking_date
+    last = b.check_out_date or first + timedelta(days=b.num_nights or 1)
+    return [first + timedelta(days=i) for i in range(max(1, (last - first).days))]
+
+
+async def get_availability_range(
+    session: AsyncSession,
+    business: Any,
+    service: Any | None,
+    from_date: date,
+    days: int,
+    duration: int | None = None,
+    party_size: int | None = None,
+    nights: int = 1,
+) -> list[tuple[date, list[time_type]]]:
+    """Free slot start times for each day of [from_date, from_date + days), from a single bookings query.
+
+    `days` is capped at AVAILABILITY_MAX_HORIZON_DAYS. `duration` defaults to the service's duration.
+    """
+    days = max(1, min(days, settings.AVAILABILITY_MAX_HORIZON_DAYS))
+    duration = duration or (service.duration_minutes if service else 30)
+    availability = await _load_availability(
+        session, business, service, from_date, from_date + timedelta(days=days - 1), duration, nights
     )
-    booked = bookings_result.scalars().all()
-    booked_list = [
-        {"booking_time": b.booking_time, "duration_minutes": b.service.duration_minutes if b.service else duration}
-        for b in booked
-    ]
+    return list(_free_slots_by_day(business, availability, from_date, days, duration, party_size, nights))
 
-    available = []
-    for t in all_slots:
-        if not slot_taken(t, duration, booked_list):
-            label = t.strftime("%I:%M %p").lstrip("0")
-            available.append({"label": label, "time": t.isoformat(), "payload": {"time": t.isoformat()}})
-    return available
+
+async def find_next_available(
+    session: AsyncSession,
+    business: Any,
+    service: Any | None,
+    duration: int | None = None,
+    from_date: date | None = None,
+    horizon_days: int = 14,
+    limit: int = 5,
+    *,
+    earliest: time_type | None = None,
+    party_size: int | None = None,
+    nights: int = 1,
+) -> list[dict]:
+    """First `limit` free slots from `from_date` (default: today in the business's timezone) within `horizon_days`.
+
+    Slots come in date/time order.
+
+    Bookings for the whole horizon are loaded with one query; days are swept in order and the sweep
+    stops once `limit` slots are found. `earliest` skips slots before that time on `from_date` itself.
+    """
+    from_date = from_date or business_today(business.timezone)
+    horizon_days = max(1, min(horizon_days, settings.AVAILABILITY_MAX_HORIZON_DAYS))
+    duration = duration or (service.duration_minutes if service else 30)
+    availability = await _load_availability(
+        session, business, service, from_date, from_date + timedelta(days=horizon_days - 1), duration, nights
+    )
+    found: list[dict] = []
+    days = _free_slots_by_day(business, availability, from_date, horizon_days, duration, party_size, nights)
+    for day, slots in days:
+        for t in slots:
+            if day == from_date and earliest is not None and t < earliest:
+                continue
+            found.append({"date": day.isoformat(), "time": t.isoformat(), "label": slot_label(t)})
+            if len(found) >= limit:
+                return found
+    return found
 
 
-def _generate_booking_reference(business_type: BusinessTypeEnum, day: date) -> str:
+_REFERENCE_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_REFERENCE_LENGTH = 6
+_REFERENCE_SPACE = len(_REFERENCE_ALPHABET) ** _REFERENCE_LENGTH
+# Coprime with 36**6 (odd, not a multiple of 3), so n -> n * M + C mod 36**6 is a bijection:
+# distinct sequence values give distinct codes, and consecutive bookings do not get consecutive codes.
+_REFERENCE_MULTIPLIER = 1_548_008_749
+_REFERENCE_OFFSET = 711_534_201
+
+
+def _generate_booking_reference(business_type: BusinessTypeEnum, day: date, number: int) -> str:
+    """Reference like HTL-20260301-7QK2XA. `number` comes from booking_reference_seq, so codes never repeat."""
     prefixes = {
         BusinessTypeEnum.restaurant: "RST",
         BusinessTypeEnum.hostel: "HST",
@@ -88,8 +224,39 @@ def _generate_booking_reference(business_type: BusinessTypeEnum, day: date) -> s
     }
     prefix = prefixes.get(business_type, "BKG")
     date_str = day.strftime("%Y%m%d")
-    suffix = "".join(random.choices(string.ascii_uppercase + string.digits, k=4))
-    return f"{prefix}-{date_str}-{suffix}"
+    n = (number * _REFERENCE_MULTIPLIER + _REFERENCE_OFFSET) % _REFERENCE_SPACE
+    code = []
+    for _ in range(_REFERENCE_LENGTH):
+        n, digit = divmod(n, len(_REFERENCE_ALPHABET))
+        code.append(_REFERENCE_ALPHABET[digit])
+    return f"{prefix}-{date_str}-{''.join(reversed(code))}"
+
+
+async def allocate_booking_references(
+    session: AsyncSession, business_type: BusinessTypeEnum, days: list[date]
+) -> list[str]:
+    """One new reference per entry of `days` (all sequence values drawn in one round-trip)."""
+    if not days:
+        return []
+    numbers = await session.scalars(
+        select(booking_reference_seq.next_value()).select_from(func.generate_series(1, len(days)))
+    )
+    return [_generate_booking_reference(business_type, day, n) for day, n in zip(days, numbers)]
+
+
+def _advisory_lock_key(business_id: UUID, day: date) -> int:
+    digest = hashlib.blake2b(f"booking:{business_id}:{day.isoformat()}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+async def _lock_booking_days(session: AsyncSession, business_id: UUID, days: list[date]) -> None:
+    """Serialize booking writes per (business, day) until this transaction ends (pg_advisory_xact_lock).
+
+    Taken before the availability re-check, so check-then-insert is atomic: a concurrent booking for the
+    same day waits here and then sees the committed row. Days are locked in order to avoid deadlocks.
+    """
+    for day in sorted(set(days)):
+        await session.execute(select(func.pg_advisory_xact_lock(_advisory_lock_key(business_id, day))))
 
 
 async def create_booking(
@@ -129,22 +296,13 @@ async def create_booking(
     service = service_result.scalars().first()
     duration = service.duration_minutes if service else 30
 
-    # Race check: slot still free
-    existing = await session.execute(
-        select(Booking).where(
-            Booking.business_id == business_id,
-            Booking.booking_date == day,
-            Booking.status == BookingStatusEnum.confirmed,
-        ).options(selectinload(Booking.service))
-    )
-    booked_list = [
-        {"booking_time": b.booking_time, "duration_minutes": b.service.duration_minutes if b.service else duration}
-        for b in existing.scalars().all()
-    ]
-    if slot_taken(t, duration, booked_list):
+    # Race check under the (business, day) lock: slot still free (inventory-aware: units, rooms per night)
+    await _lock_booking_days(session, business_id, [day])
+    availability = await _load_availability(session, business, service, day, day, duration)
+    if not availability.free_slots(day, [t], duration, party_size):
         return {}
 
-    ref = _generate_booking_reference(business.type, day)
+    [ref] = await allocate_booking_references(session, business.type, [day])
     booking = Booking(
         business_id=business_id,
         customer_id=customer_id,
@@ -158,6 +316,7 @@ async def create_booking(
     )
     session.add(booking)
     await session.flush()
+    await bump_versions(session, business_id, booked_days(booking))
     return {
         "id": str(booking.id),
         "booking_reference": booking.booking_reference,
@@ -168,31 +327,15 @@ async def create_booking(
     }
 
 
-async def update_booking_reminder_jobs(
-    session: AsyncSession,
-    booking_id: UUID,
-    reminder_24h_job_id: str | None,
-    reminder_1h_job_id: str | None,
-) -> None:
-    """Store APScheduler job ids on the booking for later cancellation."""
-    result = await session.execute(select(Booking).where(Booking.id == booking_id).limit(1))
-    b = result.scalars().first()
-    if b:
-        b.reminder_24h_job_id = reminder_24h_job_id
-        b.reminder_1h_job_id = reminder_1h_job_id
-        await session.flush()
-
-
 async def cancel_booking(session: AsyncSession, booking_id: UUID) -> bool:
-    """Set status=cancelled, remove reminder jobs. Return True if found and cancelled."""
-    from app.services.reminder_service import cancel_reminders
+    """Set status=cancelled (the reminder dispatcher skips it). Return True if found and cancelled."""
     result = await session.execute(select(Booking).where(Booking.id == booking_id).limit(1))
     b = result.scalars().first()
     if not b:
         return False
-    cancel_reminders(b.reminder_24h_job_id, b.reminder_1h_job_id)
     b.status = BookingStatusEnum.cancelled
     await session.flush()
+    await bump_versions(session, b.business_id, booked_days(b))
     return True
 
 
@@ -203,11 +346,10 @@ async def get_bookings_for_customer(
     *,
     upcoming_only: bool = True,
 ) -> list[dict]:
-    """List bookings for a customer at a business. Default: upcoming confirmed only."""
-    from datetime import date
-
+    """List bookings for a customer at a business. Default: upcoming confirmed only (from today where the business is)."""
     q = (
-        select(Booking)
+        select(Booking, Business.timezone)
+        .join(Business, Business.id == Booking.business_id)
         .where(
             Booking.customer_id == customer_id,
             Booking.business_id == business_id,
@@ -216,10 +358,10 @@ async def get_bookings_for_customer(
         .options(selectinload(Booking.service))
         .order_by(Booking.booking_date, Booking.booking_time)
     )
-    result = await session.execute(q)
-    bookings = result.scalars().all()
-    if upcoming_only:
-        today = date.today()
+    rows = (await session.execute(q)).all()
+    bookings = [b for b, _ in rows]
+    if upcoming_only and rows:
+        today = business_today(rows[0].timezone)
         bookings = [b for b in bookings if b.booking_date >= today]
     return [
         {
@@ -260,9 +402,11 @@ async def reschedule_booking(
     new_date: date,
     new_time: time_type,
 ) -> dict | None:
-    """Update booking date/time, cancel old reminders, schedule new ones. Return booking dict or None."""
-    from app.services.reminder_service import cancel_reminders, schedule_reminders
+    """Move a booking (a hotel stay keeps its length) and re-arm its reminders. Return booking dict or None.
 
+    Raises ValueError if the new slot/nights have no room. Like create_booking, the check runs under the
+    (business, day) locks of both the old and the new days.
+    """
     result = await session.execute(
         select(Booking)
         .where(Booking.id == booking_id, Booking.status == BookingStatusEnum.confirmed)
@@ -276,20 +420,179 @@ async def reschedule_booking(
     b = result.scalars().first()
     if not b or not b.business or not b.customer:
         return None
-    cancel_reminders(b.reminder_24h_job_id, b.reminder_1h_job_id)
+    old_days = booked_days(b)
+    shift = new_date - b.booking_date
+    new_days = [day + shift for day in old_days]
+    await _lock_booking_days(session, b.business_id, [*old_days, *new_days])
+    duration = b.service.duration_minutes if b.service else 30
+    party_size = b.party_size or b.num_guests
+    availability = await _load_availability(
+        session, b.business, b.service, new_days[0], new_days[0], duration, len(new_days), exclude_booking_id=b.id
+    )
+    if not availability.free_slots(new_days[0], [new_time], duration, party_size, len(new_days)):
+        raise ValueError("The requested date/time is fully booked")
+
     b.booking_date = new_date
     b.booking_time = new_time
+    if b.check_in_date:
+        b.check_in_date += shift
+    if b.check_out_date:
+        b.check_out_date += shift
+    b.reminder_24h_sent_at = None
+    b.reminder_1h_sent_at = None
     await session.flush()
+    await bump_versions(session, b.business_id, [*old_days, *booked_days(b)])
+    return await get_booking(session, booking_id)
+
+
+# ── Listing (keyset pagination, column projection) ──────────────────────
 
-    time_str = new_time.isoformat() if hasattr(new_time, "isoformat") else str(new_time)
-    rid_24h, rid_1h = schedule_reminders(
-        b.id,
-        new_date.isoformat(),
-        time_str,
-        b.business.name,
-        b.customer.telegram_id or "",
-        b.booking_reference,
-        str(b.party_size or ""),
+# Columns of BookingResponse: GET /api/bookings reads these instead of whole ORM rows.
+BOOKING_LIST_COLUMNS = (
+    Booking.id,
+    Booking.business_id,
+    Booking.customer_id,
+    Booking.service_id,
+    Booking.staff_id,
+    Booking.booking_date,
+    Booking.booking_time,
+    Booking.party_size,
+    Booking.status,
+    Booking.booking_reference,
+    Booking.special_requests,
+)
+
+
+def _date_range(q: Select, from_date: date | None, to_date: date | None) -> Select:
+    if from_date is not None:
+        q = q.where(Booking.booking_date >= from_date)
+    if to_date is not None:
+        q = q.where(Booking.booking_date <= to_date)
+    return q
+
+
+def business_bookings_query(
+    business_id: UUID,
+    *,
+    status: BookingStatusEnum | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> Select:
+    """A business's bookings with service name and guest details (see booking_row), newest first."""
+    q = (
+        select(
+            Booking.id,
+            Booking.booking_reference,
+            Booking.booking_date,
+            Booking.booking_time,
+            Booking.check_in_date,
+            Booking.check_out_date,
+            Booking.num_guests,
+            Booking.num_nights,
+            Booking.total_price,
+            func.coalesce(func.nullif(Booking.guest_name, ""), Customer.full_name).label("guest_name"),
+            func.coalesce(func.nullif(Booking.guest_phone, ""), Customer.phone_number).label("guest_phone"),
+            Booking.party_size,
+            Booking.status,
+            Service.name.label("service_name"),
+            Booking.special_requests,
+            Booking.notes,
+            Booking.created_at,
+        )
+        .outerjoin(Service, Service.id == Booking.service_id)
+        .outerjoin(Customer, Customer.id == Booking.customer_id)
+        .where(Booking.business_id == business_id)
+        .order_by(Booking.created_at.desc(), Booking.id.desc())
     )
-    await update_booking_reminder_jobs(session, b.id, rid_24h, rid_1h)
-    return await get_booking(session, booking_id)
+    if status is not None:
+        q = q.where(Booking.status == status)
+    return _date_range(q, from_date, to_date)
+
+
+def booking_row(row: Any) -> dict[str, Any]:
+    """JSON-ready dict of one business_bookings_query row."""
+    return {
+        "id": str(row.id),
+        "booking_reference": row.booking_reference,
+        "booking_date": row.booking_date.isoformat(),
+        "booking_time": row.booking_time.isoformat() if row.booking_time else None,
+        "check_in_date": row.check_in_date.isoformat() if row.check_in_date else None,
+        "check_out_date": row.check_out_date.isoformat() if row.check_out_date else None,
+        "num_guests": row.num_guests,
+        "num_nights": row.num_nights,
+        "total_price": str(row.total_price) if row.total_price else None,
+        "guest_name": row.guest_name,
+        "guest_phone": row.guest_phone,
+        "party_size": row.party_size,
+        "status": row.status.value,
+        "service_name": row.service_name,
+        "special_requests": row.special_requests,
+        "notes": row.notes,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+    }
+
+
+async def list_business_bookings(
+    session: AsyncSession,
+    business_id: UUID,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    status: BookingStatusEnum | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> tuple[list[dict], str | None]:
+    """One page of a business's bookings, newest first (keyset on created_at, id).
+
+    Returns (rows, next cursor or None). Raises ValueError for a malformed cursor.
+    """
+    q = business_bookings_query(business_id, status=status, from_date=from_date, to_date=to_date)
+    if cursor:
+        created_at, booking_id = decode_cursor(cursor, (datetime.fromisoformat, UUID))
+        q = q.where(after((Booking.created_at, Booking.id), (created_at, booking_id), descending=True))
+    rows = (await session.execute(q.limit(limit + 1))).all()
+    page, next_cursor = split_page(rows, limit, lambda r: (r.created_at, r.id))
+    return [booking_row(r) for r in page], next_cursor
+
+
+async def business_booking_counts(session: AsyncSession, business_id: UUID) -> dict[str, int]:
+    """Bookings of a business per status, plus "total" (one GROUP BY; the list endpoint is paginated)."""
+    rows = await session.execute(
+        select(Booking.status, func.count()).where(Booking.business_id == business_id).group_by(Booking.status)
+    )
+    counts = {status.value: 0 for status in BookingStatusEnum}
+    for status, count in rows:
+        counts[status.value] = count
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+async def list_bookings(
+    session: AsyncSession,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    business_id: UUID | None = None,
+    customer_id: UUID | None = None,
+    status: BookingStatusEnum | None = BookingStatusEnum.confirmed,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> tuple[list[dict], str | None]:
+    """One page of bookings (BOOKING_LIST_COLUMNS) in booking_date, booking_time order (keyset incl. id).
+
+    Returns (rows, next cursor or None). Raises ValueError for a malformed cursor.
+    """
+    q = select(*BOOKING_LIST_COLUMNS).order_by(Booking.booking_date, Booking.booking_time, Booking.id)
+    if business_id is not None:
+        q = q.where(Booking.business_id == business_id)
+    if customer_id is not None:
+        q = q.where(Booking.customer_id == customer_id)
+    if status is not None:
+        q = q.where(Booking.status == status)
+    q = _date_range(q, from_date, to_date)
+    if cursor:
+        key = decode_cursor(cursor, (date.fromisoformat, time_type.fromisoformat, UUID))
+        q = q.where(after((Booking.booking_date, Booking.booking_time, Booking.id), key))
+    rows = (await session.execute(q.limit(limit + 1))).all()
+    page, next_cursor = split_page(rows, limit, lambda r: (r.booking_date, r.booking_time, r.id))
+    return [dict(r._mapping) for r in page], next_cursor
@@ -0,0 +1,478 @@
+"""Bulk booking import (CSV / NDJSON → COPY) and streaming export.
+
+Import is all-or-nothing. The upload is parsed and validated off the event loop in batches of
+BOOKING_IMPORT_BATCH_SIZE rows; services are resolved from one in-memory index, customers by id or by
+phone (one query per batch; unknown phones become new customers, loaded with COPY), missing booking
+references are drawn from booking_reference_seq in one round-trip per batch. Valid batches are COPYed
+into a temporary staging table and moved into bookings with a single
+INSERT … SELECT … ON CONFLICT (booking_reference) DO NOTHING, so re-importing a file skips the rows it
+already loaded. Any invalid row fails the import: the first BOOKING_IMPORT_MAX_ERRORS problems are
+returned by line and the caller rolls the transaction back.
+
+Export runs one column-projected query on a server-side cursor in its own session and yields encoded
+chunks of BOOKING_EXPORT_BATCH_SIZE rows, so memory stays flat however many bookings a business has.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, date, datetime, time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import IO, Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.db import Booking, Business, Customer, Service
+from app.models.db.booking import BookingStatusEnum
+from app.services.availability_cache import bump_versions
+from app.services.booking_service import (
+    allocate_booking_references,
+    booked_days,
+    booking_row,
+    business_bookings_query,
+)
+from app.utils.datetime_utils import business_today
+
+FORMATS = ("csv", "ndjson")
+
+# Fields of an exported booking (also the columns of the CSV export), same as GET /bookings.
+EXPORT_FIELDS = (
+    "id",
+    "booking_reference",
+    "booking_date",
+    "booking_time",
+    "check_in_date",
+    "check_out_date",
+    "num_guests",
+    "num_nights",
+    "total_price",
+    "guest_name",
+    "guest_phone",
+    "party_size",
+    "status",
+    "service_name",
+    "special_requests",
+    "notes",
+    "created_at",
+)
+
+# Importable booking columns, in staging-table order (after id, business_id).
+_ROW_COLUMNS = (
+    "customer_id",
+    "service_id",
+    "booking_date",
+    "booking_time",
+    "party_size",
+    "check_in_date",
+    "check_out_date",
+    "num_guests",
+    "num_nights",
+    "total_price",
+    "guest_name",
+    "guest_email",
+    "guest_phone",
+    "notes",
+    "status",
+    "booking_reference",
+    "special_requests",
+    "created_at",
+)
+_STAGING_TABLE = "booking_import"
+_STAGING_COLUMNS = ("id", "business_id", *_ROW_COLUMNS)
+_STAGING_DDL = f"""
+CREATE TEMPORARY TABLE {_STAGING_TABLE} (
+    id uuid, business_id uuid, customer_id uuid, service_id uuid,
+    booking_date date, booking_time time, party_size integer,
+    check_in_date date, check_out_date date, num_guests integer, num_nights integer,
+    total_price numeric(10, 2), guest_name text, guest_email text, guest_phone text, notes text,
+    status text, booking_reference text, special_requests text, created_at timestamptz
+) ON COMMIT DROP
+"""
+_MOVE_SQL = f"""
+WITH moved AS (
+    INSERT INTO bookings ({", ".join(_STAGING_COLUMNS)})
+    SELECT {", ".join(
+        "status::bookingstatusenum" if c == "status" else "coalesce(created_at, now())" if c == "created_at" else c
+        for c in _STAGING_COLUMNS
+    )}
+    FROM {_STAGING_TABLE}
+    ON CONFLICT (booking_reference) DO NOTHING
+    RETURNING 1
+)
+SELECT count(*) FROM moved
+"""
+
+_MAX_LENGTHS = {c.name: c.type.length for c in Booking.__table__.columns if getattr(c.type, "length", None)}
+_MAX_PRICE = Decimal("1e8")  # numeric(10, 2)
+_MAX_CUSTOMER_PHONE = Customer.__table__.c.phone_number.type.length
+
+
+@dataclass(slots=True)
+class ImportRow:
+    """One validated row; attribute names follow Booking (booked_days() accepts it)."""
+
+    line: int
+    customer_id: UUID | None
+    service_id: UUID
+    booking_date: date
+    booking_time: time
+    party_size: int | None
+    check_in_date: date | None
+    check_out_date: date | None
+    num_guests: int | None
+    num_nights: int | None
+    total_price: Decimal | None
+    guest_name: str | None
+    guest_email: str | None
+    guest_phone: str | None
+    notes: str | None
+    status: str
+    booking_reference: str | None
+    special_requests: str | None
+    created_at: datetime | None
+
+    def record(self, business_id: UUID) -> tuple:
+        return (uuid4(), business_id, *(getattr(self, c) for c in _ROW_COLUMNS))
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    inserted: int = 0
+    skipped: int = 0  # booking_reference already in the table (or repeated in the file)
+    customers_created: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def detect_format(filename: str | None, content_type: str | None = None) -> str:
+    """csv or ndjson from the upload's name / content type (csv when unknown)."""
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (content_type or ""):
+        return "ndjson"
+    return "csv"
+
+
+# ── Parsing / validation (sync, runs in a worker thread) ────────────────
+
+def _read_rows(stream: IO[bytes], fmt: str) -> Iterator[tuple[int, dict[str, Any] | None]]:
+    """(line number, raw row) pairs; None for an NDJSON line that is not a JSON object.
+
+    Lines are decoded one at a time so that text which is not UTF-8 (e.g. a cp1252 spreadsheet export) or
+    CSV the reader rejects raises ValueError naming the line; the rows after it are not read.
+    """
+    line_no = 0
+
+    def lines() -> Iterator[str]:
+        nonlocal line_no
+        for line_no, line in enumerate(stream, start=1):
+            yield line.decode("utf-8-sig" if line_no == 1 else "utf-8")
+
+    try:
+        if fmt == "csv":
+            rows = csv.DictReader(lines())
+            for raw in rows:
+                yield rows.line_num, raw
+            return
+        for line in lines():
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError:
+                raw = None
+            yield line_no, raw if isinstance(raw, dict) else None
+    except UnicodeDecodeError as e:
+        raise ValueError(f"line {line_no}: not UTF-8 text (byte {e.start + 1}); save the file as UTF-8") from e
+    except csv.Error as e:
+        raise ValueError(f"line {line_no}: {e}") from e
+
+
+def _field(raw: dict[str, Any], name: str) -> str | None:
+    value = raw.get(name)
+    if value is None:
+        return None
+    value = str(value).strip()
+    if len(value) > _MAX_LENGTHS.get(name, len(value)):
+        raise ValueError(f"{name} is longer than {_MAX_LENGTHS[name]} characters")
+    return value or None
+
+
+def _parsed(raw: dict[str, Any], name: str, parse: Any, what: str) -> Any:
+    value = _field(raw, name)
+    if value is None:
+        return None
+    try:
+        return parse(value)
+    except (ValueError, InvalidOperation):
+        raise ValueError(f"{name} is not a valid {what}: {value!r}") from None
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise ValueError(value)
+    return n
+
+
+def _price(value: str) -> Decimal:
+    price = Decimal(value)
+    if not price.is_finite() or abs(price) >= _MAX_PRICE:
+        raise ValueError(value)
+    return price
+
+
+def _timestamp(value: str) -> datetime:
+    ts = datetime.fromisoformat(value)
+    return ts if ts.tzinfo else ts.replace(tzinfo=UTC)
+
+
+def _parse_row(line: int, raw: dict[str, Any] | None, services: dict[str, UUID], today: date) -> ImportRow:
+    if raw is None:
+        raise ValueError("not a JSON object")
+    service_key = _field(raw, "service_id") or _field(raw, "service")
+    if service_key is None:
+        raise ValueError("service_id or service is required")
+    service_id = services.get(service_key) or services.get(service_key.casefold())
+    if service_id is None:
+        raise ValueError(f"unknown service {service_key!r}")
+
+    check_in = _parsed(raw, "check_in_date", date.fromisoformat, "date")
+    check_out = _parsed(raw, "check_out_date", date.fromisoformat, "date")
+    booking_date = _parsed(raw, "booking_date", date.fromisoformat, "date") or check_in
+    if booking_date is None:
+        raise ValueError("booking_date (or check_in_date) is required")
+    if check_in and check_out and check_out <= check_in:
+        raise ValueError("check_out_date must be after check_in_date")
+    booking_time = _parsed(raw, "booking_time", time.fromisoformat, "time")
+    if booking_time is None:
+        if check_in is None:
+            raise ValueError("booking_time is required")
+        booking_time = time(0, 0)
+
+    status = _field(raw, "status")
+    if status is None:
+        status = (BookingStatusEnum.completed if booking_date < today else BookingStatusEnum.confirmed).value
+    elif status.lower() not in BookingStatusEnum.__members__:
+        raise ValueError(f"status must be one of {', '.join(BookingStatusEnum.__members__)}")
+    else:
+        status = status.lower()
+
+    customer_id = _parsed(raw, "customer_id", UUID, "UUID")
+    guest_phone = _field(raw, "guest_phone")
+    if customer_id is None and guest_phone is None:
+        raise ValueError("customer_id or guest_phone is required")
+
+    return ImportRow(
+        line=line,
+        customer_id=customer_id,
+        service_id=service_id,
+        booking_date=booking_date,
+        booking_time=booking_time,
+        party_size=_parsed(raw, "party_size", _positive_int, "positive integer"),
+        check_in_date=check_in,
+        check_out_date=check_out,
+        num_guests=_parsed(raw, "num_guests", _positive_int, "positive integer"),
+        num_nights=_parsed(raw, "num_nights", _positive_int, "positive integer"),
+        total_price=_parsed(raw, "total_price", _price, "price"),
+        guest_name=_field(raw, "guest_name"),
+        guest_email=_field(raw, "guest_email"),
+        guest_phone=guest_phone,
+        notes=_field(raw, "notes"),
+        status=status,
+        booking_reference=_field(raw, "booking_reference"),
+        special_requests=_field(raw, "special_requests"),
+        created_at=_parsed(raw, "created_at", _timestamp, "ISO timestamp"),
+    )
+
+
+def _parse_batch(
+    rows: Iterator[tuple[int, dict[str, Any] | None]],
+    services: dict[str, UUID],
+    today: date,
+    size: int,
+) -> tuple[list[ImportRow], list[str], int]:
+    """Next `size` rows: (valid rows, errors, rows consumed).
+
+    An unreadable line (see _read_rows) counts as a consumed row with an error and ends the stream.
+    """
+    parsed: list[ImportRow] = []
+    errors: list[str] = []
+    consumed = 0
+    batch = islice(rows, size)
+    while True:
+        try:
+            line, raw = next(batch)
+        except StopIteration:
+            break
+        except ValueError as e:
+            errors.append(str(e))
+            consumed += 1
+            break
+        consumed += 1
+        try:
+            parsed.append(_parse_row(line, raw, services, today))
+        except ValueError as e:
+            errors.append(f"line {line}: {e}")
+    return parsed, errors, consumed
+
+
+# ── Import ──────────────────────────────────────────────────────────────
+
+async def _driver_connection(session: AsyncSession) -> Any:
+    """The asyncpg connection behind the session's current transaction (for COPY)."""
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
+
+
+async def _service_index(session: AsyncSession, business_id: UUID) -> dict[str, UUID]:
+    """Service id (as text) and case-folded name → id, including inactive services (historical rows)."""
+    rows = await session.execute(select(Service.id, Service.name).where(Service.business_id == business_id))
+    index: dict[str, UUID] = {}
+    for service_id, name in rows.all():
+        index[str(service_id)] = service_id
+        index.setdefault(name.strip().casefold(), service_id)
+    return index
+
+
+async def _resolve_customers(
+    session: AsyncSession,
+    copy_conn: Any,
+    rows: list[ImportRow],
+    by_phone: dict[str, UUID],
+    result: ImportResult,
+) -> list[str]:
+    """Fill customer_id from guest_phone (existing customer, else a new one). Returns errors."""
+    ids = {r.customer_id for r in rows if r.customer_id is not None}
+    errors: list[str] = []
+    if ids:
+        found = set(await session.scalars(select(Customer.id).where(Customer.id.in_(ids))))
+        errors = [
+            f"line {r.line}: unknown customer_id {r.customer_id}"
+            for r in rows
+            if r.customer_id is not None and r.customer_id not in found
+        ]
+
+    wanted = {r.guest_phone for r in rows if r.customer_id is None} - by_phone.keys()
+    if wanted:
+        existing = await session.execute(
+            select(Customer.phone_number, Customer.id)
+            .where(Customer.phone_number.in_(wanted))
+            .distinct(Customer.phone_number)
+            .order_by(Customer.phone_number, Customer.created_at)
+        )
+        by_phone.update(existing.tuples().all())
+        new: dict[str, tuple] = {}
+        for r in rows:
+            if r.customer_id is not None or r.guest_phone in by_phone or r.guest_phone in new:
+                continue
+            if len(r.guest_phone) > _MAX_CUSTOMER_PHONE:
+                errors.append(f"line {r.line}: guest_phone is longer than {_MAX_CUSTOMER_PHONE} characters")
+                continue
+            new[r.guest_phone] = (uuid4(), r.guest_name, r.guest_phone, "{}")
+        if new:
+            await copy_conn.copy_records_to_table(
+                "customers",
+                records=list(new.values()),
+                columns=["id", "full_name", "phone_number", "conversation_state"],
+            )
+            by_phone.update((phone, record[0]) for phone, record in new.items())
+            result.customers_created += len(new)
+
+    for r in rows:
+        if r.customer_id is None:
+            r.customer_id = by_phone.get(r.guest_phone)
+    return errors
+
+
+async def import_bookings(session: AsyncSession, business: Business, stream: IO[bytes], fmt: str) -> ImportResult:
+    """Load bookings for `business` from a CSV or NDJSON byte stream (see module docstring).
+
+    Columns: service_id or service (name), booking_date, booking_time, customer_id or guest_phone,
+    optional check_in_date, check_out_date, num_nights, num_guests, party_size, total_price, guest_name,
+    guest_email, notes, special_requests, status (default: completed if before today in the business's
+    timezone, else confirmed),
+    booking_reference (default: a new one), created_at. Imported confirmed bookings get the usual reminders
+    (reminder_service) when they are still ahead and the customer can be reached on Telegram or WhatsApp.
+    When `result.errors` is non-empty nothing usable was written and the caller must roll back.
+    """
+    result = ImportResult()
+    services = await _service_index(session, business.id)
+    await session.execute(text(_STAGING_DDL))
+    copy_conn = await _driver_connection(session)
+    rows = _read_rows(stream, fmt)
+    today = business_today(business.timezone)
+    by_phone: dict[str, UUID] = {}
+    days: set[date] = set()
+    max_errors = settings.BOOKING_IMPORT_MAX_ERRORS
+
+    while len(result.errors) < max_errors:
+        parsed, errors, consumed = await asyncio.to_thread(
+            _parse_batch, rows, services, today, settings.BOOKING_IMPORT_BATCH_SIZE
+        )
+        if not consumed:
+            break
+        result.rows += consumed
+        if not result.errors and not errors:
+            errors = await _resolve_customers(session, copy_conn, parsed, by_phone, result)
+        result.errors.extend(errors[: max_errors - len(result.errors)])
+        if result.errors:
+            continue  # keep validating to report problems, but skip the writes
+
+        missing = [r for r in parsed if r.booking_reference is None]
+        refs = await allocate_booking_references(session, business.type, [r.booking_date for r in missing])
+        for r, ref in zip(missing, refs):
+            r.booking_reference = ref
+        await copy_conn.copy_records_to_table(
+            _STAGING_TABLE,
+            records=[r.record(business.id) for r in parsed],
+            columns=list(_STAGING_COLUMNS),
+        )
+        days.update(d for r in parsed if r.status == BookingStatusEnum.confirmed.value for d in booked_days(r))
+
+    if result.errors or not result.rows:
+        return result
+    result.inserted = await session.scalar(text(_MOVE_SQL))
+    result.skipped = result.rows - result.inserted
+    await bump_versions(session, business.id, days)
+    return result
+
+
+# ── Export ──────────────────────────────────────────────────────────────
+
+async def export_bookings(business_id: UUID, fmt: str, status: BookingStatusEnum | None = None) -> AsyncIterator[bytes]:
+    """Encoded chunks of a business's bookings (CSV with header, or NDJSON), streamed from a server-side cursor.
+
+    Uses its own session: the response body is produced after the request's dependencies have finished.
+    """
+    query = business_bookings_query(business_id, status=status).execution_options(
+        yield_per=settings.BOOKING_EXPORT_BATCH_SIZE
+    )
+    async with async_session_maker() as session:
+        result = await session.stream(query)
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            async for partition in result.partitions():
+                writer.writerows(booking_row(row) for row in partition)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+            return
+        async for partition in result.partitions():
+            yield "".join(json.dumps(booking_row(row)) + "\n" for row in partition).encode()
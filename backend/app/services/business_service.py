@@ -1,15 +1,17 @@
-"""Business lookup. For dev: first active business; later map by bot/phone_number_id."""
+"""Business lookup. Webhooks resolve tenants by bot / phone_number_id via app.services.channel_routing."""
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.database import run_after_commit
 from app.models.db import Business
+from app.services.tenant_cache import BusinessSnapshot, tenant_cache
 
 
 async def get_first_active_business(session: AsyncSession) -> Business | None:
-    """Return the first active business (for single-tenant/dev). Later: resolve by bot token or whatsapp phone_number_id."""
+    """Return the first active business (for single-tenant/dev). Webhooks use channel_routing instead."""
     result = await session.execute(
         select(Business)
         .where(Business.is_active.is_(True))
@@ -28,3 +30,21 @@ async def get_business_by_id(session: AsyncSession, business_id: UUID) -> Busine
         .limit(1)
     )
     return result.scalars().first()
+
+
+async def get_business_snapshot(session: AsyncSession, business_id: UUID) -> BusinessSnapshot | None:
+    """Cached, read-only tenant bundle for the bot hot path. Falls back to get_business_by_id on a miss."""
+    snapshot = tenant_cache.get(business_id)
+    if snapshot is not None:
+        return snapshot
+    version = tenant_cache.current_version(business_id)
+    business = await get_business_by_id(session, business_id)
+    if business is None:
+        return None
+    return tenant_cache.store(business, version)
+
+
+def invalidate_business(session: AsyncSession, business_id: UUID) -> None:
+    """Drop the cached snapshot now and again after the session commits (call from any route that mutates a tenant)."""
+    tenant_cache.invalidate(business_id)
+    run_after_commit(session, lambda: tenant_cache.invalidate(business_id))
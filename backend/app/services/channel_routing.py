@@ -0,0 +1,198 @@
+"""Webhook routing: which business an incoming webhook belongs to, resolved in memory.
+
+Meta posts every tenant's WhatsApp messages to the one /webhook/whatsapp endpoint, naming the
+receiving number (metadata.phone_number_id); Telegram bots can post to /webhook/telegram/bot/{bot_id}.
+The channel_routes table materialises (channel, address) → business from Business.whatsapp_config and
+Business.telegram_bot_token, rewritten in the same transaction as every business write
+(sync_business_routes), and its primary key stops two businesses claiming one number or bot.
+
+Each worker holds the whole table in a dict, so a lookup is O(1) and never touches the database.
+The writing worker applies its change once the transaction commits; every worker also compares the
+table's (row count, checksum) stamp every CHANNEL_ROUTING_REFRESH_SECONDS and reloads it when it
+moved, which carries other workers' writes.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from uuid import UUID
+
+from sqlalchemy import String, cast, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker, run_after_commit
+from app.models.db import Business, ChannelRoute
+from app.models.db.business import ActiveChannelEnum
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM = ActiveChannelEnum.telegram.value
+WHATSAPP = ActiveChannelEnum.whatsapp.value
+
+RouteKey = tuple[str, str]
+
+# Content checksum of the table: changes whenever any route is added, removed or re-pointed,
+# regardless of commit order (a max(updated_at) stamp can miss a write that commits late).
+_CHECKSUM = func.coalesce(
+    func.sum(
+        func.hashtext(ChannelRoute.channel + ":" + ChannelRoute.address + ":" + cast(ChannelRoute.business_id, String))
+    ),
+    0,
+)
+
+
+def telegram_bot_id(token: str | None) -> str | None:
+    """The bot id (the token's numeric prefix): public, so safe to store and log, unlike the token."""
+    if not token or ":" not in token:
+        return None
+    return token.partition(":")[0]
+
+
+def business_routes(business: Business) -> list[RouteKey]:
+    """(channel, address) pairs a business should receive webhooks for; none while inactive."""
+    if not business.is_active:
+        return []
+    routes: list[RouteKey] = []
+    number = (business.whatsapp_config or {}).get("phone_number_id")
+    if number:
+        routes.append((WHATSAPP, str(number)))
+    bot_id = telegram_bot_id(business.telegram_bot_token)
+    if bot_id:
+        routes.append((TELEGRAM, bot_id))
+    return routes
+
+
+async def sync_business_routes(session: AsyncSession, business: Business) -> None:
+    """Rewrite the business's channel_routes rows (call after flushing a create/update).
+
+    Raises ValueError if a number or bot is already routed to another business.
+    """
+    business_id = business.id
+    routes = business_routes(business)
+    await session.execute(delete(ChannelRoute).where(ChannelRoute.business_id == business_id))
+    if routes:
+        claimed = await session.execute(
+            pg_insert(ChannelRoute)
+            .values([{"channel": c, "address": a, "business_id": business_id} for c, a in routes])
+            .on_conflict_do_nothing()
+            .returning(ChannelRoute.channel, ChannelRoute.address)
+        )
+        taken = set(routes) - {(c, a) for c, a in claimed}
+        if taken:
+            channel, address = sorted(taken)[0]
+            raise ValueError(f"{channel} address {address} is already connected to another business")
+    run_after_commit(session, lambda: channel_routes.apply(business_id, routes))
+
+
+class ChannelRoutingIndex:
+    """In-process copy of channel_routes: (channel, address) → business id."""
+
+    def __init__(self, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.ready = False
+        self._routes: dict[RouteKey, UUID] = {}
+        self._by_business: dict[UUID, list[RouteKey]] = {}
+        self._stamp: tuple | None = None
+        # Changes applied while a reload is reading the table, replayed onto its result.
+        self._applied_during_load: list[tuple[UUID, list[RouteKey]]] | None = None
+        self._task: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.reload_ms = 0.0
+
+    def lookup(self, channel: str, address: str) -> UUID | None:
+        business_id = self._routes.get((channel, address))
+        if business_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return business_id
+
+    def apply(self, business_id: UUID, routes: list[RouteKey]) -> None:
+        """Replace one business's routes (after its write committed)."""
+        for key in self._by_business.pop(business_id, ()):
+            if self._routes.get(key) == business_id:
+                del self._routes[key]
+        if routes:
+            self._by_business[business_id] = list(routes)
+            for key in routes:
+                self._routes[key] = business_id
+        if self._applied_during_load is not None:
+            self._applied_during_load.append((business_id, routes))
+
+    def load(self, rows: list[tuple[str, str, UUID]], stamp: tuple | None = None) -> None:
+        """Replace the whole index with `rows` of (channel, address, business_id)."""
+        routes: dict[RouteKey, UUID] = {}
+        by_business: dict[UUID, list[RouteKey]] = {}
+        for channel, address, business_id in rows:
+            routes[(channel, address)] = business_id
+            by_business.setdefault(business_id, []).append((channel, address))
+        self._routes, self._by_business, self._stamp = routes, by_business, stamp
+        self.ready = True
+
+    async def refresh(self, session: AsyncSession, force: bool = False) -> bool:
+        """Reload from channel_routes if its stamp moved (or `force`). Returns True when reloaded."""
+        stamp = tuple((await session.execute(select(func.count(), _CHECKSUM))).one())
+        if not force and stamp == self._stamp:
+            return False
+        started = time.perf_counter()
+        self._applied_during_load = pending = []
+        try:
+            rows = (
+                await session.execute(select(ChannelRoute.channel, ChannelRoute.address, ChannelRoute.business_id))
+            ).all()
+        finally:
+            self._applied_during_load = None
+        self.load(rows, stamp)
+        for business_id, routes in pending:
+            self.apply(business_id, routes)
+        self.reloads += 1
+        self.reload_ms = round(1000 * (time.perf_counter() - started), 2)
+        return True
+
+    async def _refresh(self, force: bool = False) -> None:
+        async with async_session_maker() as session:
+            await self.refresh(session, force)
+
+    async def start(self) -> None:
+        """Load the table now (webhooks answer 503 until this succeeds), then poll in the background."""
+        try:
+            await self._refresh(force=True)
+        except Exception:
+            logger.exception("Loading channel routes failed; retrying in %ss", self.refresh_seconds)
+        self._task = asyncio.create_task(self._run(), name="channel-routes-refresh")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self._refresh(force=not self.ready)
+            except Exception:
+                logger.exception("Refreshing channel routes failed")
+
+    def metrics(self) -> dict[str, bool | float | int]:
+        return {
+            "ready": self.ready,
+            "routes": len(self._routes),
+            "businesses": len(self._by_business),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "reload_ms": self.reload_ms,
+        }
+
+
+channel_routes = ChannelRoutingIndex(settings.CHANNEL_ROUTING_REFRESH_SECONDS)
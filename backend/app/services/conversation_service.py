@@ -1,22 +1,42 @@
-"""Conversation history: load last N messages, add message, trim to 20 per customer/business."""
-from uuid import UUID
+"""Conversation history: load last N messages, append a turn, trim to 20 per customer/business."""
+import logging
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
 
-from sqlalchemy import delete, select
+from sqlalchemy import Select, delete, func, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.database import async_session_maker
 from app.models.db import ConversationMessage
 from app.models.db.conversation import MessageRoleEnum
 
+logger = logging.getLogger(__name__)
+
 HISTORY_LIMIT = 20
 
 
+def message_stamp(created_at: datetime) -> str:
+    """A message's created_at as a fixed-width UTC string, so stamps order as strings (the "at" key)."""
+    return created_at.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+# Messages appended per (customer_id, business_id) since this worker last trimmed it. Per process and
+# approximate (other workers append too); the periodic compaction job bounds what this misses.
+_appended_since_trim: LRUCache[tuple[UUID, UUID], int] = LRUCache(10_000)
+
+
 async def get_recent_messages(
     session: AsyncSession,
     customer_id: UUID,
     business_id: UUID,
     limit: int = HISTORY_LIMIT,
 ) -> list[dict[str, str]]:
-    """Return last `limit` messages as list of {"role": "user"|"assistant", "content": str} in chronological order."""
+    """Return last `limit` messages in chronological order.
+
+    Each is {"role": "user"|"assistant", "content": str, "at": message_stamp(created_at)}.
+    """
     result = await session.execute(
         select(ConversationMessage)
         .where(
@@ -28,7 +48,7 @@ async def get_recent_messages(
     )
     rows = list(result.scalars().all())
     rows.reverse()
-    return [{"role": m.role.value, "content": m.content} for m in rows]
+    return [{"role": m.role.value, "content": m.content, "at": message_stamp(m.created_at)} for m in rows]
 
 
 async def add_message(
@@ -49,6 +69,53 @@ async def add_message(
     await session.flush()
 
 
+async def append_turn(
+    session: AsyncSession,
+    customer_id: UUID,
+    business_id: UUID,
+    user_text: str,
+    assistant_text: str,
+) -> tuple[datetime, datetime]:
+    """Append a user message and the assistant reply in one multi-row INSERT; returns their created_at.
+
+    Both rows share the transaction's now(); the reply is stamped 1µs later so the pair always
+    reads back in order. Trimming is lazy: only once this worker has appended enough to push the
+    conversation past CONVERSATION_HISTORY_HIGH_WATER (reads are LIMITed, so extra rows are harmless).
+    """
+    now = func.now()
+    result = await session.execute(
+        insert(ConversationMessage).values(
+            [
+                {
+                    "id": uuid4(),
+                    "customer_id": customer_id,
+                    "business_id": business_id,
+                    "role": MessageRoleEnum.user,
+                    "content": user_text,
+                    "created_at": now,
+                },
+                {
+                    "id": uuid4(),
+                    "customer_id": customer_id,
+                    "business_id": business_id,
+                    "role": MessageRoleEnum.assistant,
+                    "content": assistant_text,
+                    "created_at": now + timedelta(microseconds=1),
+                },
+            ]
+        )
+        .returning(ConversationMessage.role, ConversationMessage.created_at)
+    )
+    created = {role: created_at for role, created_at in result.all()}
+    key = (customer_id, business_id)
+    appended = (_appended_since_trim.get(key) or 0) + 2
+    if HISTORY_LIMIT + appended >= settings.CONVERSATION_HISTORY_HIGH_WATER:
+        await trim_to_limit(session, customer_id, business_id)
+        appended = 0
+    _appended_since_trim.set(key, appended)
+    return created[MessageRoleEnum.user], created[MessageRoleEnum.assistant]
+
+
 async def trim_to_limit(
     session: AsyncSession,
     customer_id: UUID,
@@ -74,3 +141,82 @@ async def trim_to_limit(
             ConversationMessage.id.not_in(subq),
         )
     )
+
+
+ConversationKey = tuple[UUID, UUID]
+
+
+def compaction_candidates(after: ConversationKey | None, batch_size: int, limit: int = HISTORY_LIMIT) -> Select:
+    """Next `batch_size` conversations (customer_id, business_id) after `after` holding more than `limit` messages."""
+    stmt = (
+        select(ConversationMessage.customer_id, ConversationMessage.business_id)
+        .group_by(ConversationMessage.customer_id, ConversationMessage.business_id)
+        .having(func.count() > limit)
+        .order_by(ConversationMessage.customer_id, ConversationMessage.business_id)
+        .limit(batch_size)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(ConversationMessage.customer_id, ConversationMessage.business_id) > tuple_(*after))
+    return stmt
+
+
+async def compact_history(
+    session: AsyncSession,
+    after: ConversationKey | None = None,
+    batch_size: int = 500,
+    limit: int = HISTORY_LIMIT,
+) -> tuple[int, ConversationKey | None]:
+    """Trim the next `batch_size` over-long conversations after `after` to their newest `limit` messages.
+
+    Conversations are visited in (customer_id, business_id) order along
+    ix_conversation_history_customer_business_created, and the window-function DELETE only ranks the
+    rows of the batch. Returns (rows deleted, key to continue after; None once the last batch is done).
+    """
+    candidates = compaction_candidates(after, batch_size, limit)
+    keys = [tuple(row) for row in (await session.execute(candidates)).all()]
+    if not keys:
+        return 0, None
+    ranked = (
+        select(
+            ConversationMessage.id,
+            func.row_number()
+            .over(
+                partition_by=(ConversationMessage.customer_id, ConversationMessage.business_id),
+                order_by=ConversationMessage.created_at.desc(),
+            )
+            .label("rn"),
+        )
+        .where(tuple_(ConversationMessage.customer_id, ConversationMessage.business_id).in_(keys))
+        .subquery()
+    )
+    result = await session.execute(
+        delete(ConversationMessage).where(
+            ConversationMessage.id.in_(select(ranked.c.id).where(ranked.c.rn > limit))
+        )
+    )
+    return result.rowcount or 0, keys[-1] if len(keys) == batch_size else None
+
+
+async def run_history_compaction() -> None:
+    """Scheduler job: what lazy trimming left behind, compact_history batch by batch.
+
+    Each batch commits on its own, so no transaction holds row locks across the whole table.
+    """
+    deleted = 0
+    after: ConversationKey | None = None
+    while True:
+        async with async_session_maker() as session:
+            try:
+                removed, after = await compact_history(
+                    session, after, batch_size=settings.CONVERSATION_COMPACTION_BATCH_SIZE
+                )
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                logger.exception("Conversation history compaction failed")
+                break
+        deleted += removed
+        if after is None:
+            break
+    if deleted:
+        logger.info("Conversation history compaction removed %d messages", deleted)
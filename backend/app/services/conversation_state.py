@@ -0,0 +1,188 @@
+"""Typed, versioned Customer.conversation_state with dirty tracking and optimistic concurrency.
+
+Stored as a JSONB document {"v": 2, "pending_booking": {...}, "history_summaries": {...}} with unset
+fields and empty values left out. Version 1 documents (same keys, no "v"; a cleared booking stored
+as {}) read as-is and are stamped on their next save; unknown keys are kept.
+
+load_conversation_state wraps the customer's row; setting pending_booking or a history summary
+marks that top-level key dirty, and save_conversation_state writes only the dirty keys
+(`conversation_state || patch - removed`) where state_version still equals the loaded version,
+bumping it. A save that lost the race raises StaleConversationState and changes nothing, so two
+concurrent callbacks (a double-tapped Confirm, a slot tap racing a new offer) cannot overwrite each
+other; update_conversation_state reloads and re-applies changes where last-writer-wins is intended.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, fields
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Text, literal, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.db import Customer
+from app.utils.context_builder import HISTORY_SUMMARY_KEY
+
+SCHEMA_VERSION = 2
+VERSION_KEY = "v"
+PENDING_BOOKING_KEY = "pending_booking"
+UPDATE_ATTEMPTS = 3
+
+
+class StaleConversationState(Exception):
+    """The customer's conversation_state was saved by someone else since it was loaded."""
+
+    def __init__(self, customer_id: UUID) -> None:
+        super().__init__(f"conversation_state of customer {customer_id} changed concurrently")
+        self.customer_id = customer_id
+
+
+@dataclass(frozen=True, slots=True)
+class PendingBooking:
+    """Booking assembled across turns: the AI's offer (service, date, party size), then the tapped slot."""
+
+    service_id: str | None = None
+    booking_date: str | None = None
+    party_size: int | None = None
+    time: str | None = None
+    special_requests: str | None = None
+
+    @classmethod
+    def from_json(cls, data: Any) -> PendingBooking | None:
+        if not isinstance(data, dict) or not data:
+            return None
+        return cls(**{f: data.get(f) for f in _PENDING_FIELDS})
+
+    def to_json(self) -> dict[str, Any]:
+        return {f: value for f in _PENDING_FIELDS if (value := getattr(self, f)) is not None}
+
+
+_PENDING_FIELDS = tuple(f.name for f in fields(PendingBooking))
+
+
+class ConversationState:
+    """One customer's state as loaded at `version`; changes are recorded per top-level key."""
+
+    __slots__ = ("version", "_document", "_pending", "_dirty")
+
+    def __init__(self, document: Mapping[str, Any] | None, version: int = 0) -> None:
+        self.version = version
+        self._document = dict(document or {})
+        self._pending = PendingBooking.from_json(self._document.get(PENDING_BOOKING_KEY))
+        self._dirty: set[str] = set()
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    @property
+    def pending_booking(self) -> PendingBooking | None:
+        return self._pending
+
+    @pending_booking.setter
+    def pending_booking(self, value: PendingBooking | None) -> None:
+        if value is not None and not value.to_json():
+            value = None
+        if value != self._pending:
+            self._pending = value
+            self._dirty.add(PENDING_BOOKING_KEY)
+
+    def history_summary(self, business_id: UUID) -> dict[str, str] | None:
+        return (self._document.get(HISTORY_SUMMARY_KEY) or {}).get(str(business_id))
+
+    def set_history_summary(self, business_id: UUID, summary: dict[str, str] | None) -> None:
+        summaries = dict(self._document.get(HISTORY_SUMMARY_KEY) or {})
+        if summaries.get(str(business_id)) == summary:
+            return
+        if summary:
+            summaries[str(business_id)] = summary
+        else:
+            summaries.pop(str(business_id), None)
+        self._document[HISTORY_SUMMARY_KEY] = summaries
+        self._dirty.add(HISTORY_SUMMARY_KEY)
+
+    def booking_context(self) -> dict[str, Any]:
+        """What the system prompt shows of the state (the booking in progress, if any)."""
+        return {PENDING_BOOKING_KEY: self._pending.to_json()} if self._pending else {}
+
+    def _value(self, key: str) -> Any:
+        if key == PENDING_BOOKING_KEY:
+            return self._pending.to_json() if self._pending else None
+        return self._document.get(key) or None
+
+    def changes(self) -> tuple[dict[str, Any], list[str]]:
+        """(keys to set, keys to remove) since load; the patch always carries the schema version."""
+        patch: dict[str, Any] = {VERSION_KEY: SCHEMA_VERSION}
+        removed: list[str] = []
+        for key in sorted(self._dirty):
+            value = self._value(key)
+            if value is None:
+                removed.append(key)
+            else:
+                patch[key] = value
+        return patch, removed
+
+    def mark_saved(self, version: int) -> None:
+        self.version = version
+        self._dirty.clear()
+
+
+def load_conversation_state(customer: Customer) -> ConversationState:
+    return ConversationState(customer.conversation_state, customer.state_version or 0)
+
+
+async def reload_conversation_state(session: AsyncSession, customer: Customer) -> ConversationState:
+    """Re-read the committed state (after losing a race)."""
+    await session.refresh(customer, ["conversation_state", "state_version"])
+    return load_conversation_state(customer)
+
+
+async def save_conversation_state(session: AsyncSession, customer: Customer, state: ConversationState) -> None:
+    """Write the dirty keys if nobody saved since `state` was loaded; no-op when nothing changed.
+
+    Raises StaleConversationState otherwise. The row stays locked until the transaction ends.
+    """
+    if not state.dirty:
+        return
+    patch, removed = state.changes()
+    document = Customer.conversation_state.op("||")(literal(patch, JSONB))
+    if removed:
+        document = document.op("-")(literal(removed, ARRAY(Text)))
+    row = (
+        await session.execute(
+            update(Customer)
+            .where(Customer.id == customer.id, Customer.state_version == state.version)
+            .values(conversation_state=document, state_version=Customer.state_version + 1)
+            .returning(Customer.conversation_state, Customer.state_version)
+            .execution_options(synchronize_session=False)
+        )
+    ).first()
+    if row is None:
+        raise StaleConversationState(customer.id)
+    set_committed_value(customer, "conversation_state", row.conversation_state)
+    set_committed_value(customer, "state_version", row.state_version)
+    state.mark_saved(row.state_version)
+
+
+async def update_conversation_state(
+    session: AsyncSession,
+    customer: Customer,
+    *changes: Callable[[ConversationState], None],
+    state: ConversationState | None = None,
+) -> ConversationState:
+    """Apply `changes` and save them; after a lost race reload and apply them again (last writer wins)."""
+    state = state or load_conversation_state(customer)
+    for attempt in range(UPDATE_ATTEMPTS):
+        for change in changes:
+            change(state)
+        try:
+            await save_conversation_state(session, customer, state)
+            return state
+        except StaleConversationState:
+            if attempt == UPDATE_ATTEMPTS - 1:
+                raise
+            state = await reload_conversation_state(session, customer)
+    return state
@@ -1,27 +1,165 @@
-"""Customer lookup and get-or-create. Handlers call this; no DB in handlers."""
+"""Customer lookup and get-or-create. Handlers call this; no DB in handlers.
+
+Customers are identified per channel by an external id (Telegram user id, WhatsApp wa_id).
+resolve_customers maps any number of senders of one channel to Customer rows in at most two
+statements: one SELECT, and one INSERT ... ON CONFLICT DO NOTHING RETURNING for those that do not
+exist yet, so two workers creating the same customer never collide (the loser re-reads the
+winner's row).
+
+Per message the entrypoints only need the id: resolve_customer_id answers a sender in the
+identity cache ((channel, external id) → customer id; never ORM instances, which belong to one
+session) without touching the database, and the turn loads the row with get_customer only where
+it reads the conversation state or the name — a primary-key lookup, free when resolve_customers
+just put the row in the session. A new customer is cached only once its transaction commits.
+Customers are not deleted; an id cached for one that was fails get_customer with LookupError.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Mapping
 from uuid import UUID
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.database import async_session_maker, run_after_commit
 from app.models.db import Customer
+from app.models.db.business import ActiveChannelEnum
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM = ActiveChannelEnum.telegram.value
+WHATSAPP = ActiveChannelEnum.whatsapp.value
+
+_IDENTITY_COLUMNS = {TELEGRAM: Customer.telegram_id, WHATSAPP: Customer.whatsapp_number}
+
+IdentityKey = tuple[str, str]
+
+customer_ids: LRUCache[IdentityKey, UUID] = LRUCache(
+    settings.CUSTOMER_CACHE_MAX_SIZE, settings.CUSTOMER_CACHE_TTL_SECONDS
+)
 
+# Batch resolutions running in the background (prefetch_customers), by the identities they cover.
+_prefetching: dict[IdentityKey, asyncio.Task] = {}
 
-async def get_or_create_customer_by_telegram(
+
+async def resolve_customers(
     session: AsyncSession,
-    telegram_id: str,
-    full_name: str | None = None,
-) -> Customer:
-    """Get existing customer by telegram_id or create one. Returns the customer."""
-    result = await session.execute(
-        select(Customer).where(Customer.telegram_id == telegram_id).limit(1)
-    )
-    customer = result.scalars().first()
-    if customer is not None:
+    channel: str,
+    senders: Mapping[str, str | None],
+) -> dict[str, Customer]:
+    """Customer for each external id in `senders` (external id → display name), creating missing ones.
+
+    A name fills full_name only when the customer has none yet.
+    """
+    column = _IDENTITY_COLUMNS[channel]
+    customers: dict[str, Customer] = {}
+    created: dict[IdentityKey, UUID] = {}
+    for customer in await session.scalars(select(Customer).where(column.in_(senders))):
+        customers[getattr(customer, column.key)] = customer
+    new = [external_id for external_id in senders if external_id not in customers]
+    if new:
+        inserted = await session.scalars(
+            pg_insert(Customer)
+            .values([{column.key: external_id, "full_name": senders[external_id]} for external_id in new])
+            .on_conflict_do_nothing(index_elements=[column])
+            .returning(Customer)
+        )
+        for customer in inserted:
+            customers[getattr(customer, column.key)] = customer
+            created[(channel, getattr(customer, column.key))] = customer.id
+        lost = [external_id for external_id in new if external_id not in customers]
+        if lost:
+            # Created concurrently by another worker since the SELECT; its row is committed.
+            for customer in await session.scalars(select(Customer).where(column.in_(lost))):
+                customers[getattr(customer, column.key)] = customer
+    if created:
+        # New rows are cached once other sessions can see them.
+        run_after_commit(session, lambda: _remember(created))
+
+    for external_id, customer in customers.items():
+        if (channel, external_id) not in created:
+            customer_ids.set((channel, external_id), customer.id)
+        full_name = senders[external_id]
         if full_name and not customer.full_name:
             customer.full_name = full_name
-        return customer
-    customer = Customer(telegram_id=telegram_id, full_name=full_name)
-    session.add(customer)
-    await session.flush()
+    return customers
+
+
+def _remember(ids: dict[IdentityKey, UUID]) -> None:
+    for key, customer_id in ids.items():
+        customer_ids.set(key, customer_id)
+
+
+async def resolve_customer_id(
+    session: AsyncSession,
+    channel: str,
+    external_id: str,
+    full_name: str | None = None,
+) -> UUID:
+    """Id of the customer behind one sender, created if needed (waits for a prefetch already covering it).
+
+    A cached sender costs no query; its full_name is then not filled in, which happens on the
+    next resolution after the entry expires.
+    """
+    prefetch = _prefetching.get((channel, external_id))
+    if prefetch is not None:
+        await asyncio.wait([prefetch])
+    customer_id = customer_ids.get((channel, external_id))
+    if customer_id is not None:
+        return customer_id
+    return (await resolve_customers(session, channel, {external_id: full_name}))[external_id].id
+
+
+async def get_customer(session: AsyncSession, customer_id: UUID) -> Customer:
+    """The customer row by id (from the session's identity map when already loaded)."""
+    customer = await session.get(Customer, customer_id)
+    if customer is None:
+        raise LookupError(f"customer {customer_id} not found")
     return customer
+
+
+def prefetch_customers(channel: str, senders: Mapping[str, str | None]) -> None:
+    """Resolve several senders not in the identity cache in one background batch.
+
+    For webhook payloads that carry many senders: the per-message handlers then find their
+    customer id cached (resolve_customer_id waits for the batch) instead of each running the
+    SELECT/INSERT. Single unknown senders are left to their handler.
+    """
+    pending = {
+        external_id: name
+        for external_id, name in senders.items()
+        if (channel, external_id) not in customer_ids and (channel, external_id) not in _prefetching
+    }
+    if len(pending) < 2:
+        return
+    task = asyncio.create_task(_prefetch(channel, pending), name=f"prefetch-{channel}-customers")
+    keys = [(channel, external_id) for external_id in pending]
+    for key in keys:
+        _prefetching[key] = task
+
+    def done(_: asyncio.Task) -> None:
+        for key in keys:
+            if _prefetching.get(key) is task:
+                del _prefetching[key]
+
+    task.add_done_callback(done)
+
+
+async def _prefetch(channel: str, senders: dict[str, str | None]) -> None:
+    async with async_session_maker() as session:
+        try:
+            await resolve_customers(session, channel, senders)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            logger.exception("Prefetching %d %s customers failed", len(senders), channel)
+
+
+def customer_cache_metrics() -> dict[str, float | int]:
+    return {**customer_ids.metrics(), "prefetching": len(_prefetching)}
+
@@ -81,12 +81,13 @@ async def add_faqs_bulk(
     return created
 
 
-async def delete_faq(session: AsyncSession, faq_id: UUID) -> bool:
-    """Delete FAQ by id. Returns True if deleted."""
+async def delete_faq(session: AsyncSession, faq_id: UUID) -> UUID | None:
+    """Delete FAQ by id. Returns the owning business_id if deleted, else None."""
     result = await session.execute(select(FAQ).where(FAQ.id == faq_id).limit(1))
     faq = result.scalars().first()
     if not faq:
-        return False
+        return None
+    business_id = faq.business_id
     await session.delete(faq)
     await session.flush()
-    return True
+    return business_id
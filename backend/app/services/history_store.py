@@ -0,0 +1,128 @@
+"""Conversation history store: a fixed-size ring buffer of recent messages per (customer, business).
+
+The bot rebuilds the LLM context on every turn; a warm conversation is served from memory instead of
+re-reading conversation_history. Writes go through to the DB (conversation_service.append_turn) and
+reach the buffer only once the transaction commits; a miss cold-loads the newest messages from the DB.
+Memory is bounded twice: `capacity` messages per conversation, `max_conversations` conversations (LRU
+across idle customers). Entries expire after HISTORY_CACHE_TTL_SECONDS to bound staleness across workers.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.database import run_after_commit
+from app.models.db.conversation import MessageRoleEnum
+from app.services import conversation_service
+
+ConversationKey = tuple[UUID, UUID]
+StoredMessage = tuple[str, str, str]  # (role, content, at: conversation_service.message_stamp)
+
+
+class HistoryBackend(ABC):
+    """Where ring buffers live. Synchronous: called on the event loop and from after-commit hooks."""
+
+    @abstractmethod
+    def load(self, key: ConversationKey) -> list[StoredMessage] | None:
+        """Buffered messages, oldest first, or None on a miss."""
+
+    @abstractmethod
+    def store(self, key: ConversationKey, messages: list[StoredMessage]) -> None:
+        """Replace the buffer (cold load)."""
+
+    @abstractmethod
+    def append(self, key: ConversationKey, messages: list[StoredMessage]) -> None:
+        """Push onto an existing buffer; no-op on a miss (the next read cold-loads)."""
+
+    @abstractmethod
+    def discard(self, key: ConversationKey) -> None:
+        ...
+
+    @abstractmethod
+    def metrics(self) -> dict[str, float | int]:
+        ...
+
+
+class InMemoryHistoryBackend(HistoryBackend):
+    """Per-worker LRU of deques with maxlen=capacity."""
+
+    def __init__(self, capacity: int, max_conversations: int, ttl_seconds: float) -> None:
+        self.capacity = max(1, capacity)
+        self._buffers: LRUCache[ConversationKey, deque[StoredMessage]] = LRUCache(max_conversations, ttl_seconds)
+
+    def load(self, key: ConversationKey) -> list[StoredMessage] | None:
+        buffer = self._buffers.get(key)
+        return list(buffer) if buffer is not None else None
+
+    def store(self, key: ConversationKey, messages: list[StoredMessage]) -> None:
+        self._buffers.set(key, deque(messages, maxlen=self.capacity))
+
+    def append(self, key: ConversationKey, messages: list[StoredMessage]) -> None:
+        buffer = self._buffers.peek(key)
+        if buffer is not None:
+            buffer.extend(messages)
+
+    def discard(self, key: ConversationKey) -> None:
+        self._buffers.pop(key)
+
+    def metrics(self) -> dict[str, float | int]:
+        return {**self._buffers.metrics(), "capacity": self.capacity}
+
+
+class ConversationHistoryStore:
+    """Read-through, write-through history for the bot (same message dicts as get_recent_messages)."""
+
+    def __init__(self, backend: HistoryBackend, capacity: int = conversation_service.HISTORY_LIMIT) -> None:
+        self.backend = backend
+        self.capacity = capacity
+
+    async def recent(self, session: AsyncSession, customer_id: UUID, business_id: UUID) -> list[dict[str, str]]:
+        """Last `capacity` messages in chronological order, from the buffer or (on a miss) the DB."""
+        key = (customer_id, business_id)
+        messages = self.backend.load(key)
+        if messages is None:
+            history = await conversation_service.get_recent_messages(
+                session, customer_id, business_id, limit=self.capacity
+            )
+            messages = [(m["role"], m["content"], m["at"]) for m in history]
+            self.backend.store(key, messages)
+        return [{"role": role, "content": content, "at": at} for role, content, at in messages]
+
+    async def append_turn(
+        self,
+        session: AsyncSession,
+        customer_id: UUID,
+        business_id: UUID,
+        user_text: str,
+        assistant_text: str,
+    ) -> None:
+        """Persist the turn now; push it onto the buffer after commit (a rollback leaves the buffer untouched)."""
+        user_at, assistant_at = await conversation_service.append_turn(
+            session, customer_id, business_id, user_text, assistant_text
+        )
+        key = (customer_id, business_id)
+        turn = [
+            (MessageRoleEnum.user.value, user_text, conversation_service.message_stamp(user_at)),
+            (MessageRoleEnum.assistant.value, assistant_text, conversation_service.message_stamp(assistant_at)),
+        ]
+        run_after_commit(session, lambda: self.backend.append(key, turn))
+
+    def forget(self, customer_id: UUID, business_id: UUID) -> None:
+        self.backend.discard((customer_id, business_id))
+
+    def metrics(self) -> dict[str, float | int]:
+        return self.backend.metrics()
+
+
+history_store = ConversationHistoryStore(
+    InMemoryHistoryBackend(
+        capacity=conversation_service.HISTORY_LIMIT,
+        max_conversations=settings.HISTORY_CACHE_MAX_CONVERSATIONS,
+        ttl_seconds=settings.HISTORY_CACHE_TTL_SECONDS,
+    )
+)
@@ -1,100 +1,237 @@
-"""APScheduler reminder scheduling. Schedule 24h and 1h before booking; cancel on booking cancel."""
-from datetime import datetime, timedelta, time
-from uuid import UUID
+"""Booking reminders (24h and 1h before the booking), sent by a batched dispatcher.
 
+dispatch_due_reminders runs every REMINDER_DISPATCH_INTERVAL_SECONDS as a scheduler job (leader only).
+Each pass selects confirmed bookings with a reminder due in one indexed query (FOR UPDATE SKIP LOCKED,
+REMINDER_DISPATCH_BATCH_SIZE rows at a time), sends with bounded concurrency and records
+reminder_24h_sent_at / reminder_1h_sent_at in the same transaction, so nothing is held in memory per
+future booking and a reminder is sent once. Cancelling a booking needs no cleanup (only
+confirmed bookings are selected); rescheduling clears the sent-state.
+
+Telegram customers get the reminder through the business's own bot (Business.telegram_bot_token,
+falling back to TELEGRAM_BOT_TOKEN) from the shared pool in app.core.telegram_bots; the send queue
+applies that bot's per-bot and per-chat limits, shared with live conversation traffic. WhatsApp
+customers get it from the business's number (whatsapp_config) as an approved template
+(WHATSAPP_REMINDER_TEMPLATE_24H / _1H): a reminder is business-initiated and usually falls outside
+the 24h window in which free-form messages are allowed.
+
+Booking dates/times are compared with the server's local clock, as elsewhere in booking_service.
+"""
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+import httpx
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from telegram.error import BadRequest, Forbidden, TelegramError
+
+from app.channels.telegram import TelegramChannel
+from app.channels.whatsapp import WhatsAppAPIError, WhatsAppChannel
 from app.core.config import settings
+from app.core.database import async_session_maker
 from app.core.scheduler import scheduler
+from app.core.telegram_bots import get_bot
+from app.models.db import Booking, Business, Customer
+from app.models.db.booking import BookingStatusEnum
 from app.utils.message_templates import reminder_24h, reminder_1h
 
+logger = logging.getLogger(__name__)
+
+LEGACY_JOB_PREFIXES = ("reminder_24h_", "reminder_1h_")
+
+_stats = {"runs": 0, "sent": 0, "failed": 0, "undeliverable": 0}
+
+
+def _reminder_text(row: Any, which: str) -> str:
+    if which == "1h":
+        return reminder_1h(row.business_name)
+    return reminder_24h(
+        row.business_name,
+        row.booking_date.isoformat(),
+        row.booking_time.strftime("%H:%M"),
+        str(row.party_size or ""),
+        row.booking_reference,
+    )
+
+
+def _whatsapp_template(row: Any, which: str) -> tuple[str, list[str]]:
+    if which == "1h":
+        return settings.WHATSAPP_REMINDER_TEMPLATE_1H, [row.business_name]
+    return settings.WHATSAPP_REMINDER_TEMPLATE_24H, [
+        row.business_name,
+        row.booking_date.isoformat(),
+        row.booking_time.strftime("%H:%M"),
+        str(row.party_size or ""),
+        row.booking_reference,
+    ]
+
+
+def _reminder_send(row: Any, which: str) -> tuple[str, Callable[[], Awaitable[None]]] | None:
+    """(recipient, send) on the customer's channel; None when the business has no credentials for it."""
+    if row.telegram_id:
+        token = row.telegram_bot_token or settings.TELEGRAM_BOT_TOKEN
+        if not token:
+            return None
+        text = _reminder_text(row, which)
+        return row.telegram_id, lambda: TelegramChannel(get_bot(token)).send_message(row.telegram_id, text)
+    config = row.whatsapp_config or {}
+    phone_number_id = config.get("phone_number_id")
+    access_token = config.get("access_token") or settings.WHATSAPP_ACCESS_TOKEN
+    if not phone_number_id or not access_token:
+        return None
+    name, parameters = _whatsapp_template(row, which)
+    channel = WhatsAppChannel(phone_number_id, access_token)
+    return row.whatsapp_number, lambda: channel.send_template(
+        row.whatsapp_number, name, settings.WHATSAPP_TEMPLATE_LANGUAGE, parameters
+    )
+
+
+def _permanent(error: WhatsAppAPIError) -> bool:
+    """Rejected for good (bad number, template missing or paused, ...) rather than throttled or down."""
+    return 400 <= error.status_code < 500 and not error.rate_limited
+
 
-async def _send_reminder_24h(
-    recipient_id: str,
-    business_name: str,
-    date_str: str,
-    time_str: str,
-    size_str: str,
-    reference: str,
-) -> None:
-    from telegram import Bot
-    bot = Bot(token=settings.TELEGRAM_BOT_TOKEN)
-    text = reminder_24h(business_name, date_str, time_str, size_str, reference)
-    await bot.send_message(chat_id=int(recipient_id), text=text)
-
-
-async def _send_reminder_1h(recipient_id: str, business_name: str) -> None:
-    from telegram import Bot
-    bot = Bot(token=settings.TELEGRAM_BOT_TOKEN)
-    text = reminder_1h(business_name)
-    await bot.send_message(chat_id=int(recipient_id), text=text)
-
-
-def schedule_reminders(
-    booking_id: UUID,
-    booking_date: str,
-    booking_time: str,
-    business_name: str,
-    customer_recipient_id: str,
-    reference: str,
-    party_size: str,
-) -> tuple[str | None, str | None]:
-    """
-    Schedule 24h and 1h before booking. Return (reminder_24h_job_id, reminder_1h_job_id).
-    Uses AsyncIOScheduler; jobs run the async send functions.
-    """
-    try:
-        day = datetime.strptime(booking_date, "%Y-%m-%d").date()
-        parts = booking_time.replace(":", " ").split()
-        h = int(parts[0]) if len(parts) > 0 else 0
-        m = int(parts[1]) if len(parts) > 1 else 0
-        s = int(parts[2]) if len(parts) > 2 else 0
-        booking_dt = datetime.combine(day, time(h, m, s))
-    except (ValueError, TypeError):
-        return None, None
-
-    run_24h = booking_dt - timedelta(hours=24)
-    run_1h = booking_dt - timedelta(hours=1)
+async def _send(semaphore: asyncio.Semaphore, recipient: str, send: Callable[[], Awaitable[None]]) -> bool:
+    """Send one reminder. True when done with it (sent, or permanently undeliverable); False to retry later."""
+    async with semaphore:
+        try:
+            await send()
+        except WhatsAppAPIError as e:
+            if _permanent(e):
+                logger.warning("Reminder to %s undeliverable: %s", recipient, e)
+                _stats["undeliverable"] += 1
+                return True
+            logger.warning("Reminder to %s failed, will retry: %s", recipient, e)
+            _stats["failed"] += 1
+            return False
+        except (Forbidden, BadRequest, ValueError) as e:
+            logger.warning("Reminder to %s undeliverable: %s", recipient, e)
+            _stats["undeliverable"] += 1
+            return True
+        except (TelegramError, httpx.HTTPError) as e:
+            logger.warning("Reminder to %s failed, will retry: %s", recipient, e)
+            _stats["failed"] += 1
+            return False
+    _stats["sent"] += 1
+    return True
+
+
+async def _dispatch_batch(session: AsyncSession, limit: int) -> tuple[int, int]:
+    """Send one batch of due reminders and record them. Returns (rows selected, rows recorded)."""
     now = datetime.now()
-    date_str = booking_date
-    time_str = booking_time if len(booking_time) >= 5 else f"{h:02d}:{m:02d}"
-
-    job_id_24h = f"reminder_24h_{booking_id}"
-    job_id_1h = f"reminder_1h_{booking_id}"
-    rid_24h: str | None = None
-    rid_1h: str | None = None
-
-    if run_24h > now:
-        scheduler.add_job(
-            _send_reminder_24h,
-            "date",
-            run_date=run_24h,
-            id=job_id_24h,
-            args=[customer_recipient_id, business_name, date_str, time_str, party_size, reference],
-            replace_existing=True,
-        )
-        rid_24h = job_id_24h
-    if run_1h > now:
-        scheduler.add_job(
-            _send_reminder_1h,
-            "date",
-            run_date=run_1h,
-            id=job_id_1h,
-            args=[customer_recipient_id, business_name],
-            replace_existing=True,
+    starts_at = Booking.booking_date + Booking.booking_time
+    due_24h = and_(Booking.reminder_24h_sent_at.is_(None), starts_at <= now + timedelta(hours=24))
+    due_1h = and_(Booking.reminder_1h_sent_at.is_(None), starts_at <= now + timedelta(hours=1))
+    rows = (
+        await session.execute(
+            select(
+                Booking.id,
+                Booking.booking_date,
+                Booking.booking_time,
+                Booking.booking_reference,
+                Booking.party_size,
+                Booking.created_at,
+                Business.name.label("business_name"),
+                Business.telegram_bot_token,
+                Business.whatsapp_config,
+                Customer.telegram_id,
+                Customer.whatsapp_number,
+                due_1h.label("due_1h"),
+            )
+            .join(Business, Business.id == Booking.business_id)
+            .join(Customer, Customer.id == Booking.customer_id)
+            .where(
+                Booking.status == BookingStatusEnum.confirmed,
+                or_(Booking.reminder_24h_sent_at.is_(None), Booking.reminder_1h_sent_at.is_(None)),
+                Booking.booking_date.between(now.date(), (now + timedelta(hours=24)).date()),
+                starts_at > now,
+                or_(due_24h, due_1h),
+                or_(Customer.telegram_id.is_not(None), Customer.whatsapp_number.is_not(None)),
+            )
+            .order_by(starts_at)
+            .limit(limit)
+            .with_for_update(of=Booking, skip_locked=True)
         )
-        rid_1h = job_id_1h
+    ).all()
+    if not rows:
+        return 0, 0
 
-    return rid_24h, rid_1h
+    semaphore = asyncio.Semaphore(settings.REMINDER_SEND_CONCURRENCY)
+    sent_at = datetime.now().astimezone()
+    marks: list[dict] = []
+    sends: list[tuple[dict, Any]] = []
+    for row in rows:
+        start = datetime.combine(row.booking_date, row.booking_time)
+        if row.due_1h:
+            # The 1h reminder supersedes a 24h one that was never sent.
+            mark = {"id": row.id, "reminder_24h_sent_at": sent_at, "reminder_1h_sent_at": sent_at}
+            which = "1h"
+        elif row.created_at and row.created_at.astimezone().replace(tzinfo=None) > start - timedelta(hours=24):
+            # Booked less than 24h ahead: the confirmation covers it, no 24h reminder.
+            marks.append({"id": row.id, "reminder_24h_sent_at": sent_at})
+            continue
+        else:
+            mark = {"id": row.id, "reminder_24h_sent_at": sent_at}
+            which = "24h"
+        send = _reminder_send(row, which)
+        if send is None:
+            logger.warning(
+                "No credentials for business %r; dropping reminder for booking %s", row.business_name, row.id
+            )
+            _stats["undeliverable"] += 1
+            marks.append(mark)
+            continue
+        sends.append((mark, _send(semaphore, *send)))
+    results = await asyncio.gather(*(coro for _, coro in sends))
+    marks.extend(mark for (mark, _), done in zip(sends, results) if done)
+    if marks:
+        await session.execute(update(Booking), marks)
+    return len(rows), len(marks)
 
 
-def cancel_reminders(job_id_24h: str | None, job_id_1h: str | None) -> None:
-    """Remove scheduled jobs by id."""
-    if job_id_24h:
-        try:
-            scheduler.remove_job(job_id_24h)
-        except Exception:
-            pass
-    if job_id_1h:
-        try:
-            scheduler.remove_job(job_id_1h)
-        except Exception:
-            pass
+async def dispatch_due_reminders() -> None:
+    """Scheduler job: send every due reminder, batch by batch, each batch in its own transaction."""
+    _stats["runs"] += 1
+    batch = settings.REMINDER_DISPATCH_BATCH_SIZE
+    while True:
+        async with async_session_maker() as session:
+            selected, recorded = await _dispatch_batch(session, batch)
+            await session.commit()
+        # Stop on a short batch, or when nothing could be recorded (all failed; retry next run).
+        if selected < batch or not recorded:
+            break
+
+
+def remove_legacy_reminder_jobs() -> int:
+    """Drop per-booking reminder jobs left in the job store by the old scheduling. Returns the count."""
+    removed = 0
+    for job in scheduler.get_jobs():
+        if job.id.startswith(LEGACY_JOB_PREFIXES):
+            job.remove()
+            removed += 1
+    return removed
+
+
+def schedule_reminder_dispatch() -> None:
+    """Register the dispatcher job (replacing any previous definition in the job store)."""
+    scheduler.add_job(
+        dispatch_due_reminders,
+        "interval",
+        seconds=settings.REMINDER_DISPATCH_INTERVAL_SECONDS,
+        id="reminder_dispatch",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+
+async def on_scheduler_elected() -> None:
+    """Leader hook: clear legacy jobs (job store calls are synchronous, so off the event loop)."""
+    removed = await asyncio.to_thread(remove_legacy_reminder_jobs)
+    if removed:
+        logger.info("Removed %d legacy per-booking reminder job(s)", removed)
+
+
+def reminder_metrics() -> dict[str, int]:
+    return dict(_stats)
@@ -0,0 +1,186 @@
+"""Tenant snapshot cache: immutable business + services + faqs + staff bundle per business id.
+
+The bot reads the tenant on every update; a hot tenant is served from memory with zero DB round-trips.
+Entries expire after TENANT_CACHE_TTL_SECONDS (bounds staleness across workers) and are invalidated
+in-process by the businesses/services/faqs routes once their transaction commits.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.db import Business
+from app.models.db.business import ActiveChannelEnum, BusinessTypeEnum
+from app.utils.prompt_builder import business_content_hash
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceSnapshot:
+    id: UUID
+    name: str
+    description: str | None
+    duration_minutes: int
+    price: Decimal | None
+    capacity: int | None
+    is_active: bool
+    max_occupancy: int | None
+    bed_type: str | None
+    amenities: tuple[str, ...] | None
+    base_price_per_night: Decimal | None
+    room_count: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class FAQSnapshot:
+    id: UUID
+    question: str
+    answer: str
+    keywords: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class StaffSnapshot:
+    id: UUID
+    name: str
+    role: str | None
+    telegram_id: str | None
+    is_active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class BusinessSnapshot:
+    """Read-only view of a Business with the relationships the bot needs. Attribute names mirror the ORM model."""
+
+    id: UUID
+    name: str
+    type: BusinessTypeEnum
+    telegram_bot_token: str | None
+    telegram_group_id: str | None
+    working_hours: dict[str, list[str]]
+    slot_duration_minutes: int
+    timezone: str
+    location: str | None
+    phone: str | None
+    active_channel: ActiveChannelEnum
+    whatsapp_config: dict[str, Any] | None
+    is_active: bool
+    services: tuple[ServiceSnapshot, ...]
+    faqs: tuple[FAQSnapshot, ...]
+    staff: tuple[StaffSnapshot, ...]
+    version: int
+    content_hash: str
+
+
+def snapshot_from_business(business: Business, version: int = 0) -> BusinessSnapshot:
+    """Copy a fully loaded Business (services, faqs, staff eager-loaded) into an immutable snapshot."""
+    return BusinessSnapshot(
+        id=business.id,
+        name=business.name,
+        type=business.type,
+        telegram_bot_token=business.telegram_bot_token,
+        telegram_group_id=business.telegram_group_id,
+        working_hours=dict(business.working_hours or {}),
+        slot_duration_minutes=business.slot_duration_minutes or 30,
+        timezone=business.timezone,
+        location=business.location,
+        phone=business.phone,
+        active_channel=business.active_channel,
+        whatsapp_config=dict(business.whatsapp_config) if business.whatsapp_config else None,
+        is_active=business.is_active,
+        services=tuple(
+            ServiceSnapshot(
+                id=s.id,
+                name=s.name,
+                description=s.description,
+                duration_minutes=s.duration_minutes,
+                price=s.price,
+                capacity=s.capacity,
+                is_active=s.is_active,
+                max_occupancy=s.max_occupancy,
+                bed_type=s.bed_type,
+                amenities=tuple(s.amenities) if s.amenities else None,
+                base_price_per_night=s.base_price_per_night,
+                room_count=s.room_count,
+            )
+            for s in business.services
+        ),
+        faqs=tuple(
+            FAQSnapshot(id=f.id, question=f.question, answer=f.answer, keywords=tuple(f.keywords or ()))
+            for f in business.faqs
+        ),
+        staff=tuple(
+            StaffSnapshot(id=s.id, name=s.name, role=s.role, telegram_id=s.telegram_id, is_active=s.is_active)
+            for s in business.staff
+        ),
+        version=version,
+        # Hashed once per load so the prompt cache lookup on each message is O(1).
+        content_hash=business_content_hash(business),
+    )
+
+
+class TenantCache:
+    """LRU of BusinessSnapshot keyed by business id, guarded by invalidation stamps.
+
+    Every invalidation takes the next value of one counter and records it for its tenant; a load
+    carries the counter value read before it started (current_version) and is not stored if the
+    tenant was invalidated since, so a slow reader cannot put stale data back after a write.
+    Only the newest `max_size` invalidations are remembered: the stamp of the oldest one forgotten
+    becomes a floor that every tenant without a remembered stamp is treated as invalidated at,
+    which can only make a load be refetched, never let a stale one through.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self._cache: LRUCache[UUID, BusinessSnapshot] = LRUCache(max_size, ttl_seconds)
+        self._clock = 0
+        self._invalidated: OrderedDict[UUID, int] = OrderedDict()  # oldest stamp first
+        self._max_invalidated = max(1, max_size)
+        self._floor = 0
+
+    def _invalidated_at(self, business_id: UUID) -> int:
+        return self._invalidated.get(business_id, self._floor)
+
+    def get(self, business_id: UUID) -> BusinessSnapshot | None:
+        snapshot = self._cache.get(business_id)
+        if snapshot is not None and snapshot.version < self._invalidated_at(business_id):
+            self._cache.pop(business_id)
+            return None
+        return snapshot
+
+    def current_version(self, business_id: UUID) -> int:
+        """Stamp to load `business_id` under (the same for every tenant; the argument mirrors store)."""
+        return self._clock
+
+    def store(self, business: Business, version: int) -> BusinessSnapshot:
+        """Snapshot `business`; cache it only if no invalidation happened since `version` was read."""
+        snapshot = snapshot_from_business(business, version)
+        if version >= self._invalidated_at(business.id):
+            self._cache.set(business.id, snapshot)
+        return snapshot
+
+    def invalidate(self, business_id: UUID) -> None:
+        self._clock += 1
+        self._invalidated[business_id] = self._clock
+        self._invalidated.move_to_end(business_id)
+        while len(self._invalidated) > self._max_invalidated:
+            _, self._floor = self._invalidated.popitem(last=False)
+        self._cache.pop(business_id)
+
+    def clear(self) -> None:
+        self._clock += 1
+        self._floor = self._clock
+        self._invalidated.clear()
+        self._cache.clear()
+
+    def metrics(self) -> dict[str, float | int]:
+        return self._cache.metrics()
+
+
+tenant_cache = TenantCache(
+    max_size=settings.TENANT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TENANT_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,136 @@
+"""Token-budgeted LLM context: pack history newest-first into a budget, roll evicted turns into a summary.
+
+Token counts use a fast local approximation (no tokenizer dependency): one token per word or
+punctuation mark, plus one per further 4 characters of a long word, plus a fixed per-message overhead.
+It tracks BPE tokenizers closely enough for budgeting; /metrics reports the estimated prompt size.
+"""
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+# Key in Customer.conversation_state: {str(business_id): {"text": str, "through": "at" of newest summarised message}}
+HISTORY_SUMMARY_KEY = "history_summaries"
+
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_LINE_CHARS = 160
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_WS_RE = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of `text`."""
+    return sum(1 + (len(piece) - 1) // 4 for piece in _TOKEN_RE.findall(text))
+
+
+def message_tokens(message: dict[str, str]) -> int:
+    return MESSAGE_OVERHEAD_TOKENS + estimate_tokens(message["content"])
+
+
+@dataclass
+class ContextWindow:
+    """Messages to send (chronological, ending with the new user message) and the history that did not fit.
+
+    `messages` carry only role and content (what the provider accepts); `dropped` are the history
+    messages as given, with their "at" stamps.
+    """
+
+    messages: list[dict[str, str]]
+    dropped: list[dict[str, str]]
+    tokens: int
+
+
+def build_context(history: list[dict[str, str]], user_text: str, budget: int) -> ContextWindow:
+    """Keep the newest history messages whose tokens, with the new message, fit in `budget`.
+
+    `history` messages are {"role", "content", "at"} (conversation_service.get_recent_messages).
+
+    The new user message is always sent. Packing stops at the first message that does not fit so the
+    kept history stays contiguous.
+    """
+    new_message = {"role": "user", "content": user_text}
+    tokens = message_tokens(new_message)
+    start = len(history)
+    while start > 0:
+        cost = message_tokens(history[start - 1])
+        if tokens + cost > budget:
+            break
+        tokens += cost
+        start -= 1
+    kept = [{"role": m["role"], "content": m["content"]} for m in history[start:]]
+    return ContextWindow(messages=[*kept, new_message], dropped=history[:start], tokens=tokens)
+
+
+def update_rolling_summary(
+    previous: dict[str, str] | None,
+    dropped: list[dict[str, str]],
+    max_chars: int,
+) -> dict[str, str] | None:
+    """Fold newly evicted messages into the rolling summary (extractive: one clipped line per message).
+
+    Messages stamped at or before `previous["through"]` were summarised on an earlier turn and are
+    skipped, whatever their content. The summary keeps its newest `max_chars` characters. Returns
+    `previous` unchanged when nothing new was evicted.
+    """
+    if not dropped:
+        return previous
+    through = previous.get("through") if previous else None
+    fresh = [m for m in dropped if through is None or m["at"] > through]
+    if not fresh:
+        return previous
+    lines = [previous["text"]] if previous and previous.get("text") else []
+    for m in fresh:
+        content = _WS_RE.sub(" ", m["content"]).strip()
+        if len(content) > SUMMARY_LINE_CHARS:
+            content = content[: SUMMARY_LINE_CHARS - 1] + "…"
+        lines.append(f"{m['role']}: {content}")
+    text = "\n".join(lines)
+    if len(text) > max_chars:
+        text = text[-max_chars:]
+        text = text[text.find("\n") + 1 :] if "\n" in text else text
+    return {"text": text, "through": fresh[-1]["at"]}
+
+
+def with_history_summary(system_prompt: str, summary: dict[str, str] | None) -> str:
+    """Append the rolling summary of earlier turns to the system prompt."""
+    if not summary or not summary.get("text"):
+        return system_prompt
+    return f"{system_prompt}\nEARLIER IN THIS CONVERSATION (summary of older messages):\n{summary['text']}\n"
+
+
+@dataclass
+class ContextStats:
+    requests: int = 0
+    prompt_tokens_total: int = 0
+    prompt_tokens_max: int = 0
+    history_tokens_total: int = 0
+    messages_dropped: int = 0
+    recent: deque[int] = field(default_factory=lambda: deque(maxlen=100))  # last 100 requests
+
+
+_stats = ContextStats()
+
+
+def record_prompt_tokens(system_prompt: str, window: ContextWindow) -> int:
+    """Count one request's estimated prompt tokens (system prompt + messages). Returns the total."""
+    total = estimate_tokens(system_prompt) + window.tokens
+    _stats.requests += 1
+    _stats.prompt_tokens_total += total
+    _stats.prompt_tokens_max = max(_stats.prompt_tokens_max, total)
+    _stats.history_tokens_total += window.tokens
+    _stats.messages_dropped += len(window.dropped)
+    _stats.recent.append(total)
+    return total
+
+
+def context_metrics() -> dict[str, Any]:
+    n = _stats.requests
+    return {
+        "requests": n,
+        "prompt_tokens_avg": round(_stats.prompt_tokens_total / n, 1) if n else 0.0,
+        "prompt_tokens_max": _stats.prompt_tokens_max,
+        "prompt_tokens_recent_avg": round(sum(_stats.recent) / len(_stats.recent), 1) if _stats.recent else 0.0,
+        "history_tokens_avg": round(_stats.history_tokens_total / n, 1) if n else 0.0,
+        "messages_dropped": _stats.messages_dropped,
+    }
@@ -0,0 +1,212 @@
+"""Inventory-aware availability: concurrent consumption per service against its units.
+
+A service has `units` identical bookable things (Service.room_count: rooms of this type, tables of this
+kind; default 1), each taking at most `max_party` guests (Service.max_occupancy, else Service.capacity:
+both mean the size of ONE unit — "Table for 2" has capacity 2, a double room capacity = max_occupancy 2);
+a larger party takes several units. There is no cap on concurrent guests across units.
+
+Time-slot services (restaurants) count units per minute of a day; nightly services (hotels,
+hostels) count rooms per night. Counts are built once with a difference array + prefix sum and loaded
+into a max segment tree, so "peak use over [a, b)" is O(log n) for any range: a 90-minute sitting or a
+14-night stay in a 90-day horizon.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date, time
+from itertools import accumulate
+from typing import Any
+
+from app.utils.datetime_utils import MINUTES_PER_DAY, DayOccupancy, minute_of_day
+
+
+class MaxSegmentTree:
+    """Static range-max over non-negative ints (iterative, array-backed). Empty ranges return 0."""
+
+    __slots__ = ("_n", "_tree")
+
+    def __init__(self, values: Sequence[int]) -> None:
+        n = len(values)
+        tree = array("i", bytes(4 * 2 * max(n, 1)))
+        tree[n : 2 * n] = array("i", values)
+        for i in range(n - 1, 0, -1):
+            left, right = tree[2 * i], tree[2 * i + 1]
+            tree[i] = left if left > right else right
+        self._n = n
+        self._tree = tree
+
+    def max(self, lo: int, hi: int) -> int:
+        """max(values[lo:hi]), clipped to the tree bounds."""
+        tree = self._tree
+        lo = max(lo, 0) + self._n
+        hi = min(hi, self._n) + self._n
+        best = 0
+        while lo < hi:
+            if lo & 1:
+                if tree[lo] > best:
+                    best = tree[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                if tree[hi] > best:
+                    best = tree[hi]
+            lo >>= 1
+            hi >>= 1
+        return best
+
+
+def _counts(intervals: Iterable[tuple[int, int, int]], size: int) -> array:
+    """Per-index totals of (start, end, amount) intervals over [0, size)."""
+    diff = [0] * (size + 1)
+    for start, end, amount in intervals:
+        start, end = max(start, 0), min(end, size)
+        if end > start and amount:
+            diff[start] += amount
+            diff[end] -= amount
+    return array("i", accumulate(diff[:size]))
+
+
+@dataclass(frozen=True, slots=True)
+class Capacity:
+    units: int = 1
+    max_party: int | None = None
+
+    @property
+    def simple(self) -> bool:
+        """One unit: any overlap blocks (plain DayOccupancy semantics)."""
+        return self.units == 1
+
+    def units_for(self, party_size: int | None) -> int:
+        if self.max_party and party_size and party_size > self.max_party:
+            return math.ceil(party_size / self.max_party)
+        return 1
+
+    def admits(self, party_size: int | None) -> bool:
+        """Could this party be seated/housed at all on an empty day?"""
+        return self.units_for(party_size) <= self.units
+
+
+def service_capacity(service: Any | None) -> Capacity:
+    """Capacity of a Service (ORM object or snapshot); None → a single unit.
+
+    Limited by units only: `capacity` is the size of one unit (used when max_occupancy is unset),
+    not a cap on guests across units, so a 3-guest party in 2-guest rooms books 2 of the rooms.
+    """
+    if service is None:
+        return Capacity()
+    return Capacity(
+        units=max(1, getattr(service, "room_count", None) or 1),
+        max_party=getattr(service, "max_occupancy", None) or getattr(service, "capacity", None) or None,
+    )
+
+
+class SlotInventory:
+    """One service's use over one day, per minute: units (tables) in use."""
+
+    __slots__ = ("capacity", "_units", "_simple")
+
+    def __init__(self, capacity: Capacity, bookings: Iterable[tuple[time, int, int | None]] = ()) -> None:
+        """bookings: (start time, duration minutes, party size)."""
+        self.capacity = capacity
+        bookings = list(bookings)
+        self._simple: DayOccupancy | None = None
+        self._units: MaxSegmentTree | None = None
+        if capacity.simple:
+            self._simple = DayOccupancy((start, duration) for start, duration, _ in bookings)
+            return
+        self._units = MaxSegmentTree(
+            _counts(
+                (
+                    (
+                        minute_of_day(start),
+                        minute_of_day(start) + (1 if start.second else 0) + max(0, duration),
+                        capacity.units_for(party),
+                    )
+                    for start, duration, party in bookings
+                ),
+                MINUTES_PER_DAY,
+            )
+        )
+
+    def fits(self, start: time, duration_minutes: int, party_size: int | None = None) -> bool:
+        if not self.capacity.admits(party_size):
+            return False
+        if self._simple is not None:
+            return self._simple.is_free(start, duration_minutes)
+        s = minute_of_day(start)
+        e = min(MINUTES_PER_DAY, s + max(1, duration_minutes))
+        return self._units.max(s, e) + self.capacity.units_for(party_size) <= self.capacity.units
+
+    def free_slots(self, slots: Iterable[time], duration_minutes: int, party_size: int | None = None) -> list[time]:
+        if not self.capacity.admits(party_size):
+            return []
+        if self._simple is not None:
+            return self._simple.free_slots(slots, duration_minutes)
+        return [t for t in slots if self.fits(t, duration_minutes, party_size)]
+
+
+class NightInventory:
+    """One service's rooms in use per night over [first_night, first_night + nights)."""
+
+    __slots__ = ("capacity", "first_night", "nights", "_rooms")
+
+    def __init__(
+        self,
+        capacity: Capacity,
+        first_night: date,
+        nights: int,
+        stays: Iterable[tuple[date, date, int | None]] = (),
+    ) -> None:
+        """stays: (check-in date, check-out date, guests). A stay occupies the nights check-in … check-out - 1."""
+        self.capacity = capacity
+        self.first_night = first_night
+        self.nights = nights
+        self._rooms = MaxSegmentTree(
+            _counts(
+                (
+                    ((check_in - first_night).days, (check_out - first_night).days, capacity.units_for(guests))
+                    for check_in, check_out, guests in stays
+                ),
+                nights,
+            )
+        )
+
+    def rooms_left(self, check_in: date, nights: int = 1) -> int:
+        """Rooms free on every night of the stay."""
+        i = (check_in - self.first_night).days
+        return self.capacity.units - self._rooms.max(i, i + max(1, nights))
+
+    def fits(self, check_in: date, nights: int = 1, guests: int | None = None) -> bool:
+        if not self.capacity.admits(guests):
+            return False
+        return self.rooms_left(check_in, nights) >= self.capacity.units_for(guests)
+
+
+@dataclass(slots=True)
+class ServiceAvailability:
+    """A service's loaded inventory over a date range: nightly (hotels) or per-day slot inventories."""
+
+    capacity: Capacity
+    nightly: NightInventory | None = None
+    days: dict[date, SlotInventory] | None = None
+
+    def free_slots(
+        self,
+        day: date,
+        slots: list[time],
+        duration_minutes: int,
+        party_size: int | None = None,
+        nights: int = 1,
+    ) -> list[time]:
+        """The subset of `slots` on `day` that can take this party (for `nights` from `day`, if nightly)."""
+        if not slots:
+            return slots
+        if self.nightly is not None:
+            return slots if self.nightly.fits(day, nights, party_size) else []
+        inventory = (self.days or {}).get(day)
+        if inventory is None:
+            return slots if self.capacity.admits(party_size) else []
+        return inventory.free_slots(slots, duration_minutes, party_size)
@@ -44,6 +44,14 @@ def new_booking_notification(
     )
 
 
+def no_slots_for_date(booking_date: str, suggestions: list[dict]) -> str:
+    """suggestions: find_next_available results ({"date", "time", "label"})."""
+    if not suggestions:
+        return "No available slots for that date. Try another day?"
+    lines = "\n".join(f"- {s['date']} at {s['label']}" for s in suggestions)
+    return f"No available slots for {booking_date}. The next free times are:\n{lines}\n\nWould one of these work?"
+
+
 def support_request_notification(customer_name: str, last_message: str, customer_id: str) -> str:
     return (
         f"Support Request\n"
@@ -0,0 +1,47 @@
+"""Keyset (cursor) pagination.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and base64url'd so clients treat it
+as opaque. The next page is `WHERE (k1, k2, …) > (v1, v2, …)` (`<` when descending) under the same
+ORDER BY, which an index on the sort columns serves directly: page N costs the same as page 1,
+unlike OFFSET, which reads and discards every earlier row.
+"""
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy import ColumnElement, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if hasattr(v, "isoformat") else str(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[str], Any]]) -> list[Any]:
+    """Sort key from a cursor, each value converted by the matching parser. ValueError if malformed."""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(parsers):
+            raise ValueError
+        return [parse(value) for parse, value in zip(parsers, raw)]
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("Invalid cursor") from None
+
+
+def after(columns: Sequence[ColumnElement], values: Sequence[Any], descending: bool = False) -> ColumnElement[bool]:
+    """Row-value condition selecting rows past `values` in (columns) order."""
+    key = tuple_(*columns)
+    bound = tuple_(*values)
+    return key < bound if descending else key > bound
+
+
+def split_page(rows: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]) -> tuple[list[Any], str | None]:
+    """Rows fetched with LIMIT limit + 1 → (page, cursor for the next page or None on the last page)."""
+    page = list(rows[:limit])
+    if len(rows) <= limit:
+        return page, None
+    return page, encode_cursor(key(page[-1]))
@@ -1,6 +1,15 @@
 """Build AI system prompt from business data. No hardcoded strings for user-facing copy."""
+import hashlib
 from typing import Any
 
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.utils.context_builder import HISTORY_SUMMARY_KEY
+
+# Static tenant part of the prompt, keyed by business_content_hash. Value: (text before ctx, text after ctx).
+_prompt_cache: LRUCache[str, tuple[str, str]] = LRUCache(settings.PROMPT_CACHE_MAX_SIZE)
+_CTX_MARKER = "\x00BOOKING_CONTEXT\x00"
+
 
 def build_system_prompt(
     business_name: str,
@@ -145,6 +154,60 @@ def format_faqs_for_prompt(faqs: list[Any]) -> str:
 
 
 def booking_context_from_state(state: dict[str, Any] | None) -> str:
+    state = {k: v for k, v in (state or {}).items() if k != HISTORY_SUMMARY_KEY}
     if not state:
         return "None"
     return str(state)
+
+
+def business_content_hash(business: Any) -> str:
+    """Hash of every business field that feeds the system prompt. Works on ORM objects and snapshots."""
+    parts: list[Any] = [
+        business.name,
+        getattr(business.type, "value", business.type),
+        sorted((business.working_hours or {}).items()),
+        business.location,
+        business.phone,
+    ]
+    for s in business.services or ():
+        parts.append((
+            s.name, getattr(s, "description", None), getattr(s, "bed_type", None),
+            getattr(s, "max_occupancy", None), getattr(s, "base_price_per_night", None),
+            getattr(s, "price", None), getattr(s, "capacity", None),
+            tuple(getattr(s, "amenities", None) or ()), getattr(s, "room_count", None),
+        ))
+    for st in business.staff or ():
+        parts.append((st.name, getattr(st, "role", None)))
+    for f in business.faqs or ():
+        parts.append((getattr(f, "question", ""), getattr(f, "answer", "")))
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def build_tenant_system_prompt(business: Any, booking_context: str) -> str:
+    """System prompt for `business` with the per-customer booking context spliced in.
+
+    The tenant part (services, staff, FAQs) is rendered once per content hash and reused; snapshots
+    from tenant_cache carry a precomputed `content_hash` so a cache hit does no per-message formatting.
+    """
+    key = getattr(business, "content_hash", None) or business_content_hash(business)
+    template = _prompt_cache.get(key)
+    if template is None:
+        rendered = build_system_prompt(
+            business_name=business.name,
+            business_type=getattr(business.type, "value", business.type),
+            working_hours=business.working_hours,
+            location=business.location,
+            phone=business.phone,
+            services_text=format_services_for_prompt(business.services),
+            staff_text=format_staff_for_prompt(business.staff),
+            faq_text=format_faqs_for_prompt(business.faqs),
+            booking_context=_CTX_MARKER,
+        )
+        before, _, after = rendered.partition(_CTX_MARKER)
+        template = (before, after)
+        _prompt_cache.set(key, template)
+    return f"{template[0]}{booking_context}{template[1]}"
+
+
+def prompt_cache_metrics() -> dict[str, float | int]:
+    return _prompt_cache.metrics()
@@ -0,0 +1,32 @@
+"""Add availability_versions (per business/day counters for the availability cache).
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-17
+
+booking_service bumps a row in the same transaction as every booking create/cancel/reschedule;
+every worker compares these versions before serving cached availability for a day.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c5d6e7f8a9b0"
+down_revision = "b4c5d6e7f8a9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "availability_versions",
+        sa.Column("business_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("business_id", "day"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("availability_versions")
@@ -0,0 +1,52 @@
+"""Add indexes for keyset-paginated booking lists.
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-17
+
+- bookings (business_id, created_at, id): GET /api/businesses/{id}/bookings (newest first, cursor on created_at, id)
+- bookings (business_id, booking_date, booking_time, id): GET /api/bookings (cursor on booking_date, booking_time, id)
+
+Built CONCURRENTLY so applying on a live Neon database does not lock writes.
+"""
+from alembic import op
+
+
+revision = "e7f8a9b0c1d2"
+down_revision = "d6e7f8a9b0c1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_bookings_business_created",
+            "bookings",
+            ["business_id", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_bookings_business_date_time",
+            "bookings",
+            ["business_id", "booking_date", "booking_time", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_bookings_business_date_time",
+            table_name="bookings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_bookings_business_created",
+            table_name="bookings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
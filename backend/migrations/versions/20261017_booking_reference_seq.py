@@ -0,0 +1,25 @@
+"""Add booking_reference_seq for collision-free booking references.
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-17
+
+booking_service draws one value per booking and scrambles it into the 6-character reference code,
+replacing the random 4-character suffix that could collide on bookings.booking_reference.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d6e7f8a9b0c1"
+down_revision = "c5d6e7f8a9b0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence("booking_reference_seq", start=1, maxvalue=36**6 - 1)))
+
+
+def downgrade() -> None:
+    op.execute(sa.schema.DropSequence(sa.Sequence("booking_reference_seq")))
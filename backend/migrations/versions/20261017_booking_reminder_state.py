@@ -0,0 +1,61 @@
+"""Add reminder sent-state to bookings for the batched reminder dispatcher.
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-17
+
+reminder_service.dispatch_due_reminders replaces the two APScheduler jobs per booking: every minute it
+selects confirmed bookings with a reminder due (partial index ix_bookings_reminders_due) and records
+reminder_24h_sent_at / reminder_1h_sent_at. Reminders already fired by the old per-booking jobs are
+backfilled as sent so they are not repeated.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "f8a9b0c1d2e3"
+down_revision = "e7f8a9b0c1d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("bookings", sa.Column("reminder_24h_sent_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("bookings", sa.Column("reminder_1h_sent_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        """
+        UPDATE bookings SET reminder_24h_sent_at = now()
+        WHERE reminder_24h_job_id IS NOT NULL
+          AND booking_date + booking_time <= localtimestamp + interval '24 hours'
+        """
+    )
+    op.execute(
+        """
+        UPDATE bookings SET reminder_1h_sent_at = now()
+        WHERE reminder_1h_job_id IS NOT NULL
+          AND booking_date + booking_time <= localtimestamp + interval '1 hour'
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_bookings_reminders_due",
+            "bookings",
+            ["booking_date", "booking_time"],
+            postgresql_where=sa.text(
+                "status = 'confirmed' AND (reminder_24h_sent_at IS NULL OR reminder_1h_sent_at IS NULL)"
+            ),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_bookings_reminders_due",
+            table_name="bookings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("bookings", "reminder_1h_sent_at")
+    op.drop_column("bookings", "reminder_24h_sent_at")
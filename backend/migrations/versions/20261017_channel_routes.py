@@ -0,0 +1,52 @@
+"""Add channel_routes (webhook routing table: WhatsApp phone_number_id / Telegram bot id → business).
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-17
+
+Workers load the whole table into an in-process map and resolve incoming webhooks without a query;
+business create/update rewrites the business's rows. Backfilled from active businesses; a number or
+bot claimed by two businesses keeps the first one found.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a9b0c1d2e3f4"
+down_revision = "f8a9b0c1d2e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "channel_routes",
+        sa.Column("channel", sa.String(length=16), nullable=False),
+        sa.Column("address", sa.String(length=128), nullable=False),
+        sa.Column("business_id", sa.UUID(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["business_id"], ["businesses.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("channel", "address"),
+    )
+    op.create_index("ix_channel_routes_business_id", "channel_routes", ["business_id"])
+    op.execute(
+        """
+        INSERT INTO channel_routes (channel, address, business_id)
+        SELECT 'whatsapp', whatsapp_config->>'phone_number_id', id FROM businesses
+        WHERE is_active AND coalesce(whatsapp_config->>'phone_number_id', '') <> ''
+        ON CONFLICT DO NOTHING
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO channel_routes (channel, address, business_id)
+        SELECT 'telegram', split_part(telegram_bot_token, ':', 1), id FROM businesses
+        WHERE is_active AND telegram_bot_token LIKE '%:%'
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_channel_routes_business_id", table_name="channel_routes")
+    op.drop_table("channel_routes")
@@ -0,0 +1,49 @@
+"""customers.conversation_state: JSON → JSONB, add state_version (optimistic concurrency).
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-17
+
+JSONB lets a save patch only the keys that changed (`conversation_state || patch - removed`) instead
+of rewriting the document from the client. The type change rewrites the customers table under an
+ACCESS EXCLUSIVE lock; run it in a quiet window. Empty pending_booking objects (what "cleared" used
+to look like) are dropped on the way; documents are stamped with the schema version on their next save.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "b0c1d2e3f4a5"
+down_revision = "a9b0c1d2e3f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "customers",
+        "conversation_state",
+        type_=postgresql.JSONB(),
+        postgresql_using="conversation_state::jsonb",
+    )
+    op.add_column(
+        "customers",
+        sa.Column("state_version", sa.Integer(), server_default=sa.text("0"), nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE customers SET conversation_state = conversation_state - 'pending_booking'
+        WHERE conversation_state->'pending_booking' = '{}'::jsonb
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("customers", "state_version")
+    op.alter_column(
+        "customers",
+        "conversation_state",
+        type_=postgresql.JSON(),
+        postgresql_using="conversation_state::json",
+    )
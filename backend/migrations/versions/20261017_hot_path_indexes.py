@@ -0,0 +1,94 @@
+"""Add composite/partial indexes for the bot hot paths.
+
+Revision ID: b4c5d6e7f8a9
+Revises: a2b3c4d5e6f7
+Create Date: 2026-10-17
+
+Each index matches one query shape:
+- conversation_history (customer_id, business_id, created_at): conversation_service.get_recent_messages / trim_to_limit
+- bookings (business_id, booking_date) WHERE status = 'confirmed': booking_service.get_available_slots / create_booking
+- bookings (customer_id, business_id, booking_date, booking_time) WHERE status = 'confirmed': get_bookings_for_customer
+- support_sessions (customer_id, business_id) WHERE is_active: support_service.get_active_support_session
+- faqs (business_id, question): faq_service.get_faqs_for_business and the FAQ list route
+
+Built CONCURRENTLY so applying on a live Neon database does not lock writes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b4c5d6e7f8a9"
+down_revision = "a2b3c4d5e6f7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_conversation_history_customer_business_created",
+            "conversation_history",
+            ["customer_id", "business_id", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_bookings_business_date_confirmed",
+            "bookings",
+            ["business_id", "booking_date"],
+            postgresql_where=sa.text("status = 'confirmed'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_bookings_customer_business_date_confirmed",
+            "bookings",
+            ["customer_id", "business_id", "booking_date", "booking_time"],
+            postgresql_where=sa.text("status = 'confirmed'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_support_sessions_customer_business_active",
+            "support_sessions",
+            ["customer_id", "business_id"],
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_faqs_business_question",
+            "faqs",
+            ["business_id", "question"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_faqs_business_question", table_name="faqs", postgresql_concurrently=True, if_exists=True)
+        op.drop_index(
+            "ix_support_sessions_customer_business_active",
+            table_name="support_sessions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_bookings_customer_business_date_confirmed",
+            table_name="bookings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_bookings_business_date_confirmed",
+            table_name="bookings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_conversation_history_customer_business_created",
+            table_name="conversation_history",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: free slots for one day, per-slot slot_taken loop vs DayOccupancy sweep.
+
+Usage (from backend/):
+    python -m scripts.bench_availability [--bookings 40] [--slot-minutes 5] [--duration 60] [--iterations 50]
+
+No database needed: bookings are random (time, duration) pairs over a 24h day. The default leaves
+about a tenth of the slots free (a busy day); a few hundred bookings fill every slot, which only
+measures the fully booked case.
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import date, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.datetime_utils import DayOccupancy, generate_slots_for_day, slot_taken
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=40)
+    parser.add_argument("--slot-minutes", type=int, default=5)
+    parser.add_argument("--duration", type=int, default=60, help="duration of the requested service")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    day = date(2026, 3, 1)
+    slots = generate_slots_for_day(day, "00:00", "23:59", args.slot_minutes)
+
+    def random_bookings(count: int) -> list[tuple[time, int]]:
+        return [
+            (time(rng.randrange(24), rng.randrange(0, 60, 5)), rng.choice((15, 30, 45, 60, 90)))
+            for _ in range(count)
+        ]
+
+    # Same answers as slot_taken on sparse and dense days before timing anything.
+    for count in (0, 1, 5, 20, 50, 200):
+        sample = random_bookings(count)
+        listed = [{"booking_time": t, "duration_minutes": d} for t, d in sample]
+        expected = [t for t in slots if not slot_taken(t, args.duration, listed)]
+        assert DayOccupancy(sample).free_slots(slots, args.duration) == expected, f"mismatch with {count} bookings"
+
+    bookings = random_bookings(args.bookings)
+    booked_list = [{"booking_time": t, "duration_minutes": d} for t, d in bookings]
+
+    def loop() -> list[time]:
+        return [t for t in slots if not slot_taken(t, args.duration, booked_list)]
+
+    def sweep() -> list[time]:
+        return DayOccupancy(bookings).free_slots(slots, args.duration)
+
+    assert loop() == sweep(), "DayOccupancy disagrees with slot_taken"
+
+    n = args.iterations
+    before = min(timeit.repeat(loop, number=n, repeat=3)) / n
+    after = min(timeit.repeat(sweep, number=n, repeat=3)) / n
+    print(f"{len(slots)} slots ({args.slot_minutes} min), {args.bookings} bookings, {len(sweep())} free")
+    print(f"slot_taken loop: {before * 1e3:9.2f} ms/day")
+    print(f"DayOccupancy:    {after * 1e3:9.2f} ms/day")
+    print(f"speedup:         {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
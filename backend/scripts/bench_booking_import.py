@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark bulk booking import (COPY) and streaming export.
+
+Usage (from backend/, against a local/dev Postgres — never production):
+    NEON_DATABASE_URL=postgresql://localhost/frontdesk_dev python -m scripts.bench_booking_import [--rows 100000]
+
+Creates a throwaway restaurant with two services, builds a CSV of `--rows` historical bookings spread
+over 2,000 guest phone numbers, imports it through booking_transfer.import_bookings (as
+POST /bookings/import does), re-imports it to check that existing references are skipped, streams
+the CSV export back and counts its lines, then deletes everything it created.
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.chdir(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import delete, select
+
+from app.core.database import async_session_maker as async_session
+from app.models.db import AvailabilityVersion, Booking, Business, Customer, Service
+from app.models.db.business import BusinessTypeEnum
+from app.services import booking_transfer
+
+
+def _csv(rows: int) -> bytes:
+    start = date.today() - timedelta(days=730)
+    out = io.StringIO()
+    out.write("booking_reference,service,booking_date,booking_time,guest_name,guest_phone,party_size,total_price\n")
+    for i in range(rows):
+        day = start + timedelta(days=i % 900)
+        out.write(
+            f"BENCH-{i},{'Table' if i % 3 else 'Terrace'},{day.isoformat()},{12 + i % 10}:{'30' if i % 2 else '00'},"
+            f"Guest {i % 2000},+23320{i % 2000:07d},{1 + i % 6},{50 + i % 200}.00\n"
+        )
+    return out.getvalue().encode()
+
+
+async def main(rows: int) -> int:
+    async with async_session() as session:
+        business = Business(
+            name="Import benchmark",
+            type=BusinessTypeEnum.restaurant,
+            working_hours={},
+            slot_duration_minutes=30,
+        )
+        session.add(business)
+        await session.flush()
+        session.add_all(
+            [
+                Service(business_id=business.id, name="Table", duration_minutes=90),
+                Service(business_id=business.id, name="Terrace", duration_minutes=90),
+            ]
+        )
+        await session.commit()
+
+    data = _csv(rows)
+    print(f"CSV: {rows} rows, {len(data) / 1e6:.1f} MB")
+    try:
+        for attempt in ("import", "re-import"):
+            async with async_session() as session:
+                started = time.perf_counter()
+                result = await booking_transfer.import_bookings(session, business, io.BytesIO(data), "csv")
+                await session.commit()
+                elapsed = time.perf_counter() - started
+            print(
+                f"{attempt:<10} {elapsed:6.2f}s  inserted={result.inserted} skipped={result.skipped} "
+                f"customers_created={result.customers_created} errors={result.errors[:3]}"
+            )
+            if result.errors:
+                return 1
+
+        started = time.perf_counter()
+        lines = size = 0
+        async for chunk in booking_transfer.export_bookings(business.id, "csv"):
+            lines += chunk.count(b"\n")
+            size += len(chunk)
+        print(f"export     {time.perf_counter() - started:6.2f}s  {lines - 1} rows, {size / 1e6:.1f} MB")
+        ok = lines - 1 == rows
+    finally:
+        async with async_session() as session:
+            customer_ids = select(Booking.customer_id).where(Booking.business_id == business.id).distinct()
+            customer_ids = list(await session.scalars(customer_ids))
+            await session.execute(delete(Booking).where(Booking.business_id == business.id))
+            await session.execute(delete(Customer).where(Customer.id.in_(customer_ids)))
+            await session.execute(delete(AvailabilityVersion).where(AvailabilityVersion.business_id == business.id))
+            await session.execute(delete(Service).where(Service.business_id == business.id))
+            await session.execute(delete(Business).where(Business.id == business.id))
+            await session.commit()
+
+    print("OK" if ok else "FAIL: export row count does not match the import")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.rows)))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Webhook → tenant resolution with 10k tenants: whatsapp_config scan vs channel_routes vs in-memory index.
+
+Usage (from backend/):
+    python -m scripts.bench_channel_routing [--tenants 10000] [--lookups 100000]
+    NEON_DATABASE_URL=postgresql://localhost/frontdesk_dev python -m scripts.bench_channel_routing --database
+
+In-memory (default, no database): a linear scan over every tenant's whatsapp_config (what resolving
+from the JSON column amounts to) against ChannelRoutingIndex.lookup, plus the cost of a full index
+reload from `--tenants` rows.
+
+--database (local/dev Postgres — never production): inserts `--tenants` businesses and their
+channel_routes rows inside one transaction, times `--queries` lookups of each kind
+(whatsapp_config->>'phone_number_id' = $1, channel_routes primary key, in-memory) and the index
+reload, then rolls everything back.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("NEON_DATABASE_URL", "postgresql://localhost/unused")
+
+from app.services.channel_routing import TELEGRAM, WHATSAPP, ChannelRoutingIndex
+
+
+def _tenants(count: int) -> list[tuple[uuid.UUID, str, str]]:
+    """(business id, phone_number_id, bot id) per tenant."""
+    return [(uuid.uuid4(), str(100_000_000_000_000 + i), str(6_000_000_000 + i)) for i in range(count)]
+
+
+def bench_memory(tenants: list[tuple[uuid.UUID, str, str]], lookups: int, rng: random.Random) -> None:
+    configs = [(business_id, {"phone_number_id": number, "access_token": "x"}) for business_id, number, _ in tenants]
+    rows = [(WHATSAPP, number, business_id) for business_id, number, _ in tenants]
+    rows += [(TELEGRAM, bot_id, business_id) for business_id, _, bot_id in tenants]
+    index = ChannelRoutingIndex(refresh_seconds=30)
+    reload_s = min(timeit.repeat(lambda: index.load(rows), number=1, repeat=5))
+    probes = [rng.choice(tenants)[1] for _ in range(lookups)]
+
+    def scan(number: str) -> uuid.UUID | None:
+        for business_id, config in configs:
+            if config.get("phone_number_id") == number:
+                return business_id
+        return None
+
+    expected = {number: business_id for business_id, number, _ in tenants}
+    assert all(index.lookup(WHATSAPP, n) == expected[n] == scan(n) for n in probes[:200])
+
+    scan_probes = probes[: max(1, lookups // 100)]
+    scan_s = timeit.timeit(lambda: [scan(n) for n in scan_probes], number=1) / len(scan_probes)
+    lookup_s = timeit.timeit(lambda: [index.lookup(WHATSAPP, n) for n in probes], number=1) / len(probes)
+    print(f"{len(tenants)} tenants, {len(rows)} routes")
+    print(f"  whatsapp_config scan : {scan_s * 1e6:10.2f} µs/lookup")
+    print(f"  in-memory index      : {lookup_s * 1e6:10.3f} µs/lookup ({scan_s / lookup_s:,.0f}x faster)")
+    print(f"  full index reload    : {reload_s * 1e3:10.2f} ms ({len(rows)} rows)")
+
+
+async def bench_database(tenants: list[tuple[uuid.UUID, str, str]], queries: int, rng: random.Random) -> None:
+    from sqlalchemy import insert, select, text
+
+    from app.core.database import async_session_maker
+    from app.models.db import Business, ChannelRoute
+    from app.models.db.business import BusinessTypeEnum
+
+    hours = {d: ["09:00", "22:00"] for d in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")}
+    async with async_session_maker() as session:
+        try:
+            await session.execute(
+                insert(Business),
+                [
+                    {
+                        "id": business_id,
+                        "name": f"Routing bench {i}",
+                        "type": BusinessTypeEnum.restaurant,
+                        "working_hours": hours,
+                        "whatsapp_config": {"phone_number_id": number, "access_token": "x"},
+                        "telegram_bot_token": f"{bot_id}:bench",
+                        "is_active": True,
+                    }
+                    for i, (business_id, number, bot_id) in enumerate(tenants)
+                ],
+            )
+            await session.execute(
+                insert(ChannelRoute),
+                [{"channel": WHATSAPP, "address": n, "business_id": b} for b, n, _ in tenants]
+                + [{"channel": TELEGRAM, "address": t, "business_id": b} for b, _, t in tenants],
+            )
+            await session.execute(text("ANALYZE businesses"))
+            await session.execute(text("ANALYZE channel_routes"))
+
+            probes = [rng.choice(tenants)[1] for _ in range(queries)]
+            phone_number_id = Business.whatsapp_config["phone_number_id"].as_string()
+            started = time.perf_counter()
+            for number in probes:
+                await session.scalar(select(Business.id).where(phone_number_id == number))
+            config_s = (time.perf_counter() - started) / queries
+
+            started = time.perf_counter()
+            for number in probes:
+                await session.scalar(
+                    select(ChannelRoute.business_id).where(
+                        ChannelRoute.channel == WHATSAPP, ChannelRoute.address == number
+                    )
+                )
+            table_s = (time.perf_counter() - started) / queries
+
+            index = ChannelRoutingIndex(refresh_seconds=30)
+            started = time.perf_counter()
+            await index.refresh(session, force=True)
+            reload_s = time.perf_counter() - started
+            started = time.perf_counter()
+            changed = await index.refresh(session)
+            stamp_s = time.perf_counter() - started
+            assert not changed
+            started = time.perf_counter()
+            for number in probes:
+                index.lookup(WHATSAPP, number)
+            memory_s = (time.perf_counter() - started) / queries
+        finally:
+            await session.rollback()
+
+    print(f"Postgres, {len(tenants)} tenants ({queries} lookups each, round-trip included)")
+    print(f"  whatsapp_config->>'phone_number_id' : {config_s * 1e3:8.3f} ms/lookup")
+    print(f"  channel_routes primary key          : {table_s * 1e3:8.3f} ms/lookup")
+    print(f"  in-memory index                     : {memory_s * 1e3:8.5f} ms/lookup")
+    print(
+        f"  index reload ({index.metrics()['routes']} routes): {reload_s * 1e3:.1f} ms; "
+        f"unchanged-stamp check: {stamp_s * 1e3:.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=100_000, help="in-memory lookups")
+    parser.add_argument("--queries", type=int, default=500, help="lookups per kind with --database")
+    parser.add_argument("--database", action="store_true")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tenants = _tenants(args.tenants)
+    bench_memory(tenants, args.lookups, rng)
+    if args.database:
+        asyncio.run(bench_database(tenants, args.queries, rng))
+
+
+if __name__ == "__main__":
+    main()
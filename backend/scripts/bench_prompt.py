@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-message system prompt build cost, uncached vs tenant prompt cache.
+
+Usage (from backend/):
+    python -m scripts.bench_prompt [--rooms 50] [--faqs 300] [--iterations 2000]
+
+No database needed: the hotel is built in memory with the same attributes the ORM/snapshot exposes.
+"""
+import argparse
+import os
+import sys
+import timeit
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.prompt_builder import (
+    booking_context_from_state,
+    build_system_prompt,
+    build_tenant_system_prompt,
+    business_content_hash,
+    format_faqs_for_prompt,
+    format_services_for_prompt,
+    format_staff_for_prompt,
+)
+
+
+def make_hotel(rooms: int, faqs: int) -> SimpleNamespace:
+    services = [
+        SimpleNamespace(
+            name=f"Room type {i}",
+            description=f"Comfortable room type {i} with a work desk, flat-screen TV and city views.",
+            bed_type="King" if i % 2 else "Queen",
+            max_occupancy=2 + i % 3,
+            base_price_per_night=Decimal("450.00") + i * 25,
+            price=None,
+            capacity=2 + i % 3,
+            amenities=["WiFi", "TV", "Air Conditioning", "Mini Bar", "Safe", "Room Service"],
+            room_count=10 + i % 20,
+        )
+        for i in range(rooms)
+    ]
+    faq_items = [
+        SimpleNamespace(
+            question=f"Question {i}: do you offer airport pickup, late checkout or breakfast options?",
+            answer=f"Answer {i}: yes — please let the front desk know at least 24 hours in advance.",
+        )
+        for i in range(faqs)
+    ]
+    staff = [SimpleNamespace(name=f"Staff {i}", role="Front desk") for i in range(10)]
+    hotel = SimpleNamespace(
+        name="Benchmark Grand Hotel",
+        type=SimpleNamespace(value="hotel"),
+        working_hours={k: ["00:00", "23:59"] for k in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")},
+        location="Airport Residential Area, Accra",
+        phone="+233 30 000 0000",
+        services=services,
+        faqs=faq_items,
+        staff=staff,
+    )
+    hotel.content_hash = business_content_hash(hotel)
+    return hotel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--faqs", type=int, default=300)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    hotel = make_hotel(args.rooms, args.faqs)
+    state = {"pending_booking": {"service_id": "x", "booking_date": "2026-03-01", "party_size": 2}}
+
+    def uncached() -> str:
+        return build_system_prompt(
+            business_name=hotel.name,
+            business_type=hotel.type.value,
+            working_hours=hotel.working_hours,
+            location=hotel.location,
+            phone=hotel.phone,
+            services_text=format_services_for_prompt(hotel.services),
+            staff_text=format_staff_for_prompt(hotel.staff),
+            faq_text=format_faqs_for_prompt(hotel.faqs),
+            booking_context=booking_context_from_state(state),
+        )
+
+    def cached() -> str:
+        return build_tenant_system_prompt(hotel, booking_context_from_state(state))
+
+    assert uncached() == cached(), "cached prompt differs from uncached prompt"
+
+    n = args.iterations
+    before = min(timeit.repeat(uncached, number=n, repeat=3)) / n
+    after = min(timeit.repeat(cached, number=n, repeat=3)) / n
+    print(f"hotel: {args.rooms} room types, {args.faqs} FAQs, prompt {len(cached())} chars")
+    print(f"uncached build:  {before * 1e6:9.1f} us/message")
+    print(f"cached build:    {after * 1e6:9.1f} us/message")
+    print(f"speedup:         {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
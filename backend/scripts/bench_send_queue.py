@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Simulated broadcast burst: direct API calls vs SendQueue, against a fake API enforcing flood limits.
+
+Usage (from backend/):
+    python -m scripts.bench_send_queue [--messages 300] [--chats 100] [--bot-rate 30] [--chat-rate 1]
+
+No network needed: the fake API answers "429, retry after 1s" to any call that would exceed
+`--bot-rate` calls in the last second for the bot, or more than one call per 1/`--chat-rate` seconds
+for a chat. Reports rejected calls, retries, wall time and queue wait.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import defaultdict, deque
+from functools import partial
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.send_queue import SendQueue
+
+
+class FloodLimited(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class FakeAPI:
+    def __init__(self, bot_rate: float, chat_rate: float) -> None:
+        self.bot_rate = bot_rate
+        self.chat_interval = 1 / chat_rate
+        self.recent: deque[float] = deque()
+        self.last_in_chat: dict[int, float] = defaultdict(lambda: float("-inf"))
+        self.delivered = 0
+        self.rejected = 0
+
+    async def send(self, chat: int) -> None:
+        await asyncio.sleep(0.005)
+        now = time.monotonic()
+        while self.recent and now - self.recent[0] > 1:
+            self.recent.popleft()
+        # A little slack below the nominal interval, as the real API allows short bursts.
+        if len(self.recent) >= self.bot_rate or now - self.last_in_chat[chat] < self.chat_interval * 0.5:
+            self.rejected += 1
+            raise FloodLimited(1.0)
+        self.recent.append(now)
+        self.last_in_chat[chat] = now
+        self.delivered += 1
+
+
+async def run_direct(api: FakeAPI, chats: list[int]) -> None:
+    async def one(chat: int) -> None:
+        try:
+            await api.send(chat)
+        except FloodLimited:
+            pass
+
+    await asyncio.gather(*(one(c) for c in chats))
+
+
+async def run_queued(api: FakeAPI, queue: SendQueue, chats: list[int]) -> None:
+    await asyncio.gather(*(queue.send("bot", c, partial(api.send, c)) for c in chats))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--chats", type=int, default=100)
+    parser.add_argument("--bot-rate", type=float, default=30.0)
+    parser.add_argument("--chat-rate", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    chats = [rng.randrange(args.chats) for _ in range(args.messages)]
+
+    api = FakeAPI(args.bot_rate, args.chat_rate)
+    start = time.perf_counter()
+    asyncio.run(run_direct(api, chats))
+    print(
+        f"direct: {api.delivered} delivered, {api.rejected} rejected (429) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+    api = FakeAPI(args.bot_rate, args.chat_rate)
+    queue = SendQueue(
+        "bench",
+        sender_rate=args.bot_rate * 0.9,
+        chat_rate=args.chat_rate,
+        retry_after=lambda exc: exc.retry_after if isinstance(exc, FloodLimited) else None,
+        max_retries=5,
+    )
+    start = time.perf_counter()
+    asyncio.run(run_queued(api, queue, chats))
+    m = queue.metrics()
+    print(
+        f"queued: {api.delivered} delivered, {api.rejected} rejected (429), {m['retries']} retries "
+        f"in {time.perf_counter() - start:.2f}s; wait avg {m['wait_ms_avg']}ms max {m['wait_ms_max']}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""EXPLAIN regression check: every hot query must be served by its index.
+
+Usage (from backend/, against a local/dev Postgres — never production):
+    NEON_DATABASE_URL=postgresql://localhost/frontdesk_dev python -m scripts.check_query_plans
+
+Seeds synthetic tenants, customers, bookings, history, support sessions and FAQs inside one
+transaction, runs ANALYZE, EXPLAINs the queries issued by conversation_service, booking_service,
+support_service and faq_service, then rolls everything back. Exits 1 if any plan does not use
+the expected index (run `alembic upgrade head` first). tests/test_query_plans.py runs the same
+check under pytest (TEST_DATABASE_URL).
+"""
+import asyncio
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.chdir(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import async_session_maker as async_session
+from app.models.db import FAQ, Booking, ConversationMessage, SupportSession
+from app.models.db.booking import BookingStatusEnum
+from app.services import booking_service, conversation_service
+from app.utils.pagination import after
+
+SEED_SQL = [
+    """
+    INSERT INTO businesses (id, name, type, working_hours, slot_duration_minutes, timezone, active_channel, is_active)
+    SELECT gen_random_uuid(), 'Plan check ' || i, 'restaurant', '{}', 30, 'Africa/Accra', 'telegram', true
+    FROM generate_series(1, 50) AS i
+    """,
+    """
+    INSERT INTO customers (id, telegram_id, conversation_state)
+    SELECT gen_random_uuid(), 'plan-check-' || i, '{}' FROM generate_series(1, 5000) AS i
+    """,
+    """
+    INSERT INTO services (id, business_id, name, duration_minutes, is_active)
+    SELECT gen_random_uuid(), b.id, 'Table', 90, true FROM businesses b WHERE b.name LIKE 'Plan check %'
+    """,
+    """
+    WITH b AS (SELECT id, row_number() OVER () AS n FROM businesses WHERE name LIKE 'Plan check %'),
+         c AS (SELECT id, row_number() OVER () AS n FROM customers WHERE telegram_id LIKE 'plan-check-%')
+    INSERT INTO bookings (id, business_id, customer_id, service_id, booking_date, booking_time, status, booking_reference)
+    SELECT gen_random_uuid(), b.id, c.id, s.id,
+           DATE '2026-01-01' + (i % 365), TIME '12:00' + (i % 16) * INTERVAL '30 minutes',
+           (CASE WHEN i % 5 = 0 THEN 'cancelled' ELSE 'confirmed' END)::bookingstatusenum,
+           'PLANCHECK-' || i
+    FROM generate_series(1, 50000) AS i
+    JOIN b ON b.n = 1 + i % 50
+    JOIN c ON c.n = 1 + i % 5000
+    JOIN services s ON s.business_id = b.id
+    """,
+    """
+    WITH b AS (SELECT id, row_number() OVER () AS n FROM businesses WHERE name LIKE 'Plan check %'),
+         c AS (SELECT id, row_number() OVER () AS n FROM customers WHERE telegram_id LIKE 'plan-check-%')
+    INSERT INTO conversation_history (id, customer_id, business_id, role, content, created_at)
+    SELECT gen_random_uuid(), c.id, b.id,
+           (CASE WHEN i % 2 = 0 THEN 'user' ELSE 'assistant' END)::messageroleenum,
+           'message ' || i, now() - i * INTERVAL '1 second'
+    FROM generate_series(1, 100000) AS i
+    JOIN b ON b.n = 1 + i % 50
+    JOIN c ON c.n = 1 + i % 5000
+    """,
+    """
+    WITH b AS (SELECT id, row_number() OVER () AS n FROM businesses WHERE name LIKE 'Plan check %'),
+         c AS (SELECT id, row_number() OVER () AS n FROM customers WHERE telegram_id LIKE 'plan-check-%')
+    INSERT INTO support_sessions (id, customer_id, business_id, is_active)
+    SELECT gen_random_uuid(), c.id, b.id, i % 10 = 0
+    FROM generate_series(1, 5000) AS i
+    JOIN b ON b.n = 1 + i % 50
+    JOIN c ON c.n = i
+    """,
+    """
+    INSERT INTO faqs (id, business_id, question, answer, keywords)
+    SELECT gen_random_uuid(), b.id, 'Question ' || i, 'Answer ' || i, '{}'
+    FROM businesses b, generate_series(1, 400) AS i
+    WHERE b.name LIKE 'Plan check %'
+    """,
+]
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+async def check_plans() -> dict[str, tuple[str, str]]:
+    """EXPLAIN every hot query on seeded data (rolled back): name → (expected index, plan text)."""
+    async with async_session() as session:
+        for sql in SEED_SQL:
+            await session.execute(text(sql))
+        await session.execute(text("ANALYZE businesses, customers, services, bookings, conversation_history, support_sessions, faqs"))
+
+        row = (
+            await session.execute(
+                text(
+                    "SELECT customer_id, business_id, id, created_at, booking_date, booking_time FROM bookings "
+                    "WHERE booking_reference = 'PLANCHECK-1'"
+                )
+            )
+        ).one()
+        customer_id, business_id, booking_id, created_at, booking_date, booking_time = row
+        day = date(2026, 1, 2)
+
+        checks = {
+            "conversation_service.get_recent_messages": (
+                select(ConversationMessage)
+                .where(ConversationMessage.customer_id == customer_id, ConversationMessage.business_id == business_id)
+                .order_by(ConversationMessage.created_at.desc())
+                .limit(20),
+                "ix_conversation_history_customer_business_created",
+            ),
+            "conversation_service.compact_history (next batch)": (
+                conversation_service.compaction_candidates((customer_id, business_id), 500),
+                "ix_conversation_history_customer_business_created",
+            ),
+            "booking_service.get_available_slots": (
+                select(Booking).where(
+                    Booking.business_id == business_id,
+                    Booking.booking_date == day,
+                    Booking.status == BookingStatusEnum.confirmed,
+                ),
+                "ix_bookings_business_date_confirmed",
+            ),
+            "booking_service.get_bookings_for_customer": (
+                select(Booking)
+                .where(
+                    Booking.customer_id == customer_id,
+                    Booking.business_id == business_id,
+                    Booking.status == BookingStatusEnum.confirmed,
+                )
+                .order_by(Booking.booking_date, Booking.booking_time),
+                "ix_bookings_customer_business_date_confirmed",
+            ),
+            "booking_service.list_business_bookings (next page)": (
+                booking_service.business_bookings_query(business_id)
+                .where(after((Booking.created_at, Booking.id), (created_at, booking_id), descending=True))
+                .limit(101),
+                "ix_bookings_business_created",
+            ),
+            "booking_service.list_bookings (next page)": (
+                select(*booking_service.BOOKING_LIST_COLUMNS)
+                .where(
+                    Booking.business_id == business_id,
+                    after(
+                        (Booking.booking_date, Booking.booking_time, Booking.id),
+                        (booking_date, booking_time, booking_id),
+                    ),
+                )
+                .order_by(Booking.booking_date, Booking.booking_time, Booking.id)
+                .limit(101),
+                "ix_bookings_business_date_time",
+            ),
+            "support_service.get_active_support_session": (
+                select(SupportSession)
+                .where(
+                    SupportSession.customer_id == customer_id,
+                    SupportSession.business_id == business_id,
+                    SupportSession.is_active.is_(True),
+                )
+                .limit(1),
+                "ix_support_sessions_customer_business_active",
+            ),
+            "faq_service.get_faqs_for_business": (
+                select(FAQ).where(FAQ.business_id == business_id).order_by(FAQ.question),
+                "ix_faqs_business_question",
+            ),
+        }
+
+        plans = {}
+        for name, (stmt, index_name) in checks.items():
+            plan = "\n".join(r[0] for r in (await session.execute(text("EXPLAIN " + _sql(stmt)))).all())
+            plans[name] = (index_name, plan)
+        await session.rollback()
+    return plans
+
+
+def uses_index(index_name: str, plan: str) -> bool:
+    return index_name in plan and "Index" in plan
+
+
+async def main() -> int:
+    failures = 0
+    for name, (index_name, plan) in (await check_plans()).items():
+        ok = uses_index(index_name, plan)
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name} -> {index_name}")
+        if not ok:
+            print("     " + plan.replace("\n", "\n     "))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""WhatsApp channel against a local fake Graph API: payload shapes, rate-limit retry, webhook parsing, throughput.
+
+Usage (from backend/):
+    python -m scripts.check_whatsapp [--messages 500] [--recipients 100]
+
+No database or Meta account needed. A threaded HTTP/1.1 server on 127.0.0.1 plays the Cloud API
+messages endpoint: it records each request and answers like Meta (a wamid per message). Its first
+message to recipient "233200000429" gets a 130429 throttling error, which the send queue must retry.
+The throughput run reports messages/second and how many TCP connections the pooled client opened.
+tests/test_whatsapp_channel.py runs the same checks under pytest.
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("NEON_DATABASE_URL", "postgresql://localhost/unused")
+
+from app.bot.whatsapp_entry import parse_whatsapp_webhook
+from app.channels.whatsapp import WhatsAppChannel, verify_signature, whatsapp_sends
+from app.core.config import settings
+from app.core.http import close_http_clients
+
+THROTTLED_RECIPIENT = "233200000429"
+
+
+class FakeGraph(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    requests: list[tuple[str, dict]] = []
+    peers: set[int] = set()
+    throttled: set[str] = set()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _answer(self, status: int, body: dict) -> None:
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.lock:
+            self.peers.add(self.client_address[1])
+            to = payload.get("to")
+            if to == THROTTLED_RECIPIENT and to not in self.throttled:
+                self.throttled.add(to)
+                self._answer(400, {"error": {"code": 130429, "message": "Rate limit hit"}})
+                return
+            if self.headers.get("Authorization") != "Bearer test-token":
+                self._answer(401, {"error": {"code": 190, "message": "Invalid OAuth access token"}})
+                return
+            self.requests.append((self.path, payload))
+            count = len(self.requests)
+        if payload.get("status") == "read":
+            self._answer(200, {"success": True})
+            return
+        self._answer(200, {"messaging_product": "whatsapp", "messages": [{"id": f"wamid.{count}"}]})
+
+
+WEBHOOK = {
+    "object": "whatsapp_business_account",
+    "entry": [
+        {
+            "id": "waba-1",
+            "changes": [
+                {
+                    "field": "messages",
+                    "value": {
+                        "messaging_product": "whatsapp",
+                        "metadata": {"display_phone_number": "233300000001", "phone_number_id": "111"},
+                        "contacts": [{"wa_id": "233201111111", "profile": {"name": "Ama"}}],
+                        "messages": [
+                            {"from": "233201111111", "id": "wamid.a1", "type": "text", "text": {"body": "Hi"}},
+                            {
+                                "from": "233201111111",
+                                "id": "wamid.a2",
+                                "type": "interactive",
+                                "interactive": {
+                                    "type": "button_reply",
+                                    "button_reply": {"id": "confirm_booking", "title": "Confirm"},
+                                },
+                            },
+                            {"from": "233201111111", "id": "wamid.a3", "type": "image", "image": {"id": "m"}},
+                        ],
+                    },
+                }
+            ],
+        },
+        {
+            "id": "waba-2",
+            "changes": [
+                {
+                    "field": "messages",
+                    "value": {
+                        "metadata": {"phone_number_id": "222"},
+                        "statuses": [{"id": "wamid.out", "status": "delivered"}],
+                    },
+                },
+                {
+                    "field": "messages",
+                    "value": {
+                        "metadata": {"phone_number_id": "222"},
+                        "contacts": [{"wa_id": "233202222222", "profile": {"name": "Kofi"}}],
+                        "messages": [
+                            {
+                                "from": "233202222222",
+                                "id": "wamid.b1",
+                                "type": "interactive",
+                                "interactive": {
+                                    "type": "list_reply",
+                                    "list_reply": {"id": "manage_booking_x", "title": "ABC123"},
+                                },
+                            }
+                        ],
+                    },
+                },
+            ],
+        },
+    ],
+}
+
+
+def check_webhook_parsing() -> None:
+    messages = parse_whatsapp_webhook(WEBHOOK)
+    assert [(m.phone_number_id, m.message_id, m.text, m.reply_id, m.profile_name) for m in messages] == [
+        ("111", "wamid.a1", "Hi", None, "Ama"),
+        ("111", "wamid.a2", "Confirm", "confirm_booking", "Ama"),
+        ("222", "wamid.b1", "ABC123", "manage_booking_x", "Kofi"),
+    ], messages
+    assert parse_whatsapp_webhook({"object": "page", "entry": WEBHOOK["entry"]}) == []
+    body = json.dumps(WEBHOOK).encode()
+    signature = "sha256=" + hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+    assert verify_signature(body, signature, "secret")
+    assert not verify_signature(body + b" ", signature, "secret")
+    assert not verify_signature(body, None, "secret")
+    print("webhook parsing: ok (3 messages from 2 entries; statuses and media skipped; signature checked)")
+
+
+async def check_payloads() -> None:
+    channel = WhatsAppChannel("111", "test-token", inbound_message_id="wamid.in")
+    FakeGraph.requests.clear()
+    await channel.send_typing("233201111111")
+    await channel.send_message("233201111111", "Hello")
+    await channel.send_buttons(
+        "233201111111",
+        "Confirm?",
+        [
+            {"label": "✅ Confirm Booking", "action": "confirm_booking"},
+            {"label": "❌ Cancel", "action": "cancel_booking"},
+        ],
+    )
+    slots = [{"label": f"{h}:00", "action": f"{h}:00:00"} for h in range(9, 21)]
+    await channel.send_buttons("233201111111", "Pick a time:", slots)
+    booking_item = {"label": "ABC123 — 2026-10-20 19:00 — Deluxe Room", "action": "manage_booking_1"}
+    await channel.send_list("233201111111", "Your bookings", [booking_item])
+    await channel.send_message(THROTTLED_RECIPIENT, "Retried after throttling")
+
+    paths = {path for path, _ in FakeGraph.requests}
+    assert paths == {"/v21.0/111/messages"}, paths
+    read, text, buttons, slot_list, bookings, retried = (p for _, p in FakeGraph.requests)
+    assert read == {
+        "messaging_product": "whatsapp",
+        "status": "read",
+        "message_id": "wamid.in",
+        "typing_indicator": {"type": "text"},
+    }, read
+    assert text["type"] == "text" and text["text"] == {"body": "Hello"} and text["to"] == "233201111111"
+    reply_buttons = buttons["interactive"]["action"]["buttons"]
+    assert buttons["interactive"]["type"] == "button" and len(reply_buttons) == 2
+    assert reply_buttons[0]["reply"] == {"id": "confirm_booking", "title": "✅ Confirm Booking"}
+    rows = slot_list["interactive"]["action"]["sections"][0]["rows"]
+    assert slot_list["interactive"]["type"] == "list" and len(rows) == 10 and rows[0]["id"] == "9:00:00"
+    row = bookings["interactive"]["action"]["sections"][0]["rows"][0]
+    assert len(row["title"]) <= 24 and row["title"].startswith("ABC123") and row["id"] == "manage_booking_1"
+    assert row["title"].removesuffix("…") + row["description"] == booking_item["label"], row
+    assert retried["to"] == THROTTLED_RECIPIENT and whatsapp_sends.stats.retries == 1
+    print("channel payloads: ok (read+typing, text, 2 reply buttons, 12 options → 10-row list, long row, 1 retry)")
+
+
+async def throughput(messages: int, recipients: int) -> None:
+    channel = WhatsAppChannel("111", "test-token")
+    FakeGraph.requests.clear()
+    FakeGraph.peers.clear()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(channel.send_message(f"23324{i % recipients:07d}", f"Message {i}") for i in range(messages))
+    )
+    elapsed = time.perf_counter() - start
+    assert len(FakeGraph.requests) == messages
+    m = whatsapp_sends.metrics()
+    print(
+        f"throughput: {messages} messages to {recipients} recipients in {elapsed:.2f}s "
+        f"({messages / elapsed:.0f}/s, limit {settings.WHATSAPP_SEND_RATE_PER_NUMBER:g}/s per number) "
+        f"over {len(FakeGraph.peers)} connection(s); queue wait avg {m['wait_ms_avg']}ms max {m['wait_ms_max']}ms"
+    )
+
+
+async def run(args: argparse.Namespace, port: int) -> None:
+    settings.WHATSAPP_GRAPH_API_URL = f"http://127.0.0.1:{port}/v21.0"
+    settings.WHATSAPP_RETRY_AFTER_SECONDS = 0.2
+    try:
+        await check_payloads()
+        await throughput(args.messages, args.recipients)
+    finally:
+        await close_http_clients()
+
+
+class GraphServer(ThreadingHTTPServer):
+    # The send queue opens its pooled connections in one burst; the default backlog of 5 resets some.
+    request_queue_size = 128
+
+
+@contextlib.contextmanager
+def fake_graph_server() -> Iterator[int]:
+    """Serve FakeGraph on a free local port; yields the port."""
+    server = GraphServer(("127.0.0.1", 0), FakeGraph)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--recipients", type=int, default=100)
+    args = parser.parse_args()
+
+    check_webhook_parsing()
+    with fake_graph_server() as port:
+        asyncio.run(run(args, port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Register a business's Telegram bot webhook (by bot id, with its secret token).
+
+Usage (from backend/, with TELEGRAM_WEBHOOK_URL set to the public base URL):
+    python -m scripts.set_telegram_webhook <business_id>
+
+Points the bot in Business.telegram_bot_token at {TELEGRAM_WEBHOOK_URL}/webhook/telegram/bot/{bot_id}
+with secret_token set, so the endpoint only accepts updates that really come from Telegram. Run it
+again after changing SECRET_KEY or the bot token.
+"""
+import asyncio
+import os
+import sys
+from uuid import UUID
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.chdir(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.database import async_session_maker as async_session
+from app.core.telegram_bots import close_bots, register_webhook
+from app.models.db import Business
+
+
+async def main(business_id: UUID) -> int:
+    async with async_session() as session:
+        business = await session.get(Business, business_id)
+    if business is None or not business.telegram_bot_token:
+        print(f"Business {business_id} not found or has no telegram_bot_token")
+        return 1
+    try:
+        url = await register_webhook(business.telegram_bot_token)
+    finally:
+        await close_bots()
+    print(f"Webhook set: {url}")
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit(__doc__)
+    sys.exit(asyncio.run(main(UUID(sys.argv[1]))))
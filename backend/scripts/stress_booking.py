@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Double-booking stress test: many concurrent create_booking calls for one slot.
+
+Usage (from backend/, against a local/dev Postgres — never production):
+    NEON_DATABASE_URL=postgresql://localhost/frontdesk_dev python -m scripts.stress_booking [--requests 200] [--units 1]
+
+Creates a throwaway restaurant, a service with `--units` tables and one customer, then fires
+`--requests` create_booking calls for the same date and time at once, each in its own session
+(commit on success, rollback otherwise). Exactly `--units` must win and every booking reference must
+be unique. The created rows are deleted afterwards. Exits 1 on any violation.
+tests/test_booking_concurrency.py runs the same check under pytest (TEST_DATABASE_URL).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.chdir(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import delete, select
+
+from app.core.database import async_session_maker as async_session
+from app.models.db import AvailabilityVersion, Booking, Business, Customer, Service
+from app.models.db.business import BusinessTypeEnum
+from app.services import booking_service
+
+
+async def _setup(units: int) -> tuple:
+    async with async_session() as session:
+        business = Business(
+            name="Stress test restaurant",
+            type=BusinessTypeEnum.restaurant,
+            working_hours={d: ["09:00", "22:00"] for d in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")},
+            slot_duration_minutes=30,
+        )
+        session.add(business)
+        await session.flush()
+        service = Service(business_id=business.id, name="Table", duration_minutes=90, room_count=units)
+        customer = Customer(telegram_id=f"stress-{business.id}", conversation_state={})
+        session.add_all([service, customer])
+        await session.commit()
+        return business.id, service.id, customer.id
+
+
+async def _cleanup(business_id, service_id, customer_id) -> None:
+    async with async_session() as session:
+        await session.execute(delete(Booking).where(Booking.business_id == business_id))
+        await session.execute(delete(AvailabilityVersion).where(AvailabilityVersion.business_id == business_id))
+        await session.execute(delete(Service).where(Service.id == service_id))
+        await session.execute(delete(Customer).where(Customer.id == customer_id))
+        await session.execute(delete(Business).where(Business.id == business_id))
+        await session.commit()
+
+
+async def _attempt(business_id, service_id, customer_id, day: str, gate: asyncio.Event) -> str:
+    await gate.wait()
+    async with async_session() as session:
+        try:
+            result = await booking_service.create_booking(
+                session, business_id, customer_id, service_id, day, "19:00", 2, None
+            )
+            if not result:
+                await session.rollback()
+                return "rejected"
+            await session.commit()
+            return "booked"
+        except Exception as e:  # noqa: BLE001 — counted and reported, the run must not stop
+            await session.rollback()
+            return f"error: {type(e).__name__}"
+
+
+async def run(requests: int, units: int) -> tuple[Counter, list[str], float]:
+    """Fire the concurrent requests; returns (outcome counts, booking references in the DB, seconds)."""
+    business_id, service_id, customer_id = await _setup(units)
+    day = (date.today() + timedelta(days=7)).isoformat()
+    try:
+        gate = asyncio.Event()
+        tasks = [
+            asyncio.create_task(_attempt(business_id, service_id, customer_id, day, gate)) for _ in range(requests)
+        ]
+        started = time.perf_counter()
+        gate.set()
+        outcomes = Counter(await asyncio.gather(*tasks))
+        elapsed = time.perf_counter() - started
+
+        async with async_session() as session:
+            refs = (
+                await session.execute(select(Booking.booking_reference).where(Booking.business_id == business_id))
+            ).scalars().all()
+    finally:
+        await _cleanup(business_id, service_id, customer_id)
+    return outcomes, list(refs), elapsed
+
+
+async def main(requests: int, units: int) -> int:
+    outcomes, refs, elapsed = await run(requests, units)
+    print(f"{requests} concurrent requests for {units} unit(s) in {elapsed:.2f}s")
+    for outcome, count in sorted(outcomes.items()):
+        print(f"  {outcome:<24} {count}")
+    print(f"  bookings in DB           {len(refs)} ({len(set(refs))} distinct references)")
+
+    ok = outcomes["booked"] == units and len(refs) == units and len(set(refs)) == len(refs)
+    print("OK" if ok else "FAIL: slot over- or under-booked")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--units", type=int, default=1)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.requests, args.units)))
@@ -0,0 +1,41 @@
+"""Shared test setup.
+
+Tests that need Postgres run only when TEST_DATABASE_URL points at a disposable database (a local
+or CI Postgres migrated with `alembic upgrade head` — never production); the app is then configured
+against it. Everything else runs without a database.
+"""
+import asyncio
+import os
+import sys
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["NEON_DATABASE_URL"] = TEST_DATABASE_URL
+else:
+    os.environ.setdefault("NEON_DATABASE_URL", "postgresql://localhost/unused")
+
+requires_database = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+
+@pytest.fixture
+def run_async() -> Callable[[Coroutine[Any, Any, Any]], Any]:
+    """Run a coroutine to completion on a fresh event loop.
+
+    The engine's pooled connections are bound to the loop that opened them, so the pool is
+    disposed before that loop closes.
+    """
+    from app.core.database import engine
+
+    async def with_dispose(coro: Coroutine[Any, Any, Any]) -> Any:
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return lambda coro: asyncio.run(with_dispose(coro))
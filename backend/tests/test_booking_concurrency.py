@@ -0,0 +1,18 @@
+"""Concurrent create_booking calls for one slot never over- or under-book it (scripts/stress_booking.py)."""
+import pytest
+
+from conftest import requires_database
+from scripts import stress_booking
+
+REQUESTS = 50
+
+
+@requires_database
+@pytest.mark.parametrize("units", [1, 3])
+def test_concurrent_bookings_fill_exactly_the_free_units(run_async, units):
+    outcomes, refs, _ = run_async(stress_booking.run(REQUESTS, units))
+
+    assert outcomes["booked"] == units, outcomes
+    assert outcomes["rejected"] == REQUESTS - units, outcomes
+    assert len(refs) == units
+    assert len(set(refs)) == len(refs)
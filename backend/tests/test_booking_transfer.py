@@ -0,0 +1,79 @@
+"""Booking import parsing: row validation and unreadable uploads reported by line."""
+import csv
+import io
+from datetime import date, time
+from uuid import uuid4
+
+import pytest
+
+from app.services.booking_transfer import _parse_batch, _parse_row, _read_rows
+
+SERVICE_ID = uuid4()
+SERVICES = {str(SERVICE_ID): SERVICE_ID, "haircut": SERVICE_ID}
+TODAY = date(2026, 10, 17)
+
+
+def _batch(data: bytes, fmt: str = "csv", size: int = 100):
+    return _parse_batch(_read_rows(io.BytesIO(data), fmt), SERVICES, TODAY, size)
+
+
+def test_parse_row_defaults_status_from_the_business_date():
+    raw = {"service": "Haircut", "booking_date": "2026-10-16", "booking_time": "09:30", "guest_phone": "+233200000000"}
+    past = _parse_row(2, raw, SERVICES, TODAY)
+    assert (past.service_id, past.booking_time, past.status) == (SERVICE_ID, time(9, 30), "completed")
+    assert _parse_row(2, {**raw, "booking_date": "2026-10-17"}, SERVICES, TODAY).status == "confirmed"
+
+
+@pytest.mark.parametrize(
+    ("raw", "message"),
+    [
+        (None, "not a JSON object"),
+        ({"service": "Massage"}, "unknown service"),
+        ({"service": "Haircut", "booking_date": "2026-10-16", "booking_time": "09:30"}, "customer_id or guest_phone"),
+    ],
+)
+def test_parse_row_rejects_invalid_rows(raw, message):
+    with pytest.raises(ValueError, match=message):
+        _parse_row(2, raw, SERVICES, TODAY)
+
+
+def test_parse_batch_reports_errors_by_line():
+    data = (
+        "service,booking_date,booking_time,guest_phone\n"
+        "Haircut,2026-10-20,10:00,+233200000000\n"
+        "Haircut,20/10/2026,10:00,+233200000000\n"
+    ).encode()
+    parsed, errors, consumed = _batch(data)
+    assert [r.line for r in parsed] == [2]
+    assert consumed == 2
+    assert len(errors) == 1 and errors[0].startswith("line 3: ")
+
+
+def test_non_utf8_upload_is_an_error_on_its_line():
+    data = (
+        "service,booking_date,booking_time,guest_phone,guest_name\n"
+        "Haircut,2026-10-20,10:00,+233200000000,Ama\n"
+        "Haircut,2026-10-20,11:00,+233200000001,Zo\xeb\n"
+        "Haircut,2026-10-20,12:00,+233200000002,Kofi\n"
+    ).encode("cp1252")
+    rows = _read_rows(io.BytesIO(data), "csv")
+    parsed, errors, consumed = _parse_batch(rows, SERVICES, TODAY, 100)
+    assert [r.line for r in parsed] == [2]
+    assert consumed == 2
+    assert len(errors) == 1 and errors[0].startswith("line 3: not UTF-8")
+    assert _parse_batch(rows, SERVICES, TODAY, 100) == ([], [], 0)
+
+
+def test_malformed_csv_is_an_error_on_its_line():
+    notes = "x" * (csv.field_size_limit() + 1)
+    data = f"service,booking_date,booking_time,guest_phone,notes\nHaircut,2026-10-20,10:00,+2332000,{notes}\n".encode()
+    parsed, errors, consumed = _batch(data)
+    assert (parsed, consumed) == ([], 1)
+    assert len(errors) == 1 and errors[0].startswith("line 2: ")
+
+
+def test_ndjson_lines_keep_their_numbers():
+    data = b'{"service": "Haircut", "booking_date": "2026-10-20", "booking_time": "10:00", "customer_id": "x"}\n\n[1]\n'
+    parsed, errors, consumed = _batch(data, "ndjson")
+    assert (parsed, consumed) == ([], 2)
+    assert errors[0].startswith("line 1: ") and errors[1] == "line 3: not a JSON object"
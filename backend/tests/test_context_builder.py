@@ -0,0 +1,51 @@
+"""Context window packing and the rolling summary of evicted history."""
+from app.utils.context_builder import build_context, update_rolling_summary
+
+
+def _message(role: str, content: str, second: int) -> dict[str, str]:
+    return {"role": role, "content": content, "at": f"2026-10-17T10:00:{second:02d}.000000+00:00"}
+
+
+def test_build_context_sends_role_and_content_only():
+    history = [_message("user", "hi", 1), _message("assistant", "hello", 2)]
+    window = build_context(history, "book a table", budget=1000)
+
+    assert window.messages == [
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": "hello"},
+        {"role": "user", "content": "book a table"},
+    ]
+    assert window.dropped == []
+
+
+def test_build_context_drops_the_oldest_messages_over_budget():
+    history = [_message("user", "word " * 50, 1), _message("assistant", "ok", 2)]
+    window = build_context(history, "thanks", budget=20)
+
+    assert window.dropped == history[:1]
+    assert window.messages[0] == {"role": "assistant", "content": "ok"}
+
+
+def test_rolling_summary_resumes_after_its_marker():
+    first = update_rolling_summary(None, [_message("user", "yes", 1), _message("assistant", "ok", 2)], 1000)
+    assert first == {"text": "user: yes\nassistant: ok", "through": _message("assistant", "ok", 2)["at"]}
+
+    # The same two messages are still evicted, plus identical content sent again later.
+    dropped = [
+        _message("user", "yes", 1),
+        _message("assistant", "ok", 2),
+        _message("user", "yes", 3),
+        _message("assistant", "ok", 4),
+    ]
+    second = update_rolling_summary(first, dropped, 1000)
+    assert second["text"] == "user: yes\nassistant: ok\nuser: yes\nassistant: ok"
+    assert second["through"] == dropped[-1]["at"]
+    assert update_rolling_summary(second, dropped, 1000) is second
+
+
+def test_rolling_summary_keeps_its_newest_lines():
+    dropped = [_message("user", f"message {i}", i) for i in range(10)]
+    summary = update_rolling_summary(None, dropped, 40)
+
+    assert len(summary["text"]) <= 40
+    assert summary["text"].endswith("user: message 9")
@@ -0,0 +1,39 @@
+"""Business-local dates."""
+from datetime import UTC, date, datetime
+
+import pytest
+
+from app.utils import datetime_utils
+from app.utils.datetime_utils import business_today
+
+# 11:00 UTC on 17 Oct 2026: already 18 Oct in Kiritimati (UTC+14), still midnight 17 Oct in Pago Pago (UTC-11)
+NOW = datetime(2026, 10, 17, 11, 0, tzinfo=UTC)
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW.astimezone(tz) if tz else NOW.replace(tzinfo=None)
+
+
+class FrozenDate(date):
+    @classmethod
+    def today(cls):
+        return date(2026, 10, 16)  # the server's local date, distinct from every zone above
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    monkeypatch.setattr(datetime_utils, "datetime", FrozenDatetime)
+    monkeypatch.setattr(datetime_utils, "date", FrozenDate)
+
+
+def test_business_today_uses_the_business_timezone():
+    assert business_today("Pacific/Kiritimati") == date(2026, 10, 18)
+    assert business_today("Pacific/Pago_Pago") == date(2026, 10, 17)
+    assert business_today("Africa/Accra") == date(2026, 10, 17)
+
+
+def test_business_today_falls_back_to_the_server_date():
+    assert business_today(None) == date(2026, 10, 16)
+    assert business_today("Not/AZone") == date(2026, 10, 16)
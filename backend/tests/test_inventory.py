@@ -0,0 +1,76 @@
+"""Inventory-aware availability: range max, tables per minute, rooms per night."""
+from datetime import date, time
+from types import SimpleNamespace
+
+from app.utils.datetime_utils import MINUTES_PER_DAY
+from app.utils.inventory import Capacity, MaxSegmentTree, NightInventory, SlotInventory, service_capacity
+
+
+def test_segment_tree_range_max_including_the_edges():
+    values = [7, 0, 3, 0, 0, 9]
+    tree = MaxSegmentTree(values)
+    for lo in range(len(values)):
+        for hi in range(lo + 1, len(values) + 1):
+            assert tree.max(lo, hi) == max(values[lo:hi]), (lo, hi)
+    assert tree.max(0, 1) == 7
+    assert tree.max(5, 6) == 9
+    assert tree.max(-3, 2) == 7 and tree.max(4, 99) == 9  # clipped to the bounds
+    assert tree.max(3, 3) == 0 and tree.max(6, 9) == 0  # empty ranges
+    assert MaxSegmentTree([]).max(0, 1) == 0
+
+
+def test_service_capacity_falls_back_to_a_single_unit():
+    assert service_capacity(None) == Capacity()
+    assert service_capacity(SimpleNamespace(room_count=None, max_occupancy=None, capacity=None)).simple
+    double = service_capacity(SimpleNamespace(room_count=3, max_occupancy=None, capacity=2))
+    assert (double.units, double.max_party) == (3, 2)
+    assert (double.units_for(2), double.units_for(3), double.units_for(None)) == (1, 2, 1)
+    assert double.admits(6) and not double.admits(7)
+
+
+def test_single_unit_slots_block_on_any_overlap():
+    inventory = SlotInventory(Capacity(), [(time(12, 0), 60, 4)])
+    assert not inventory.fits(time(11, 30), 31)
+    assert inventory.fits(time(11, 0), 60)
+    assert inventory.free_slots([time(11, 0), time(12, 30), time(13, 0)], 60) == [time(11, 0), time(13, 0)]
+
+
+def test_multi_unit_parties_take_several_tables():
+    tables = Capacity(units=3, max_party=2)
+    inventory = SlotInventory(tables, [(time(19, 0), 90, 4), (time(20, 0), 60, None)])
+    assert inventory.fits(time(18, 0), 60, 2)  # before anything is booked
+    assert inventory.fits(time(18, 0), 61, 2)  # 19:00 has 2 of 3 tables taken, 1 left
+    assert not inventory.fits(time(18, 0), 61, 3)  # needs 2 tables
+    assert inventory.fits(time(19, 0), 60, 2)
+    assert not inventory.fits(time(20, 0), 30, 2)  # 19:00 party (2 tables) + 20:00 party (1 table)
+    assert inventory.fits(time(20, 30), 60, 2)
+    assert not inventory.fits(time(21, 0), 30, 7)  # more guests than all tables seat
+    assert inventory.free_slots([time(18, 0), time(18, 30), time(20, 0), time(21, 0)], 60, 3) == [
+        time(18, 0),
+        time(21, 0),
+    ]
+
+
+def test_slots_at_the_end_of_the_day_are_clipped():
+    inventory = SlotInventory(Capacity(units=2), [(time(23, 30), 120, None)] * 2)
+    assert not inventory.fits(time(23, 59), 60)
+    assert inventory.fits(time(0, 0), 23 * 60 + 30)
+    assert inventory.fits(time(22, 0), MINUTES_PER_DAY - 23 * 60)  # 22:00-23:00 ends as they start
+    assert not inventory.fits(time(22, 0), MINUTES_PER_DAY)  # runs past midnight, overlaps 23:30
+
+
+def test_nights_at_the_edges_of_the_loaded_range():
+    rooms = Capacity(units=2, max_party=2)
+    first = date(2026, 11, 1)
+    stays = [
+        (date(2026, 10, 30), date(2026, 11, 2), 2),  # starts before the range: nights of 1 Nov only
+        (date(2026, 11, 7), date(2026, 11, 12), 3),  # runs past the range, takes both rooms
+    ]
+    inventory = NightInventory(rooms, first, 7, stays)
+    assert inventory.rooms_left(first) == 1
+    assert inventory.rooms_left(date(2026, 11, 2), 5) == 2
+    assert inventory.rooms_left(date(2026, 11, 7)) == 0
+    assert inventory.fits(date(2026, 11, 2), 5, 4)
+    assert not inventory.fits(date(2026, 11, 2), 6, 1)  # last night 7 Nov is full
+    assert not inventory.fits(first, 1, 3)  # needs 2 rooms, 1 left
+    assert not inventory.fits(date(2026, 11, 3), 1, 5)  # more guests than both rooms hold
@@ -0,0 +1,14 @@
+"""Every hot query is served by its index on seeded data (scripts/check_query_plans.py)."""
+from conftest import requires_database
+from scripts import check_query_plans
+
+
+@requires_database
+def test_hot_queries_use_their_indexes(run_async):
+    plans = run_async(check_query_plans.check_plans())
+
+    assert plans
+    misses = {
+        name: plan for name, (index_name, plan) in plans.items() if not check_query_plans.uses_index(index_name, plan)
+    }
+    assert not misses, "\n\n".join(f"{name}:\n{plan}" for name, plan in misses.items())
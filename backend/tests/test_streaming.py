@@ -0,0 +1,74 @@
+"""StreamingReply: throttled edits of one message, and cleanup when the stream fails."""
+import asyncio
+
+import pytest
+
+from app.channels.base import BaseChannel
+from app.channels.streaming import StreamingReply
+
+
+class EditingChannel(BaseChannel):
+    supports_edits = True
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.sent: list[str] = []
+        self.edits: list[str] = []
+
+    async def send_message(self, recipient_id, text):
+        self.sent.append(text)
+
+    async def send_editable_message(self, recipient_id, text):
+        await asyncio.sleep(self.delay)
+        self.sent.append(text)
+        return "1"
+
+    async def edit_message(self, recipient_id, message_id, text):
+        await asyncio.sleep(self.delay)
+        self.edits.append(text)
+
+    async def send_buttons(self, recipient_id, text, buttons):
+        raise NotImplementedError
+
+    async def send_list(self, recipient_id, text, items):
+        raise NotImplementedError
+
+    async def send_typing(self, recipient_id):
+        pass
+
+    async def forward_to_group(self, group_id, text):
+        raise NotImplementedError
+
+
+def test_finish_edits_the_streamed_message():
+    async def stream():
+        channel = EditingChannel()
+        reply = StreamingReply(channel, "42", min_interval=0)
+        reply.update("Hello")
+        await asyncio.sleep(0)
+        reply.update("Hello there")
+        await reply.finish("Hello there, welcome!")
+        await reply.close()
+        return channel
+
+    channel = asyncio.run(stream())
+    assert channel.sent == ["Hello"]
+    assert channel.edits[-1] == "Hello there, welcome!"
+
+
+def test_close_cancels_the_edit_when_the_stream_fails():
+    channel = EditingChannel(delay=10)
+
+    async def stream():
+        reply = StreamingReply(channel, "42")
+        try:
+            reply.update("Hel")
+            await asyncio.sleep(0)
+            raise RuntimeError("provider stream broke")
+        finally:
+            await reply.close()
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(stream())
+    assert channel.sent == []
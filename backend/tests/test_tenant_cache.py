@@ -0,0 +1,71 @@
+"""TenantCache: stale loads are never stored, and invalidation bookkeeping stays bounded."""
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.models.db.business import ActiveChannelEnum, BusinessTypeEnum
+from app.services.tenant_cache import TenantCache
+
+
+def _business(business_id=None, name="Harbour Grill"):
+    return SimpleNamespace(
+        id=business_id or uuid4(),
+        name=name,
+        type=BusinessTypeEnum.restaurant,
+        telegram_bot_token=None,
+        telegram_group_id=None,
+        working_hours={},
+        slot_duration_minutes=30,
+        timezone="Africa/Accra",
+        location=None,
+        phone=None,
+        active_channel=ActiveChannelEnum.telegram,
+        whatsapp_config=None,
+        is_active=True,
+        services=[],
+        faqs=[],
+        staff=[],
+    )
+
+
+def test_load_started_before_an_invalidation_is_not_cached():
+    cache = TenantCache(max_size=10, ttl_seconds=0)
+    business = _business()
+    version = cache.current_version(business.id)
+    cache.invalidate(business.id)
+
+    cache.store(business, version)
+    assert cache.get(business.id) is None
+
+    cache.store(business, cache.current_version(business.id))
+    assert cache.get(business.id).name == "Harbour Grill"
+
+
+def test_invalidation_drops_the_cached_snapshot():
+    cache = TenantCache(max_size=10, ttl_seconds=0)
+    business = _business()
+    cache.store(business, cache.current_version(business.id))
+    cache.invalidate(business.id)
+    assert cache.get(business.id) is None
+
+
+def test_invalidation_stamps_are_bounded():
+    cache = TenantCache(max_size=3, ttl_seconds=0)
+    stale = _business()
+    version = cache.current_version(stale.id)
+    cache.invalidate(stale.id)
+    for _ in range(100):
+        cache.invalidate(uuid4())
+
+    assert len(cache._invalidated) == 3
+    # The forgotten invalidation still keeps the slow load out.
+    cache.store(stale, version)
+    assert cache.get(stale.id) is None
+
+
+def test_clear_rejects_loads_in_flight():
+    cache = TenantCache(max_size=10, ttl_seconds=0)
+    business = _business()
+    version = cache.current_version(business.id)
+    cache.clear()
+    cache.store(business, version)
+    assert cache.get(business.id) is None
@@ -0,0 +1,55 @@
+"""Webhook authentication: WhatsApp signatures, Telegram secret tokens."""
+import hashlib
+import hmac
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import webhooks
+from app.core.config import settings
+from app.core.telegram_bots import webhook_secret
+
+BODY = b'{"object": "whatsapp_business_account", "entry": []}'
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(webhooks.router)
+    return TestClient(app)
+
+
+def _signature(body: bytes, secret: str) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def test_whatsapp_post_refused_without_app_secret(client, monkeypatch):
+    monkeypatch.setattr(settings, "META_APP_SECRET", "")
+    monkeypatch.setattr(settings, "WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS", False)
+    assert client.post("/webhook/whatsapp", content=BODY).status_code == 403
+
+
+def test_whatsapp_post_accepted_unsigned_in_development(client, monkeypatch):
+    monkeypatch.setattr(settings, "META_APP_SECRET", "")
+    monkeypatch.setattr(settings, "WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS", True)
+    assert client.post("/webhook/whatsapp", content=BODY).status_code == 200
+
+
+def test_whatsapp_post_needs_valid_signature(client, monkeypatch):
+    monkeypatch.setattr(settings, "META_APP_SECRET", "secret")
+    monkeypatch.setattr(settings, "WHATSAPP_ALLOW_UNSIGNED_WEBHOOKS", True)
+    assert client.post("/webhook/whatsapp", content=BODY).status_code == 403
+    headers = {"X-Hub-Signature-256": _signature(BODY, "other")}
+    assert client.post("/webhook/whatsapp", content=BODY, headers=headers).status_code == 403
+    headers = {"X-Hub-Signature-256": _signature(BODY, "secret")}
+    assert client.post("/webhook/whatsapp", content=BODY, headers=headers).status_code == 200
+
+
+def test_telegram_bot_webhook_needs_secret_token(client):
+    update = {"update_id": 1}
+    assert client.post("/webhook/telegram/bot/123456", json=update).status_code == 403
+    headers = {webhooks.TELEGRAM_SECRET_HEADER: webhook_secret("654321")}
+    assert client.post("/webhook/telegram/bot/123456", json=update, headers=headers).status_code == 403
+    headers = {webhooks.TELEGRAM_SECRET_HEADER: webhook_secret("123456")}
+    assert client.post("/webhook/telegram/bot/123456", json=update, headers=headers).status_code != 403
@@ -0,0 +1,57 @@
+"""WhatsApp channel against the fake Graph API of scripts/check_whatsapp.py; no database needed."""
+import pytest
+
+from app.core.config import settings
+from app.core.http import close_http_clients
+from scripts import check_whatsapp
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    with check_whatsapp.fake_graph_server() as port:
+        monkeypatch.setattr(settings, "WHATSAPP_GRAPH_API_URL", f"http://127.0.0.1:{port}/v21.0")
+        monkeypatch.setattr(settings, "WHATSAPP_RETRY_AFTER_SECONDS", 0.2)
+        yield
+
+
+def test_webhook_parsing_and_signature():
+    check_whatsapp.check_webhook_parsing()
+
+
+def test_send_payloads_and_throttling_retry(graph, run_async):
+    async def check():
+        try:
+            await check_whatsapp.check_payloads()
+        finally:
+            await close_http_clients()
+
+    run_async(check())
+
+
+def test_throughput_sends_every_message(graph, run_async):
+    async def check():
+        try:
+            await check_whatsapp.throughput(200, 40)
+        finally:
+            await close_http_clients()
+
+    run_async(check())
+
+
+def test_reminder_template_payload(graph, run_async):
+    async def check():
+        try:
+            check_whatsapp.FakeGraph.requests.clear()
+            channel = check_whatsapp.WhatsAppChannel("111", "test-token")
+            await channel.send_template("233201111111", "booking_reminder_1h", "en", ["Harbour Grill"])
+        finally:
+            await close_http_clients()
+
+    run_async(check())
+    [(_, payload)] = check_whatsapp.FakeGraph.requests
+    assert payload["type"] == "template" and payload["to"] == "233201111111"
+    assert payload["template"] == {
+        "name": "booking_reminder_1h",
+        "language": {"code": "en"},
+        "components": [{"type": "body", "parameters": [{"type": "text", "text": "Harbour Grill"}]}],
+    }
@@ -0,0 +1,36 @@
+import type { Booking } from "@/lib/api";
+
+// GET /bookings returns one page (newest first); further pages come from the X-Next-Cursor header.
+const API_URL = process.env.NEXT_PUBLIC_API_URL ?? "http://localhost:8000";
+const PAGE_SIZE = 500; // backend BOOKING_LIST_MAX_LIMIT
+
+export type BookingSummary = Record<string, number> & { total: number };
+
+async function getJson<T>(path: string): Promise<{ data: T; res: Response }> {
+  const res = await fetch(`${API_URL}${path}`, { cache: "no-store" });
+  if (!res.ok) throw new Error(`GET ${path} failed (${res.status})`);
+  return { data: (await res.json()) as T, res };
+}
+
+export async function fetchRecentBookings(businessId: string, limit = 5): Promise<Booking[]> {
+  const { data } = await getJson<Booking[]>(`/api/businesses/${businessId}/bookings?limit=${limit}`);
+  return data;
+}
+
+export async function fetchAllBookings(businessId: string): Promise<Booking[]> {
+  const bookings: Booking[] = [];
+  let cursor: string | null = null;
+  do {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (cursor) params.set("cursor", cursor);
+    const { data, res } = await getJson<Booking[]>(`/api/businesses/${businessId}/bookings?${params}`);
+    bookings.push(...data);
+    cursor = res.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return bookings;
+}
+
+export async function fetchBookingSummary(businessId: string): Promise<BookingSummary> {
+  const { data } = await getJson<BookingSummary>(`/api/businesses/${businessId}/bookings/summary`);
+  return data;
+}
@@ -1,5 +1,6 @@
-import { api } from "@/lib/api";
+import type { Booking } from "@/lib/api";
 import { BookingsTable } from "./BookingsTable";
+import { fetchAllBookings } from "./fetchBookings";
 
 export default async function BookingsPage({
   params,
@@ -7,9 +8,9 @@ export default async function BookingsPage({
   params: Promise<{ id: string }>;
 }) {
   const { id } = await params;
-  let bookings: Awaited<ReturnType<typeof api.businesses.bookings.list>> = [];
+  let bookings: Booking[] = [];
   try {
-    bookings = await api.businesses.bookings.list(id);
+    bookings = await fetchAllBookings(id);
   } catch {}
 
   return (
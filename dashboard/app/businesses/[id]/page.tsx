@@ -1,6 +1,7 @@
 import { api } from "@/lib/api";
 import { Calendar, Bed, HelpCircle, MapPin, Phone, Clock, Copy } from "lucide-react";
 import { CopyIdButton } from "./CopyIdButton";
+import { fetchBookingSummary, fetchRecentBookings, type BookingSummary } from "./bookings/fetchBookings";
 
 export default async function BusinessOverviewPage({
   params,
@@ -11,26 +12,24 @@ export default async function BusinessOverviewPage({
   const business = await api.businesses.get(id);
 
   let services: Awaited<ReturnType<typeof api.businesses.services.list>> = [];
-  let bookings: Awaited<ReturnType<typeof api.businesses.bookings.list>> = [];
+  let recentBookings: Awaited<ReturnType<typeof fetchRecentBookings>> = [];
+  let summary: BookingSummary = { total: 0 };
   let faqs: Awaited<ReturnType<typeof api.faqs.list>> = [];
   try {
-    [services, bookings, faqs] = await Promise.all([
+    [services, recentBookings, summary, faqs] = await Promise.all([
       api.businesses.services.list(id),
-      api.businesses.bookings.list(id).catch(() => []),
+      fetchRecentBookings(id).catch(() => []),
+      fetchBookingSummary(id).catch(() => ({ total: 0 })),
       api.faqs.list(id).catch(() => []),
     ]);
   } catch {}
 
-  const confirmedBookings = bookings.filter((b) => b.status === "confirmed");
-  const pendingBookings = bookings.filter((b) => b.status === "pending");
-  const recentBookings = bookings.slice(0, 5);
-
   return (
     <div className="space-y-8">
       {/* Stats */}
       <div className="grid gap-4 sm:grid-cols-2 lg:grid-cols-4">
-        <StatCard label="Total Bookings" value={bookings.length} icon={<Calendar size={18} />} accent="var(--accent)" />
-        <StatCard label="Confirmed" value={confirmedBookings.length} icon={<Calendar size={18} />} accent="var(--success)" />
+        <StatCard label="Total Bookings" value={summary.total} icon={<Calendar size={18} />} accent="var(--accent)" />
+        <StatCard label="Confirmed" value={summary.confirmed ?? 0} icon={<Calendar size={18} />} accent="var(--success)" />
         <StatCard label="Room Types" value={services.length} icon={<Bed size={18} />} accent="var(--info)" />
         <StatCard label="FAQs" value={faqs.length} icon={<HelpCircle size={18} />} accent="var(--warning)" />
       </div>